@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로드밸런서 뒤 백엔드별 시계 클러스터링
+- 큰 사이트는 여러 백엔드 서버가 조금씩 다른 시계로 응답하므로, 모든 측정을 하나의 중앙값으로
+  섞으면 오프셋 안정성이 부풀려지고 발사 기준도 어느 백엔드에도 맞지 않게 됨
+- 측정마다 백엔드 식별 힌트(연결, 원격 주소, Server/Via 등 헤더)를 붙여 두고
+  1) 같은 keep-alive 연결 또는 같은 백엔드 헤더 값을 가진 측정을 한 그룹으로 묶은 뒤
+  2) 그룹 오프셋 중앙값 차이가 허용 오차 + 측정 잡음의 3배 이하면 병합 (백엔드 헤더 값이 서로 다르면 병합하지 않음)
+- 헤더가 모든 측정에서 같은 값이면(예: 전부 "nginx") 식별력이 없으므로 무시
+"""
+
+import statistics
+from collections import Counter, namedtuple
+
+# 백엔드를 구분할 수 있는 응답 헤더 (앞쪽일수록 구체적)
+BACKEND_HEADERS = ('X-Served-By', 'X-Backend-Server', 'X-Server', 'Via', 'Server')
+
+BackendCluster = namedtuple('BackendCluster', [
+    'label',        # 표시용 이름 (가장 흔한 백엔드 헤더 값 또는 원격 주소)
+    'offset',       # 구성 측정 오프셋 중앙값
+    'stability',    # 구성 측정 오프셋 표준편차 (측정 1개면 0)
+    'samples',
+    'addresses',    # {원격 주소: 측정 수}
+    'connections',  # 구성 측정이 사용한 연결 식별자 집합
+])
+
+
+def backend_hints(result):
+    """측정 결과 dict에서 백엔드 식별 힌트 추출 (없는 항목은 생략)"""
+    hints = {}
+    if result.get('connection_id'):
+        hints['connection'] = result['connection_id']
+    if result.get('remote_address'):
+        hints['address'] = result['remote_address']
+    headers = result.get('headers')
+    if headers is not None:
+        for name in BACKEND_HEADERS:
+            value = headers.get(name)
+            if value:
+                hints[name.lower()] = value
+    return hints
+
+
+class _Group:
+    """같은 백엔드로 확정된 측정 묶음"""
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.offsets = [s['offset'] for s in samples]
+        self.median = statistics.median(self.offsets)
+        self.spread = statistics.median(s.get('uncertainty', 0.0) for s in samples)
+        self.stdev = statistics.stdev(self.offsets) if len(self.offsets) > 1 else 0.0
+        self.headers = {}
+        for s in samples:
+            for name, value in s['hints'].items():
+                self.headers.setdefault(name, set()).add(value)
+
+    def conflicts(self, other, names):
+        """식별력 있는 헤더 값이 서로 겹치지 않으면 다른 백엔드"""
+        return any(name in self.headers and name in other.headers
+                   and not self.headers[name] & other.headers[name] for name in names)
+
+    def merge(self, other):
+        return _Group(self.samples + other.samples)
+
+    def noise(self):
+        """그룹 오프셋이 흩어진 정도 (측정 불확실성과 표본 표준편차 중 큰 값)"""
+        return max(self.spread, self.stdev)
+
+
+class BackendClusterer:
+    """백엔드 힌트와 오프셋으로 측정을 백엔드별 모드로 묶음"""
+
+    def __init__(self, tolerance=0.002):
+        self.tolerance = tolerance  # 그룹 중앙값 차이가 이 이하면 같은 시계로 봄 (+ 측정 불확실성)
+
+    def cluster(self, samples):
+        """측정 목록을 클러스터로 분할
+
+        Args:
+            samples: [{'offset', 'hints'(dict), 'uncertainty'(선택)}] 목록
+                     (세션을 넘는 데이터는 드리프트를 미리 빼서 넘길 것)
+
+        Returns:
+            list: 측정 수 내림차순 BackendCluster 목록
+        """
+        samples = [s for s in samples if s.get('offset') is not None]
+        if not samples:
+            return []
+        for s in samples:
+            s.setdefault('hints', {})
+
+        # 모든 측정에서 값이 하나뿐인 헤더는 식별력이 없음
+        values = {}
+        for s in samples:
+            for name, value in s['hints'].items():
+                values.setdefault(name, set()).add(value)
+        names = [name.lower() for name in BACKEND_HEADERS if len(values.get(name.lower(), ())) > 1]
+
+        # 1) 같은 연결 / 같은 백엔드 헤더 값 -> 같은 그룹 (union-find)
+        parent = list(range(len(samples)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        first_seen = {}
+        for i, s in enumerate(samples):
+            keys = [('connection', s['hints'].get('connection'))] + [(n, s['hints'].get(n)) for n in names]
+            for key in keys:
+                if key[1] is None:
+                    continue
+                if key in first_seen:
+                    parent[find(i)] = find(first_seen[key])
+                else:
+                    first_seen[key] = i
+        members = {}
+        for i, s in enumerate(samples):
+            members.setdefault(find(i), []).append(s)
+        groups = sorted((_Group(m) for m in members.values()), key=lambda g: g.median)
+
+        # 2) 오프셋이 가까운 이웃 그룹을 가장 가까운 쌍부터 병합 (헤더가 다른 백엔드를 가리키면 제외)
+        #    측정 잡음이 크면 그만큼 넓게 병합해, 잡음을 여러 백엔드로 오인하지 않음
+        merged = groups
+        while len(merged) > 1:
+            best = None
+            for i in range(len(merged) - 1):
+                a, b = merged[i], merged[i + 1]
+                gap = b.median - a.median
+                if gap <= self.tolerance + 3 * max(a.noise(), b.noise()) and not a.conflicts(b, names):
+                    if best is None or gap < best[0]:
+                        best = (gap, i)
+            if best is None:
+                break
+            i = best[1]
+            merged[i:i + 2] = [merged[i].merge(merged[i + 1])]
+
+        clusters = [self._summarize(group, names) for group in merged]
+        clusters.sort(key=lambda c: c.samples, reverse=True)
+        # 같은 주소 뒤의 여러 백엔드처럼 이름이 겹치면 순번으로 구분
+        counts = Counter(c.label for c in clusters)
+        return [c._replace(label=f"{c.label}#{i + 1}") if counts[c.label] > 1 else c
+                for i, c in enumerate(clusters)]
+
+    @staticmethod
+    def _summarize(group, names):
+        addresses = Counter(s['hints']['address'] for s in group.samples if s['hints'].get('address'))
+        label = None
+        for name in names:
+            labels = Counter(s['hints'][name] for s in group.samples if s['hints'].get(name))
+            if labels:
+                label = labels.most_common(1)[0][0]
+                break
+        if label is None:
+            label = addresses.most_common(1)[0][0] if addresses else f"{group.median*1000:+.1f}ms"
+        return BackendCluster(
+            label=label,
+            offset=group.median,
+            stability=statistics.stdev(group.offsets) if len(group.offsets) > 1 else 0.0,
+            samples=len(group.samples),
+            addresses=dict(addresses),
+            connections={s['hints']['connection'] for s in group.samples if s['hints'].get('connection')},
+        )
+
+    @staticmethod
+    def select(clusters, connection_ids=(), address=None):
+        """발사에 쓸 클러스터 선택
+
+        우선순위: 다음 발사에 쓰일 연결이 속한 클러스터 > 고정된 엣지 주소 측정이 가장 많은 클러스터
+        > 측정이 가장 많은 클러스터
+
+        Args:
+            connection_ids: 대기 연결 식별자 (마지막 항목이 다음에 쓰일 연결)
+        """
+        if not clusters:
+            return None
+        for connection in reversed(list(connection_ids)):
+            for cluster in clusters:
+                if connection in cluster.connections:
+                    return cluster
+        if address is not None:
+            best = max(clusters, key=lambda c: c.addresses.get(address, 0))
+            if best.addresses.get(address):
+                return best
+        return clusters[0]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+측정 기록 일괄 통계 (NumPy 벡터화 선택 사용)
+- 이상값 제거(IQR, 2 표준편차, 지연 중앙값 1.5배)와 요약 통계를 한곳에 모아
+  GUI 측정 경로와 누적 기록 재계산, 프로브 트레이스 재생이 같은 규칙을 쓰도록 함
+- NumPy가 있고 표본이 VECTORIZE_MIN개 이상이면 벡터 연산, 아니면 기존 순수 파이썬 구현
+- 두 경로의 결과는 같음:
+  * 중앙값/사분위수/IQR 경계/지연 필터는 같은 부동소수점 연산 순서라 비트 단위로 동일
+  * 평균/표준편차는 NumPy 합산과 statistics(정확한 분수 연산)가 마지막 자리에서 다를 수 있어,
+    2 표준편차 경계에 걸친 값이 있으면 그 판정만 statistics로 다시 계산
+"""
+
+import math
+import statistics
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+VECTORIZE_MIN = 256  # 이보다 작은 표본은 배열 변환 비용이 커서 순수 파이썬이 빠름
+
+
+def _use_numpy(values, use_numpy):
+    if use_numpy is None:
+        return NUMPY_AVAILABLE and len(values) >= VECTORIZE_MIN
+    if use_numpy and not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy 모듈이 설치되지 않았습니다 (pip install numpy)")
+    return use_numpy
+
+
+def _quartiles_sorted(s):
+    """statistics.quantiles(n=4) (exclusive 방식)와 같은 식으로 정렬된 표본의 Q1, Q3 계산"""
+    ld = len(s)
+    m = ld + 1
+    result = []
+    for i in (1, 3):
+        j = i * m // 4
+        j = 1 if j < 1 else ld - 1 if j > ld - 1 else j
+        delta = i * m - j * 4
+        result.append((s[j - 1] * (4 - delta) + s[j] * delta) / 4)
+    return result
+
+
+def iqr_bounds(values, factor=1.5, use_numpy=None):
+    """(Q1 - factor*IQR, Q3 + factor*IQR) 또는 표본이 4개 미만이면 None"""
+    if len(values) < 4:
+        return None
+    if _use_numpy(values, use_numpy):
+        q1, q3 = (float(q) for q in _quartiles_sorted(np.sort(np.asarray(values, dtype=float))))
+    else:
+        q1, _, q3 = statistics.quantiles(values, n=4)
+    iqr = q3 - q1
+    return q1 - factor * iqr, q3 + factor * iqr
+
+
+def iqr_mask(values, use_numpy=None):
+    """IQR 경계 안에 있는 측정 여부 (표본 4개 미만이면 전부 유지)"""
+    bounds = iqr_bounds(values, use_numpy=use_numpy)
+    if _use_numpy(values, use_numpy):
+        arr = np.asarray(values, dtype=float)
+        if bounds is None:
+            return np.ones(len(arr), dtype=bool)
+        return (bounds[0] <= arr) & (arr <= bounds[1])
+    if bounds is None:
+        return [True] * len(values)
+    return [bounds[0] <= x <= bounds[1] for x in values]
+
+
+def remove_outliers_iqr(values, use_numpy=None):
+    """IQR 1.5배 밖의 값 제거"""
+    if len(values) < 4:
+        return list(values)
+    mask = iqr_mask(values, use_numpy)
+    if _use_numpy(values, use_numpy):
+        return np.asarray(values, dtype=float)[mask].tolist()
+    return [x for x, keep in zip(values, mask) if keep]
+
+
+def sigma_mask(values, use_numpy=None):
+    """평균에서 2 표준편차 이내인 측정 여부 (표본이 3개 미만이거나 남는 값이 2개 미만이면 전부 유지)"""
+    if not _use_numpy(values, use_numpy):
+        if len(values) < 3:
+            return [True] * len(values)
+        mean_val = statistics.mean(values)
+        stdev_val = statistics.stdev(values)
+        mask = [abs(x - mean_val) <= 2 * stdev_val for x in values]
+        return mask if sum(mask) >= 2 else [True] * len(values)
+
+    arr = np.asarray(values, dtype=float)
+    if len(arr) < 3:
+        return np.ones(len(arr), dtype=bool)
+    mean_val = arr.mean()
+    distance = np.abs(arr - mean_val)
+    threshold = 2 * arr.std(ddof=1)
+    # 경계에 아주 가까운 값이 있으면 statistics와 같은 평균/표준편차로 판정
+    tolerance = 1e-9 * (abs(mean_val) + threshold)
+    if np.any(np.abs(distance - threshold) <= tolerance):
+        mean_val = statistics.mean(arr.tolist())
+        threshold = 2 * statistics.stdev(arr.tolist())
+        distance = np.abs(arr - mean_val)
+    mask = distance <= threshold
+    return mask if np.count_nonzero(mask) >= 2 else np.ones(len(arr), dtype=bool)
+
+
+def remove_outliers_advanced(values, use_numpy=None):
+    """평균에서 2 표준편차 이내의 값만 유지 (남는 값이 2개 미만이면 원래 값 그대로)"""
+    if len(values) < 3:
+        return list(values)
+    mask = sigma_mask(values, use_numpy)
+    if _use_numpy(values, use_numpy):
+        return np.asarray(values, dtype=float)[mask].tolist()
+    return [x for x, keep in zip(values, mask) if keep]
+
+
+def latency_mask(latencies, factor=1.5, use_numpy=None):
+    """지연이 중앙값의 factor배 이하인 측정 여부"""
+    if not latencies:
+        return []
+    if _use_numpy(latencies, use_numpy):
+        arr = np.asarray(latencies, dtype=float)
+        return arr <= _median(arr) * factor
+    threshold = statistics.median(latencies) * factor
+    return [lat <= threshold for lat in latencies]
+
+
+def _median(arr):
+    """statistics.median과 같은 식의 중앙값 (짝수 개면 가운데 두 값의 평균)"""
+    n = len(arr)
+    half = n // 2
+    if n % 2:
+        return float(np.partition(arr, half)[half])
+    part = np.partition(arr, (half - 1, half))
+    return (float(part[half - 1]) + float(part[half])) / 2
+
+
+def summarize(values, use_numpy=None):
+    """{'count', 'mean', 'median', 'stdev'} (표본 2개 미만이면 stdev 0)"""
+    if not values:
+        return {'count': 0, 'mean': 0.0, 'median': 0.0, 'stdev': 0.0}
+    if _use_numpy(values, use_numpy):
+        arr = np.asarray(values, dtype=float)
+        return {'count': len(arr), 'mean': float(arr.mean()), 'median': _median(arr),
+                'stdev': float(arr.std(ddof=1)) if len(arr) > 1 else 0.0}
+    return {'count': len(values), 'mean': statistics.mean(values), 'median': statistics.median(values),
+            'stdev': statistics.stdev(values) if len(values) > 1 else 0.0}
+
+
+def decayed_summary(values, timestamps, now, half_life, use_numpy=None):
+    """반감기 가중 평균/표준편차 (DecayedStats에 시간순으로 넣은 결과와 같은 값, 일괄 계산)
+
+    Returns:
+        dict: {'weight', 'effective_samples', 'mean', 'stdev'}
+    """
+    if not values:
+        return {'weight': 0.0, 'effective_samples': 0.0, 'mean': 0.0, 'stdev': 0.0}
+    if _use_numpy(values, use_numpy):
+        x = np.asarray(values, dtype=float)
+        w = 0.5 ** ((now - np.asarray(timestamps, dtype=float)) / half_life)
+        weight = float(w.sum())
+        weight_sq = float((w * w).sum())
+        mean = float((w * x).sum() / weight)
+        m2 = float((w * (x - mean) ** 2).sum())
+    else:
+        w = [0.5 ** ((now - t) / half_life) for t in timestamps]
+        weight = math.fsum(w)
+        weight_sq = math.fsum(wi * wi for wi in w)
+        mean = math.fsum(wi * xi for wi, xi in zip(w, values)) / weight
+        m2 = math.fsum(wi * (xi - mean) ** 2 for wi, xi in zip(w, values))
+    effective = weight * weight / weight_sq
+    variance = m2 / weight * effective / (effective - 1) if effective > 1 else 0.0
+    return {'weight': weight, 'effective_samples': effective, 'mean': mean, 'stdev': math.sqrt(max(variance, 0.0))}
+
+
+class MeasurementColumns:
+    """누적 측정 기록의 열 단위 표현 (offset, latency, timestamp, method, host)"""
+
+    COLUMNS = ('offset', 'latency', 'timestamp', 'method', 'host')
+
+    def __init__(self, offset, latency, timestamp, method, host):
+        self.offset = offset
+        self.latency = latency
+        self.timestamp = timestamp
+        self.method = method
+        self.host = host
+
+    @classmethod
+    def from_records(cls, records, use_numpy=None):
+        """측정 dict 목록에서 열 생성 (NumPy 경로면 숫자 열은 float64 배열)"""
+        offset = [m['offset'] for m in records]
+        latency = [m['latency'] for m in records]
+        timestamp = [m.get('timestamp', 0.0) for m in records]
+        method = [m.get('method', '') for m in records]
+        host = [m.get('host', '') for m in records]
+        if _use_numpy(records, use_numpy):
+            offset, latency, timestamp = (np.asarray(c, dtype=float) for c in (offset, latency, timestamp))
+            method, host = np.asarray(method, dtype=object), np.asarray(host, dtype=object)
+        return cls(offset, latency, timestamp, method, host)
+
+    def __len__(self):
+        return len(self.offset)
+
+    def groups(self, column='host'):
+        """{값: 해당 행 인덱스 목록} (기록 순서 유지)"""
+        groups = {}
+        for i, value in enumerate(getattr(self, column)):
+            groups.setdefault(value, []).append(i)
+        return groups
+
+    def take(self, column, indices):
+        values = getattr(self, column)
+        if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+            return values[indices]
+        return [values[i] for i in indices]
+
+    def clean_mask(self, indices, use_numpy=None):
+        """행들의 (오프셋 IQR 유지 여부, 지연 IQR 유지 여부) - 누적 통계 재계산 규칙"""
+        offsets = self.take('offset', indices)
+        latencies = self.take('latency', indices)
+        return iqr_mask(offsets, use_numpy), iqr_mask(latencies, use_numpy)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일괄 통계 벤치마크 (순수 파이썬 vs NumPy)
+- 합성 측정 기록 1만/10만/100만 개로 이상값 제거(IQR, 2 표준편차, 지연 1.5배)와 요약 통계 시간 비교
+- 두 경로의 결과가 같은지도 함께 확인 (필터 결과는 완전 일치, 평균/표준편차는 상대 오차)
+"""
+
+import random
+import time
+
+import batch_stats
+from batch_stats import (NUMPY_AVAILABLE, MeasurementColumns, decayed_summary, latency_mask,
+                         remove_outliers_advanced, remove_outliers_iqr, summarize)
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def synthetic_records(n, rng):
+    """호스트 3개, 지연 스파이크와 오프셋 이상값이 섞인 측정 기록"""
+    now = time.time()
+    records = []
+    for i in range(n):
+        latency = 0.020 + rng.lognormvariate(0, 0.5) * 0.001
+        if rng.random() < 0.03:
+            latency += rng.uniform(0.005, 0.080)
+        offset = 0.012 + rng.gauss(0, 0.0008) + (rng.uniform(-0.5, 0.5) if rng.random() < 0.01 else 0.0)
+        records.append({'offset': offset, 'latency': latency, 'timestamp': now - (n - i) * 5.0,
+                        'method': 'multi_sample', 'host': f"site{i % 3}.example"})
+    return records
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def pipeline(records, use_numpy):
+    """측정 경로와 같은 순서: 지연 필터 -> 2 표준편차 -> 요약, 호스트별 IQR -> 감쇠 요약"""
+    columns = MeasurementColumns.from_records(records, use_numpy=use_numpy)
+    offsets = columns.offset.tolist() if use_numpy else columns.offset
+    latencies = columns.latency.tolist() if use_numpy else columns.latency
+    mask = latency_mask(latencies, use_numpy=use_numpy)
+    clean_offsets = [o for o, keep in zip(offsets, mask) if keep]
+    clean_offsets = remove_outliers_advanced(clean_offsets, use_numpy=use_numpy)
+    summary = summarize(clean_offsets, use_numpy=use_numpy)
+    kept = 0
+    for host, indices in columns.groups('host').items():
+        offset_ok, _ = columns.clean_mask(indices, use_numpy=use_numpy)
+        kept += int(sum(offset_ok))
+    decayed = decayed_summary(offsets, columns.timestamp, records[-1]['timestamp'], 7 * 86400.0, use_numpy=use_numpy)
+    return summary, kept, decayed
+
+
+def relative_error(a, b):
+    return abs(a - b) / max(abs(a), abs(b), 1e-300)
+
+
+def main():
+    print("=== 일괄 통계 벤치마크 ===")
+    if not NUMPY_AVAILABLE:
+        print("⚠️ numpy 모듈이 없어 순수 파이썬 경로만 측정합니다 (pip install numpy)\n")
+    rng = random.Random(7)
+
+    for n in SIZES:
+        records = synthetic_records(n, rng)
+        offsets = [m['offset'] for m in records]
+        latencies = [m['latency'] for m in records]
+        print(f"\n[{n:,}개]")
+
+        cases = [
+            ("IQR 이상값 제거", remove_outliers_iqr, offsets),
+            ("2 표준편차 제거", remove_outliers_advanced, offsets),
+            ("지연 1.5배 필터", latency_mask, latencies),
+            ("요약 통계", summarize, offsets),
+        ]
+        for name, func, data in cases:
+            py_result, py_time = timed(func, data, use_numpy=False)
+            line = f"  {name:<14} 파이썬 {py_time*1000:9.1f}ms"
+            if NUMPY_AVAILABLE:
+                np_result, np_time = timed(func, data, use_numpy=True)
+                if isinstance(py_result, dict):
+                    same = (py_result['median'] == np_result['median']
+                            and max(relative_error(py_result[k], np_result[k]) for k in ('mean', 'stdev')) < 1e-12)
+                else:
+                    same = list(py_result) == list(np_result)
+                line += f" | NumPy {np_time*1000:8.1f}ms (x{py_time/np_time:5.1f}) | 결과 {'일치' if same else '불일치 ❌'}"
+            print(line)
+
+        py_result, py_time = timed(pipeline, records, False)
+        line = f"  {'전체 파이프라인':<14} 파이썬 {py_time*1000:9.1f}ms"
+        if NUMPY_AVAILABLE:
+            np_result, np_time = timed(pipeline, records, True)
+            same = (py_result[1] == np_result[1] and py_result[0]['median'] == np_result[0]['median']
+                    and relative_error(py_result[2]['stdev'], np_result[2]['stdev']) < 1e-9)
+            line += f" | NumPy {np_time*1000:8.1f}ms (x{py_time/np_time:5.1f}) | 결과 {'일치' if same else '불일치 ❌'}"
+        print(line)
+
+    print(f"\n자동 선택 기준: 표본 {batch_stats.VECTORIZE_MIN}개 이상이면 NumPy 사용")
+
+
+if __name__ == '__main__':
+    main()
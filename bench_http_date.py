@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Date 헤더 파서 마이크로벤치마크
+기존 strptime 형식 순회 방식과 http_date.parse_http_date (캐시 미스/히트) 비교
+"""
+
+import time
+import timeit
+from datetime import datetime, timezone
+from email.utils import formatdate
+
+from http_date import parse_http_date
+
+
+def parse_strptime_loop(server_time_str):
+    """기존 방식 (gui_macro.measure_server_time_offset의 형식 순회)"""
+    time_formats = [
+        '%a, %d %b %Y %H:%M:%S GMT',
+        '%a, %d %b %Y %H:%M:%S %Z',
+        '%d %b %Y %H:%M:%S GMT',
+        '%a, %d %b %Y %H:%M:%S.%f GMT',
+    ]
+    for fmt in time_formats:
+        try:
+            server_time = datetime.strptime(server_time_str, fmt)
+            return server_time.replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def run_benchmark(number=20000):
+    now = int(time.time())
+    header = formatdate(now, usegmt=True)
+    # 캐시 미스: 매번 다른 헤더 (실제로는 1초에 한 번 발생)
+    distinct_headers = [formatdate(now + i, usegmt=True) for i in range(number)]
+
+    assert parse_strptime_loop(header) == parse_http_date(header) == now
+
+    print("=== Date 헤더 파서 벤치마크 ===")
+    print(f"헤더 예시: {header}")
+    print(f"반복 횟수: {number}회\n")
+
+    results = {}
+
+    elapsed = timeit.timeit(lambda: parse_strptime_loop(header), number=number)
+    results['strptime 형식 순회 (기존)'] = elapsed
+
+    def parse_uncached():
+        for value in distinct_headers:
+            parse_http_date.__wrapped__(value)
+    results['parse_http_date (캐시 미스)'] = timeit.timeit(parse_uncached, number=1)
+
+    parse_http_date.cache_clear()
+    elapsed = timeit.timeit(lambda: parse_http_date(header), number=number)
+    results['parse_http_date (캐시 히트)'] = elapsed
+
+    baseline = results['strptime 형식 순회 (기존)']
+    for name, elapsed in results.items():
+        per_call_us = elapsed / number * 1e6
+        print(f"{name:<28} {per_call_us:8.3f}us/회  (x{baseline / elapsed:6.1f})")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+측정 클라이언트 오버헤드 벤치마크
+urlopen / requests / http.client / 원시 소켓(RawProbeTransport)으로 같은 서버에 HEAD 요청을
+반복하고, 호출 전체 시간과 실제 송수신 구간(요청 전송 완료 ~ 첫 바이트)을 비교
+
+사용법:
+    python test_server.py 5000          (다른 터미널에서 로컬 테스트 서버 실행)
+    python bench_probe_clients.py [URL] [반복 횟수]
+"""
+
+import sys
+import time
+import statistics
+from urllib.request import Request, urlopen
+
+from probe_transport import ProbeTransport, RawProbeTransport
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+
+def time_calls(func, number):
+    """func를 number회 호출하며 호출별 소요시간(us)과 반환값 수집"""
+    durations = []
+    results = []
+    for _ in range(number):
+        start = time.perf_counter_ns()
+        result = func()
+        durations.append((time.perf_counter_ns() - start) / 1000)
+        results.append(result)
+    return durations, results
+
+
+def summarize(durations):
+    durations = sorted(durations)
+    return {
+        'median': statistics.median(durations),
+        'p90': durations[int(len(durations) * 0.9) - 1],
+        'min': durations[0],
+    }
+
+
+def run_benchmark(url, number=500):
+    print("=== 측정 클라이언트 오버헤드 벤치마크 ===")
+    print(f"대상: {url}")
+    print(f"반복 횟수: {number}회 (각 클라이언트 워밍업 후)\n")
+
+    clients = {}
+
+    def urlopen_head():
+        with urlopen(Request(url, method='HEAD', headers={'Cache-Control': 'no-cache'}), timeout=3) as response:
+            return response.headers.get('Date')
+    clients['urlopen (매번 새 연결)'] = (urlopen_head, None)
+
+    if REQUESTS_AVAILABLE:
+        session = requests.Session()
+
+        def requests_head():
+            return session.head(url, headers={'Cache-Control': 'no-cache'}, timeout=3).headers.get('Date')
+        clients['requests.Session (keep-alive)'] = (requests_head, None)
+    else:
+        print("requests 미설치: requests 항목 생략\n")
+
+    http_client_transport = ProbeTransport()
+    clients['http.client (ProbeTransport)'] = (lambda: http_client_transport.probe(url),
+                                               http_client_transport)
+    raw_transport = RawProbeTransport()
+    clients['원시 소켓 (RawProbeTransport)'] = (lambda: raw_transport.probe(url), raw_transport)
+
+    print(f"{'클라이언트':<32} {'호출 중앙값':>10} {'p90':>10} {'최소':>10} {'송수신 구간':>10} {'오버헤드':>10}")
+    baseline_wire = None
+    rows = []
+    for name, (func, transport) in clients.items():
+        for _ in range(20):  # 연결 확보 및 캐시 워밍업
+            func()
+        durations, results = time_calls(func, number)
+        stats = summarize(durations)
+        wire = None
+        if transport is not None:
+            wire = statistics.median(result['rtt'] * 1e6 for result in results)
+            baseline_wire = wire if baseline_wire is None else min(baseline_wire, wire)
+        rows.append((name, stats, wire))
+
+    for name, stats, wire in rows:
+        # 오버헤드 = 호출 전체 시간 - 가장 짧은 실제 송수신 구간 (클라이언트가 더하는 시간)
+        overhead = stats['median'] - baseline_wire
+        wire_text = f"{wire:8.1f}us" if wire is not None else f"{'-':>10}"
+        print(f"{name:<32} {stats['median']:8.1f}us {stats['p90']:8.1f}us {stats['min']:8.1f}us "
+              f"{wire_text} {overhead:8.1f}us")
+
+    http_client_transport.close()
+    raw_transport.close()
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:5000/api/time"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    run_benchmark(target, count)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 결과 부트스트랩 신뢰구간
+- 정제된 측정(오프셋, 단방향 지연)을 복원 추출로 재표본화해 중앙값 추정량의 분포를 만들고
+  백분위 구간으로 오프셋/지연 신뢰구간을 계산 (기존 "±(오프셋 표준편차 + 지연 표준편차)" 대체)
+  (중앙값은 재표본 분포가 이산적이라 basic 구간은 포함률이 85% 안팎으로 떨어지므로 백분위 구간 사용)
+- 도착 시각 오차 = 오프셋 추정 오차 + 이번 요청 지연의 추정 대비 편차 (+ 클릭 실행시간 편차)
+  지연 편차는 예측 부트스트랩: 재표본의 중앙값 대비 같은 재표본에서 뽑은 새 측정 하나의 차이
+- NumPy가 있으면 재표본 인덱스 행렬 한 번으로 벡터 계산 (1만 회 수 ms), 없으면 횟수를 줄여 순수 파이썬
+"""
+
+import bisect
+import random
+import statistics
+import time
+from collections import namedtuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+ConfidenceInterval = namedtuple('ConfidenceInterval', ['estimate', 'lo', 'hi', 'level'])
+
+
+def _row_medians(matrix):
+    """행별 중앙값 (np.median보다 빠른 부분 정렬)"""
+    n = matrix.shape[1]
+    half = n // 2
+    if n % 2:
+        return np.partition(matrix, half, axis=1)[:, half]
+    part = np.partition(matrix, (half - 1, half), axis=1)
+    return (part[:, half - 1] + part[:, half]) / 2
+
+
+class ArrivalBootstrap:
+    """오프셋/지연/도착 시각 부트스트랩"""
+
+    def __init__(self, replicates=10000, level=0.95, fallback_replicates=1000, seed=None):
+        self.replicates = replicates                    # NumPy 경로 재표본 횟수
+        self.fallback_replicates = fallback_replicates  # 순수 파이썬 경로 재표본 횟수
+        self.level = level
+        self._seed = seed
+        self.offset_ci = None
+        self.latency_ci = None
+        self.arrival_ci = None  # 계획 대비 도착 오차 구간 (클릭 실행시간 편차 제외)
+        self.samples = 0
+        self.elapsed = 0.0      # 마지막 fit 계산 시간 (초)
+        self._offset_errors = None   # 오프셋 추정 오차 재표본 (재표본 중앙값 - 중앙값)
+        self._latency_errors = None  # 이번 요청 지연 - 추정 지연 재표본
+
+    @property
+    def fitted(self):
+        return self._offset_errors is not None
+
+    @property
+    def latency_errors(self):
+        """요청 하나의 지연 - 추정 지연 재표본 (정렬됨, 부트스트랩 전이면 None)"""
+        return self._latency_errors
+
+    def fit(self, offsets, latencies, offset_estimate=None, latency_estimate=None):
+        """정제된 측정으로 재표본 생성
+
+        Args:
+            offset_estimate: 실제 사용하는 오프셋 추정값 (RTT 하한 가중 평균 등, 없으면 중앙값)
+                             구간은 중앙값 추정량의 오차 분포를 이 값에 적용
+            latency_estimate: 실제 사용하는 지연 추정값 (없으면 중앙값)
+
+        Returns:
+            self (측정이 2개 미만이면 이전 구간을 지운 미적합 상태)
+
+        Raises:
+            ValueError: offsets와 latencies가 같은 측정의 짝이 아닐 때 (길이가 다름)
+        """
+        if len(offsets) != len(latencies):
+            raise ValueError(f"오프셋 {len(offsets)}개와 지연 {len(latencies)}개는 짝이 맞지 않습니다")
+        n = len(offsets)
+        if n < 2:
+            # 이전 동기화의 구간을 이번 결과처럼 보이지 않도록 지움
+            self.offset_ci = self.latency_ci = self.arrival_ci = None
+            self._offset_errors = self._latency_errors = None
+            self.samples = n
+            return self
+        offsets, latencies = list(offsets), list(latencies)
+        offset_median = statistics.median(offsets)
+        latency_median = statistics.median(latencies)
+        offset_estimate = offset_median if offset_estimate is None else offset_estimate
+        latency_estimate = latency_median if latency_estimate is None else latency_estimate
+
+        start = time.perf_counter()
+        if NUMPY_AVAILABLE:
+            rng = np.random.default_rng(self._seed)
+            idx = rng.integers(0, n, size=(self.replicates, n))
+            offset_reps = _row_medians(np.asarray(offsets, dtype=float)[idx])
+            latency_samples = np.asarray(latencies, dtype=float)[idx]
+            fresh = latency_samples[np.arange(self.replicates), rng.integers(0, n, size=self.replicates)]
+            latency_reps = _row_medians(latency_samples)
+            offset_errors = offset_reps - offset_median
+            latency_errors = fresh - latency_reps
+            arrival = np.sort(offset_errors + latency_errors)
+            self._offset_errors = np.sort(offset_errors)
+            self._latency_errors = np.sort(latency_errors)
+            offset_bounds = self._percentiles(self._offset_errors)
+            latency_bounds = self._percentiles(np.sort(latency_reps - latency_median))
+            arrival_bounds = self._percentiles(arrival)
+        else:
+            rng = random.Random(self._seed)
+            offset_errors, latency_errors, latency_estimator_errors = [], [], []
+            for _ in range(self.fallback_replicates):
+                idx = [rng.randrange(n) for _ in range(n)]
+                latency_sample = [latencies[i] for i in idx]
+                latency_rep = statistics.median(latency_sample)
+                offset_errors.append(statistics.median([offsets[i] for i in idx]) - offset_median)
+                latency_errors.append(rng.choice(latency_sample) - latency_rep)
+                latency_estimator_errors.append(latency_rep - latency_median)
+            self._offset_errors = sorted(offset_errors)
+            self._latency_errors = sorted(latency_errors)
+            offset_bounds = self._percentiles(self._offset_errors)
+            latency_bounds = self._percentiles(sorted(latency_estimator_errors))
+            arrival_bounds = self._percentiles(sorted(o + l for o, l in zip(offset_errors, latency_errors)))
+        self.elapsed = time.perf_counter() - start
+        self.samples = n
+
+        # 중앙값 기준 백분위 구간을 실제 추정값 위치로 옮김
+        self.offset_ci = ConfidenceInterval(offset_estimate, offset_estimate + offset_bounds[0],
+                                            offset_estimate + offset_bounds[1], self.level)
+        self.latency_ci = ConfidenceInterval(latency_estimate, latency_estimate + latency_bounds[0],
+                                             latency_estimate + latency_bounds[1], self.level)
+        self.arrival_ci = ConfidenceInterval(0.0, arrival_bounds[0], arrival_bounds[1], self.level)
+        return self
+
+    def _percentiles(self, ordered):
+        """정렬된 재표본의 (하위, 상위) 백분위 (level 양측)"""
+        tail = (1 - self.level) / 2
+        last = len(ordered) - 1
+        return float(ordered[int(round(tail * last))]), float(ordered[int(round((1 - tail) * last))])
+
+    def arrival_errors(self, offset_bound=None, execution_errors=()):
+        """도착 시각 오차 재표본 (계획 대비, 초)
+
+        Args:
+            offset_bound: 발사 시점 오프셋 추정의 ±불확실성 (칼만 예측/소스 결합 구간)
+                          주어지면 오프셋 오차를 이 구간의 균등분포로 대체
+            execution_errors: 클릭 실행시간 실측 - 사용한 추정값 목록 (재표본마다 하나씩 추출)
+        """
+        if not self.fitted:
+            return None
+        if NUMPY_AVAILABLE:
+            rng = np.random.default_rng()
+            count = len(self._latency_errors)
+            errors = rng.permutation(self._latency_errors)
+            if offset_bound is not None:
+                errors = errors + rng.uniform(-offset_bound, offset_bound, count)
+            else:
+                errors = errors + self._offset_errors
+            if len(execution_errors):
+                errors = errors + rng.choice(np.asarray(execution_errors, dtype=float), count)
+            return errors
+        rng = random.Random()
+        latency_errors = list(self._latency_errors)
+        rng.shuffle(latency_errors)
+        errors = []
+        for i, error in enumerate(latency_errors):
+            error += rng.uniform(-offset_bound, offset_bound) if offset_bound is not None else self._offset_errors[i]
+            if execution_errors:
+                error += rng.choice(execution_errors)
+            errors.append(error)
+        return errors
+
+    def window_probability(self, planned_delay, lo=0.0, hi=0.020, offset_bound=None, execution_errors=()):
+        """계획 도착 지연(목표 시각 대비)에서 실제 도착이 [lo, hi] 안에 들 확률
+
+        Returns:
+            (확률, 도착 지연 ConfidenceInterval) 또는 부트스트랩 전이면 (None, None)
+        """
+        errors = self.arrival_errors(offset_bound, execution_errors)
+        if errors is None:
+            return None, None
+        if NUMPY_AVAILABLE:
+            delays = np.sort(planned_delay + errors)
+            inside = np.searchsorted(delays, hi, side='right') - np.searchsorted(delays, lo, side='left')
+        else:
+            delays = sorted(planned_delay + e for e in errors)
+            inside = bisect.bisect_right(delays, hi) - bisect.bisect_left(delays, lo)
+        low, high = self._percentiles(delays)
+        return float(inside) / len(delays), ConfidenceInterval(planned_delay, low, high, self.level)
+
+    def to_dict(self):
+        """로그 기록용 구간 (ms)"""
+        if not self.fitted:
+            return None
+        return {
+            'level': self.level,
+            'samples': self.samples,
+            'offset_ci_ms': [self.offset_ci.lo * 1000, self.offset_ci.hi * 1000],
+            'latency_ci_ms': [self.latency_ci.lo * 1000, self.latency_ci.hi * 1000],
+            'arrival_error_ci_ms': [self.arrival_ci.lo * 1000, self.arrival_ci.hi * 1000],
+            'elapsed_ms': self.elapsed * 1000,
+        }
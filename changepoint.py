@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+온라인 변화점(changepoint) 탐지
+- 양방향 CUSUM: 기준선 대비 표준화 잔차를 누적해 임계값을 넘으면 구간 변화로 판단
+- 기준선은 구간 시작 후 warmup개 측정의 중앙값/MAD로 잡고, 이후 느린 지수 평균으로만 따라감
+  (드리프트 같은 완만한 변화는 흡수하고 경로 변경 같은 계단 변화만 잡음)
+- 잔차를 clip 표준편차로 잘라 큐잉 지연 스파이크 한두 개로는 경보가 나지 않게 함
+- 경보 시 누적값이 마지막으로 0이었던 위치를 변화 시작점으로 추정하고,
+  그 이후 측정으로 새 구간 기준선을 다시 잡음
+
+측정 하나당 O(1) (warmup 구간의 중앙값 계산만 warmup 크기에 비례)
+"""
+
+import statistics
+from collections import deque, namedtuple
+
+Changepoint = namedtuple('Changepoint', [
+    'index',         # 경보를 낸 측정 순번
+    'change_index',  # 추정한 변화 시작 측정 순번 (이 순번부터가 새 구간)
+    'direction',     # +1 증가, -1 감소
+    'before',        # 이전 구간 기준선
+    'after',         # 새 구간 측정 중앙값
+])
+
+
+class CusumDetector:
+    """스칼라 측정 흐름의 계단 변화 탐지기"""
+
+    def __init__(self, threshold=8.0, slack=1.0, clip=3.0, warmup=12, min_scale=0.0005,
+                 adapt=0.1, history=64):
+        self.threshold = threshold  # 누적 잔차 경보 임계값 (표준편차 단위)
+        self.slack = slack          # 측정마다 빼는 여유분 (이보다 작은 변화는 무시, 표준편차 단위)
+        self.clip = clip            # 잔차 상한 (스파이크 하나의 영향 제한)
+        self.warmup = warmup        # 기준선을 잡는 데 쓰는 구간 첫 측정 수
+        self.min_scale = min_scale  # 표준편차 하한 (해상도가 거친 측정에서 MAD가 0이 되는 경우)
+        self.adapt = adapt          # 기준선 추종 비율 (완만한 드리프트 흡수)
+        self._recent = deque(maxlen=max(history, warmup))  # (순번, 값)
+        self._count = 0
+        self.changes = 0
+        self.reset()
+
+    def reset(self, seed=()):
+        """새 구간 시작 (seed: 이미 새 구간으로 확인된 (순번, 값) 목록)"""
+        self.mean = None
+        self.scale = None
+        self._pos = self._neg = 0.0
+        self._pos_start = self._neg_start = None
+        self._regime = list(seed)  # 기준선을 잡기 전까지 모으는 측정
+
+    @property
+    def ready(self):
+        """기준선이 잡혀 탐지 중인지"""
+        return self.mean is not None
+
+    def _fit_baseline(self):
+        values = [v for _, v in self._regime]
+        self.mean = statistics.median(values)
+        mad = statistics.median(abs(v - self.mean) for v in values)
+        self.scale = max(1.4826 * mad, self.min_scale)
+        self._regime = []
+
+    def update(self, value):
+        """측정 하나 반영
+
+        Returns:
+            Changepoint 또는 변화가 없으면 None
+        """
+        index = self._count
+        self._count += 1
+        self._recent.append((index, value))
+
+        if self.mean is None:
+            self._regime.append((index, value))
+            if len(self._regime) >= self.warmup:
+                self._fit_baseline()
+            return None
+
+        z = max(-self.clip, min(self.clip, (value - self.mean) / self.scale))
+        if self._pos == 0.0:
+            self._pos_start = index
+        if self._neg == 0.0:
+            self._neg_start = index
+        self._pos = max(0.0, self._pos + z - self.slack)
+        self._neg = max(0.0, self._neg - z - self.slack)
+
+        if self._pos > self.threshold or self._neg > self.threshold:
+            direction = 1 if self._pos > self.threshold else -1
+            start = self._pos_start if direction > 0 else self._neg_start
+            after = [v for i, v in self._recent if i >= start]
+            change = Changepoint(index, start, direction, self.mean, statistics.median(after))
+            self.changes += 1
+            self.reset([(i, v) for i, v in self._recent if i >= start])
+            if len(self._regime) >= self.warmup:
+                self._fit_baseline()
+            return change
+
+        self.mean += self.adapt * z * self.scale
+        return None
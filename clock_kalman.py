@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+서버 시계 칼만 필터
+- 상태: [오프셋, 드리프트, 단방향 지연], 공분산 3x3을 명시적으로 유지
+- 측정 하나당 O(1) 갱신 (상태가 3개뿐이라 행렬 연산을 직접 전개)
+- 오프셋/지연 측정은 각각 스칼라 갱신, 혁신값이 게이트를 넘으면 이상값으로 버림
+- 지연 측정 잡음은 혁신값으로부터 지수 평균으로 추정 (측정마다 분산을 다시 계산하지 않음)
+
+시각 단위는 벽시계(time.time()) 초: 누적 데이터가 세션을 넘어 이어지기 때문
+"""
+
+import threading
+from collections import namedtuple
+
+OFFSET, DRIFT, LATENCY = 0, 1, 2
+
+KalmanState = namedtuple('KalmanState', [
+    'offset', 'drift', 'latency',
+    'offset_var', 'drift_var', 'latency_var',
+    'latency_noise',  # 지연 측정 하나의 잡음 분산 추정
+    'updates',
+    'updated_at',
+])
+
+
+class ClockKalmanFilter:
+    """오프셋, 드리프트, 단방향 지연을 함께 추적하는 칼만 필터
+
+    프로세스 잡음 (분산/초):
+        offset_noise:  로컬 시계 보정(OS 시간 동기화) 등으로 오프셋이 흔들리는 정도
+        drift_noise:   수정 발진기 드리프트가 온도 등으로 변하는 정도
+        latency_noise: 네트워크 경로 지연이 변하는 정도
+    """
+
+    def __init__(self, offset_noise=1e-8, drift_noise=1e-16, latency_noise=1e-8,
+                 gate=5.0, max_rejects=3):
+        self.offset_noise = offset_noise
+        self.drift_noise = drift_noise
+        self.latency_noise = latency_noise
+        self.gate = gate                # 혁신값이 gate 표준편차를 넘으면 이상값
+        self.max_rejects = max_rejects  # 연속으로 이만큼 버리면 상태가 틀렸다고 보고 재수렴
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, drift=0.0, drift_var=(20e-6) ** 2):
+        """상태 초기화 (오프셋/지연은 첫 측정으로 바로 초기화)"""
+        with self._lock:
+            self._x = [0.0, drift, 0.0]
+            self._P = [[0.0, 0.0, 0.0], [0.0, drift_var, 0.0], [0.0, 0.0, 0.0]]
+            self._initialized = [False, True, False]
+            self._latency_meas_var = (0.002) ** 2
+            self._rejects = [0, 0, 0]
+            self._updates = 0
+            self._t = None
+
+    @property
+    def initialized(self):
+        return self._initialized[OFFSET]
+
+    def _advance(self, at):
+        """상태를 시각 at까지 전파 (과거 시각의 측정은 현재 상태 시각에서 갱신)"""
+        if self._t is None:
+            self._t = at
+            return
+        dt = at - self._t
+        if dt <= 0:
+            return
+        self._t = at
+        x, P = self._x, self._P
+
+        # x' = F x, F = [[1, dt, 0], [0, 1, 0], [0, 0, 1]]
+        x[OFFSET] += x[DRIFT] * dt
+
+        # P' = F P F^T + Q (드리프트 랜덤워크가 오프셋에 적분되는 항 포함)
+        p00 = P[0][0] + dt * (P[1][0] + P[0][1]) + dt * dt * P[1][1]
+        p01 = P[0][1] + dt * P[1][1]
+        p02 = P[0][2] + dt * P[1][2]
+        P[0][0] = p00 + self.offset_noise * dt + self.drift_noise * dt ** 3 / 3
+        P[0][1] = P[1][0] = p01 + self.drift_noise * dt ** 2 / 2
+        P[0][2] = P[2][0] = p02
+        P[1][1] += self.drift_noise * dt
+        P[2][2] += self.latency_noise * dt
+
+    def _update(self, index, value, variance):
+        """상태 index에 대한 스칼라 측정 갱신
+
+        Returns:
+            bool: 반영했으면 True, 이상값으로 버렸으면 False
+        """
+        x, P = self._x, self._P
+        if not self._initialized[index]:
+            x[index] = value
+            P[index][index] = variance
+            self._initialized[index] = True
+            return True
+
+        innovation = value - x[index]
+        s = P[index][index] + variance
+        if innovation * innovation > self.gate * self.gate * s:
+            self._rejects[index] += 1
+            if self._rejects[index] < self.max_rejects:
+                return False
+            # 연속 이상값: 실제 변화(경로 변경, 시계 보정)로 보고 해당 상태만 다시 초기화
+            for j in range(3):
+                P[index][j] = P[j][index] = 0.0
+            x[index] = value
+            P[index][index] = variance
+            self._rejects[index] = 0
+            return True
+        self._rejects[index] = 0
+
+        # K = P[:, i] / s, x += K * innovation, P -= K P[i, :]
+        gain = [P[j][index] / s for j in range(3)]
+        row = list(P[index])
+        for j in range(3):
+            x[j] += gain[j] * innovation
+            for k in range(3):
+                P[j][k] -= gain[j] * row[k]
+        return True
+
+    def update_offset(self, offset, variance, at):
+        """오프셋 측정 반영 (variance: 측정 오차 분산)"""
+        with self._lock:
+            self._advance(at)
+            accepted = self._update(OFFSET, offset, variance)
+            self._updates += accepted
+            return accepted
+
+    def update_latency(self, latency, at, variance=None):
+        """단방향 지연 측정 반영 (variance가 없으면 추정한 측정 잡음 사용)"""
+        with self._lock:
+            self._advance(at)
+            adaptive = variance is None
+            if adaptive:
+                variance = self._latency_meas_var
+            prior = self._x[LATENCY], self._P[LATENCY][LATENCY]
+            was_initialized = self._initialized[LATENCY]
+            accepted = self._update(LATENCY, latency, variance)
+            if adaptive and accepted and was_initialized:
+                # 혁신 제곱의 기댓값 = 사전 분산 + 측정 잡음 -> 측정 잡음 추정 (지수 평균)
+                innovation = latency - prior[0]
+                estimate = max(innovation * innovation - prior[1], 1e-8)
+                self._latency_meas_var = 0.9 * self._latency_meas_var + 0.1 * estimate
+            self._updates += accepted
+            return accepted
+
+    def predict_offset(self, at):
+        """시각 at의 오프셋 예측 (상태는 바꾸지 않음)
+
+        Returns:
+            tuple: (오프셋, 분산)
+        """
+        with self._lock:
+            x, P = self._x, self._P
+            dt = 0.0 if self._t is None else max(0.0, at - self._t)
+            offset = x[OFFSET] + x[DRIFT] * dt
+            variance = (P[0][0] + 2 * dt * P[0][1] + dt * dt * P[1][1]
+                        + self.offset_noise * dt + self.drift_noise * dt ** 3 / 3)
+            return offset, variance
+
+    def state(self):
+        """현재 사후 추정 (평균과 분산)"""
+        with self._lock:
+            x, P = self._x, self._P
+            return KalmanState(x[OFFSET], x[DRIFT], x[LATENCY],
+                               P[0][0], P[1][1], P[2][2],
+                               self._latency_meas_var, self._updates, self._t)
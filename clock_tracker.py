@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+백그라운드 시계 추적기
+- GUI가 떠 있는 동안 낮은 빈도로 계속 측정해 서버 오프셋/지연 추정을 갱신
+- 카운트다운과 발사 스레드는 타임스탬프가 붙은 스냅샷을 읽기만 함
+- 고해상도 서버 시각: 최근 측정 오프셋을 RTT 하한과의 거리로 가중 결합
+- Date 헤더(1초 단위): 매 측정을 구간 중앙의 초 경계에 맞춰 발사해 오프셋 구간을 유지/축소
+  새 측정 구간이 기존 구간과 어긋나면 최신 측정으로 재시작하고, 이전 스냅샷은 철회(on_update(None))한 뒤
+  구간이 다시 좁혀질 때까지(max_uncertainty 이하) 내보내지 않음
+- 지연/오프셋 흐름에 CUSUM 변화점 탐지: 경로가 바뀌면(VPN 재연결, Wi-Fi 로밍 등) 이전 경로의
+  측정과 RTT 하한을 버리고 짧은 간격으로 몇 번 측정해 빠르게 재동기화 (on_change로 알림)
+"""
+
+import time
+import threading
+from collections import deque, namedtuple
+
+from changepoint import CusumDetector
+from http_date import parse_http_date
+from probe_engine import ProbeEngine
+from rtt_envelope import RttEnvelopeFilter
+from sync_strategies import BisectionStrategy
+from time_extractors import extract_server_time, probe_method_for
+
+
+class ClockSnapshot(namedtuple('ClockSnapshot', [
+        'offset', 'latency', 'uncertainty', 'samples', 'extractor', 'updated_at', 'updated_perf'])):
+    """추적기 추정값 스냅샷 (offset/latency/uncertainty 단위: 초)"""
+
+    __slots__ = ()
+
+    def age(self):
+        """스냅샷이 만들어진 뒤 지난 시간 (초)"""
+        return time.perf_counter() - self.updated_perf
+
+
+class ClockTracker:
+    """서버 시계를 계속 추적하는 데몬 스레드"""
+
+    DRIFT_ALLOWANCE = 50e-6  # Date 구간을 경과 시간당 50ppm씩 넓힘 (로컬 시계 드리프트 허용)
+    COARSE_RESOLUTION = 0.5  # 이보다 거친 서버 시각은 구간 추적 사용
+    RESYNC_PROBES = 5        # 구간 변화 후 짧은 간격으로 측정할 횟수
+    RESYNC_INTERVAL = 0.2    # 재동기화 측정 간격 (초)
+
+    def __init__(self, engine=None, interval=5.0, window=30, on_update=None, max_uncertainty=0.05,
+                 on_change=None):
+        self.engine = engine or ProbeEngine()
+        self.interval = interval  # 측정 간격 (초)
+        self.max_uncertainty = max_uncertainty  # 이보다 불확실한 추정은 스냅샷으로 내보내지 않음
+        self.on_update = on_update
+        self.on_change = on_change  # 구간 변화 알림 (흐름 이름 'latency'/'offset', Changepoint)
+        self._detectors = {'latency': CusumDetector(), 'offset': CusumDetector()}
+        self.resyncs = 0       # 구간 변화로 재동기화한 횟수
+        self._fast_ticks = 0   # 남은 재동기화 측정 횟수
+        self._samples = deque(maxlen=window)  # 고해상도 측정 (offset, rtt, resolution)
+        self._envelope = RttEnvelopeFilter()
+        self._rtts = deque(maxlen=window)
+        self._bounds = None  # Date 구간 추적 상태 (lo, hi, 갱신 perf 시각)
+        self.conflicts = 0   # Date 구간이 어긋나 재시작한 횟수
+        self._bisection = BisectionStrategy()
+        self._snapshot = None
+        self._url = None
+        self._method = 'HEAD'
+        self._resolution = None  # 서버 시각 해상도 (첫 측정에서 확인)
+        self._lock = threading.Lock()
+        self._paused = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def url(self):
+        """추적 대상 URL (시작 전이면 None)"""
+        return self._url
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self):
+        """최신 추정값 스냅샷 (아직 없으면 None)"""
+        return self._snapshot
+
+    def seed(self, offset, uncertainty=0.0, latency=0.0):
+        """동기화 결과로 추적 상태 초기화
+
+        Date 구간은 불확실성을 아는 경우(이분 탐색 결과)에만 [offset ± 최소 10ms]로 시작하고,
+        모르는 경우 구간 밖에 참값이 있으면 복구할 수 없으므로 첫 측정부터 새로 좁힘
+        """
+        with self._lock:
+            if uncertainty > 0:
+                half_width = max(uncertainty, 0.01)
+                self._bounds = (offset - half_width, offset + half_width, time.perf_counter())
+            else:
+                self._bounds = None
+            self._samples.clear()
+            self._reset_detectors()
+        self._publish(offset, latency, uncertainty, 'seed')
+
+    def start(self, url):
+        """추적 시작 (다른 URL로 이미 실행 중이면 대상만 교체)"""
+        with self._lock:
+            if url != self._url:
+                self._samples.clear()
+                self._rtts.clear()
+                self._envelope = RttEnvelopeFilter()
+                self._resolution = None
+                self._reset_detectors()
+            self._url = url
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='clock-tracker')
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def pause(self):
+        """측정 일시 중지 (동기화 버스트, 발사 직전 구간에서 경쟁 방지)"""
+        self._paused.set()
+
+    def resume(self):
+        self._paused.clear()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._paused.is_set():
+                try:
+                    self._tick()
+                except Exception:
+                    pass  # 일시적인 네트워크 오류는 다음 주기에 재시도
+            if self._fast_ticks > 0:
+                self._fast_ticks -= 1
+                self._stop.wait(self.RESYNC_INTERVAL)
+            else:
+                self._stop.wait(self.interval)
+
+    def _tick(self):
+        url = self._url
+        if self._resolution is None:
+            # 첫 측정: 본문이 필요한지(GET), 서버 시각 해상도가 어떤지 확인
+            result = self.engine.run(self.engine.probe_at(url))
+            self._method = probe_method_for(result)
+            if self._method != 'HEAD':
+                result = self.engine.run(self.engine.probe_at(url, method=self._method))
+            extracted = extract_server_time(result)
+            if extracted is None:
+                return
+            self._resolution = extracted[2]
+            self._absorb(result, extracted)
+        elif self._resolution >= self.COARSE_RESOLUTION:
+            self._track_edge(url)
+        else:
+            result = self.engine.run(self.engine.probe_at(url, method=self._method))
+            extracted = extract_server_time(result)
+            if extracted is not None:
+                self._absorb(result, extracted)
+
+    def _absorb(self, result, extracted):
+        """측정 하나를 추적 상태에 반영하고 스냅샷 갱신"""
+        server_time, extractor, resolution = extracted
+        offset = server_time - (result['local_before'] + result['rtt'] / 2)
+        # Date 헤더 오프셋은 1초 톱니 잡음이라 지연만 탐지 (변화가 있으면 이전 경로 측정을 버린 뒤 반영)
+        self._detect('latency', result['rtt'] / 2)
+        if resolution < self.COARSE_RESOLUTION:
+            self._detect('offset', offset)
+        self._rtts.append(result['rtt'])
+
+        if resolution >= self.COARSE_RESOLUTION:
+            bounds = BisectionStrategy.constraint(result, parse_http_date)
+            with self._lock:
+                current = self._bounds
+            lo, hi = bounds if current is None else self._narrow(current[0], current[1], bounds)
+            with self._lock:
+                self._bounds = (lo, hi, time.perf_counter())
+            self._publish_bounds(extractor)
+            return
+
+        with self._lock:
+            self._samples.append((offset, result['rtt'], resolution))
+            # 큐잉 지연이 적은(RTT 하한에 가까운) 측정일수록 큰 비중
+            self._envelope.add(result['rtt'], result['local_before'])
+            estimate = self._envelope.combine(self._samples)
+            uncertainty = estimate.floor / 2 + resolution
+        self._publish(estimate.offset, self._median_latency(), uncertainty, extractor)
+
+    def _track_edge(self, url):
+        """Date 구간 추적: 드리프트 허용치만큼 넓힌 뒤 초 경계 측정 하나로 다시 좁힘"""
+        with self._lock:
+            bounds = self._bounds
+        if bounds is None:
+            result = self.engine.run(self.engine.probe_at(url))
+            extracted = extract_server_time(result)
+            if extracted is not None:
+                self._absorb(result, extracted)
+            return
+        lo, hi, updated = bounds
+        widen = (time.perf_counter() - updated) * self.DRIFT_ALLOWANCE
+        lo, hi = lo - widen, hi + widen
+        one_way = min(self._rtts) / 2 if self._rtts else 0.0
+
+        result, bounds = self.engine.run(
+            self._bisection.probe_edge(self.engine, url, lo, hi, one_way))
+        if bounds is None:
+            return
+        self._detect('latency', result['rtt'] / 2)
+        self._rtts.append(result['rtt'])
+        lo, hi = self._narrow(lo, hi, bounds)
+        with self._lock:
+            self._bounds = (lo, hi, time.perf_counter())
+        self._publish_bounds('date')
+
+    def _reset_detectors(self):
+        for detector in self._detectors.values():
+            detector.reset()
+
+    def _detect(self, stream, value):
+        """변화점 탐지기에 측정 하나 반영, 구간 변화면 이전 경로 기준 상태를 버리고 재동기화 시작
+
+        RTT 하한과 고해상도 오프셋 표본은 경로에 묶여 있어 버리고, Date 구간은 송수신 시각만으로
+        얻은 제약이라 경로가 바뀌어도 유효하므로 유지
+        """
+        change = self._detectors[stream].update(value)
+        if change is None:
+            return None
+        with self._lock:
+            self._samples.clear()
+            self._rtts.clear()
+            self._envelope = RttEnvelopeFilter()
+        self.resyncs += 1
+        self._fast_ticks = self.RESYNC_PROBES
+        if self.on_change:
+            self.on_change(stream, change)
+        return change
+
+    def _narrow(self, lo, hi, bounds):
+        """현재 구간에 새 측정 구간 반영
+
+        어긋나면 최신 측정 구간(약 1초 폭)으로 재시작하고 이전 스냅샷을 철회함 (on_update(None)으로 알림).
+        재시작한 구간은 max_uncertainty보다 넓어 다시 좁혀질 때까지 스냅샷으로 내보내지 않음
+        """
+        lo, hi, conflict = BisectionStrategy.intersect(lo, hi, bounds)
+        if conflict:
+            self.conflicts += 1
+            withdrawn, self._snapshot = self._snapshot, None
+            if withdrawn is not None and self.on_update:
+                self.on_update(None)
+        return lo, hi
+
+    def _publish_bounds(self, extractor):
+        with self._lock:
+            lo, hi, _ = self._bounds
+        self._publish((lo + hi) / 2, self._median_latency(), (hi - lo) / 2, extractor)
+
+    def _median_latency(self):
+        if not self._rtts:
+            return self._snapshot.latency if self._snapshot else 0.0
+        rtts = sorted(self._rtts)
+        return rtts[len(rtts) // 2] / 2
+
+    def _publish(self, offset, latency, uncertainty, extractor):
+        # 아직 수렴하지 않은 추정(넓은 Date 구간 등)으로 동기화 결과를 덮어쓰지 않음
+        if extractor != 'seed' and uncertainty > self.max_uncertainty:
+            return
+        samples = (self._snapshot.samples + 1) if self._snapshot and extractor != 'seed' else 0
+        self._snapshot = ClockSnapshot(offset, latency, uncertainty, samples, extractor,
+                                       time.time(), time.perf_counter())
+        if self.on_update:
+            self.on_update(self._snapshot)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Date 헤더 구간 제약 누적기
+- Date 헤더 D를 받은 응답은 로컬 [송신, 수신] 구간의 어느 순간에 서버 시계가 [D, D+1) 안에
+  있었다는 증명이므로 오프셋은 (D - 수신, D + 1 - 송신) 안에 있음 (RTT 중앙 가정 없음)
+- 모든 측정(세션을 넘어)의 제약을 교집합으로 누적: 초 경계 가까이 도착한 측정일수록 구간을 좁힘
+- 가장 강한 하한/상한 두 제약만 유지하므로 메모리는 측정 수와 무관하게 일정
+- 시간이 지나면 로컬 시계 드리프트 허용치만큼 구간을 넓혀 오래된 제약의 효력을 줄임
+"""
+
+import threading
+
+from http_date import parse_http_date
+
+
+class DateConstraintSolver:
+    """잘린(1초 단위) 서버 시각 관측으로 오프셋 가능 구간 계산"""
+
+    def __init__(self, drift_allowance=50e-6):
+        self.drift_allowance = drift_allowance  # 경과 시간당 구간 확장 (로컬 시계 드리프트 허용)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._lo = None        # 오프셋 하한 (_ref 시각 기준)
+            self._hi = None        # 오프셋 상한
+            self._ref = None       # 구간 기준 로컬 시각
+            self.observations = 0  # 반영한 관측 수
+            self.conflicts = 0     # 기존 구간과 어긋나 재시작한 횟수
+
+    def _advance(self, at):
+        """구간을 로컬 시각 at 기준으로 옮기며 드리프트 허용치만큼 넓힘"""
+        widen = abs(at - self._ref) * self.drift_allowance
+        self._lo -= widen
+        self._hi += widen
+        self._ref = max(self._ref, at)
+
+    def add(self, server_second, local_send, local_receive):
+        """관측 하나 반영
+
+        Args:
+            server_second: Date 헤더 값 (정수 epoch 초)
+            local_send: 요청 송신 시작 로컬 시각
+            local_receive: 응답 첫 바이트 수신 로컬 시각
+
+        Returns:
+            bool: 기존 구간과 겹쳐 교집합을 취했으면 True, 어긋나 새로 시작했으면 False
+        """
+        lo = server_second - local_receive
+        hi = server_second + 1 - local_send
+        with self._lock:
+            self.observations += 1
+            if self._lo is None:
+                self._lo, self._hi, self._ref = lo, hi, local_receive
+                return True
+            self._advance(local_receive)
+            new_lo, new_hi = max(self._lo, lo), min(self._hi, hi)
+            if new_lo < new_hi:
+                self._lo, self._hi = new_lo, new_hi
+                return True
+            # 어긋남: 로컬 시계 보정/서버 시계 변경으로 보고 최신 관측으로 재시작
+            self.conflicts += 1
+            self._lo, self._hi, self._ref = lo, hi, local_receive
+            return False
+
+    def add_result(self, result, parse_date=parse_http_date):
+        """측정 결과 dict (date, local_before, rtt) 반영, Date 헤더가 없으면 None"""
+        server_second = parse_date(result['date']) if result.get('date') else None
+        if server_second is None:
+            return None
+        return self.add(int(server_second), result['local_before'], result['local_before'] + result['rtt'])
+
+    def bounds(self, at=None):
+        """로컬 시각 at 기준 오프셋 구간 (lo, hi), 관측이 없으면 None"""
+        with self._lock:
+            if self._lo is None:
+                return None
+            widen = abs(at - self._ref) * self.drift_allowance if at is not None else 0.0
+            return self._lo - widen, self._hi + widen
+
+    def to_dict(self):
+        """누적 데이터 저장용"""
+        with self._lock:
+            return {'lo': self._lo, 'hi': self._hi, 'ref': self._ref,
+                    'observations': self.observations, 'conflicts': self.conflicts}
+
+    @classmethod
+    def from_dict(cls, data, drift_allowance=50e-6):
+        solver = cls(drift_allowance)
+        if data.get('lo') is not None:
+            solver._lo, solver._hi, solver._ref = data['lo'], data['hi'], data['ref']
+        solver.observations = data.get('observations', 0)
+        solver.conflicts = data.get('conflicts', 0)
+        return solver
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간 감쇠 누적 통계 (대상 호스트별)
+- 측정마다 가중치 1로 더하고, 시간이 지나면 반감기마다 기존 가중치를 절반으로 줄임
+  (6개월 전 다른 사이트 측정이 방금 측정과 같은 비중을 갖지 않도록)
+- 가중 평균/분산을 Welford 방식으로 갱신하므로 측정 하나당 O(1), 전체 기록을 다시 훑지 않음
+- 상태(가중치 합, 평균, 제곱편차 합, 마지막 시각)만 저장하면 세션을 넘어 이어짐
+- 호스트별로 P² 사분위수도 함께 유지해 IQR 이상값 경계를 전체 기록 재정렬 없이 적용
+  P²는 감쇠할 수 없으므로 반감기마다 새 세대로 다시 시작하고, 새 세대 측정이 모자라는 동안은
+  직전 세대로 판정 (경계가 평균/분산과 같은 시간 범위, 최근 반감기 1~2배 구간의 분포를 따름)
+"""
+
+import math
+
+from streaming_quantiles import Quartiles
+
+
+class DecayedStats:
+    """지수 시간 감쇠 가중 평균/분산"""
+
+    __slots__ = ('half_life', 'weight', 'weight_sq', 'mean', 'm2', 'count', 'updated_at')
+
+    def __init__(self, half_life):
+        self.half_life = half_life  # 가중치가 절반이 되는 시간 (초)
+        self.weight = 0.0     # 감쇠된 가중치 합
+        self.weight_sq = 0.0  # 감쇠된 가중치 제곱합 (유효 표본 수 계산용)
+        self.mean = 0.0
+        self.m2 = 0.0         # 감쇠된 가중 제곱편차 합
+        self.count = 0        # 감쇠와 무관한 누적 측정 수
+        self.updated_at = None
+
+    def _decay_factor(self, at):
+        if self.updated_at is None or at <= self.updated_at:
+            return 1.0
+        return 0.5 ** ((at - self.updated_at) / self.half_life)
+
+    def add(self, value, at):
+        """측정 하나 반영 (at: 측정 시각, 마지막 갱신보다 과거면 그만큼 감쇠된 가중치로 더함)"""
+        if self.updated_at is not None and at < self.updated_at:
+            w = 0.5 ** ((self.updated_at - at) / self.half_life)
+        else:
+            factor = self._decay_factor(at)
+            self.weight *= factor
+            self.weight_sq *= factor * factor
+            self.m2 *= factor
+            self.updated_at = at
+            w = 1.0
+        self.weight += w
+        self.weight_sq += w * w
+        delta = value - self.mean
+        self.mean += w * delta / self.weight
+        self.m2 += w * delta * (value - self.mean)
+        self.count += 1
+
+    @property
+    def variance(self):
+        """가중 분산 (유효 표본 수 기준 불편 보정)"""
+        if self.weight <= 0:
+            return 0.0
+        effective = self.effective_samples
+        if effective <= 1:
+            return 0.0
+        return self.m2 / self.weight * effective / (effective - 1)
+
+    @property
+    def stdev(self):
+        return math.sqrt(max(self.variance, 0.0))
+
+    @property
+    def effective_samples(self):
+        """유효 표본 수 (가중치 합^2 / 가중치 제곱합)"""
+        return self.weight * self.weight / self.weight_sq if self.weight_sq > 0 else 0.0
+
+    def weight_at(self, now):
+        """시각 now 기준 남아 있는 가중치 (상태는 바꾸지 않음)"""
+        return self.weight * self._decay_factor(now)
+
+    def to_dict(self):
+        return {'weight': self.weight, 'weight_sq': self.weight_sq, 'mean': self.mean,
+                'm2': self.m2, 'count': self.count, 'updated_at': self.updated_at}
+
+    @classmethod
+    def from_dict(cls, data, half_life):
+        stats = cls(half_life)
+        for key in ('weight', 'weight_sq', 'mean', 'm2', 'count', 'updated_at'):
+            if key in data:
+                setattr(stats, key, data[key])
+        return stats
+
+
+class HostStatistics:
+    """대상 호스트별 오프셋/지연 시간 감쇠 통계"""
+
+    FIELDS = ('offset', 'latency')
+
+    def __init__(self, half_life=7 * 86400.0, iqr_factor=1.5, min_samples=8, max_rejects=3, min_iqr=1e-4):
+        self.half_life = half_life
+        self.iqr_factor = iqr_factor    # Q1 - factor*IQR ~ Q3 + factor*IQR 밖의 측정은 통계에서 제외
+        self.min_samples = min_samples  # 이상값 판정을 시작하는 누적 측정 수
+        self.max_rejects = max_rejects  # 연속으로 이만큼 벗어나면 실제 변화로 보고 통계를 새로 시작
+        self.min_iqr = min_iqr          # IQR 하한 (해상도가 거친 측정에서 IQR이 0이 되는 경우)
+        self._hosts = {}
+        self._quartiles = {}           # 현재 세대 사분위수
+        self._previous_quartiles = {}  # 직전 세대 사분위수 (없으면 None)
+        self._quartiles_started = {}   # 현재 세대 첫 측정 시각
+        self._rejects = {}
+
+    def __contains__(self, host):
+        return host in self._hosts
+
+    def hosts(self):
+        return list(self._hosts)
+
+    def stats(self, host):
+        """호스트의 {'offset': DecayedStats, 'latency': DecayedStats} (없으면 None)"""
+        return self._hosts.get(host)
+
+    def quartiles(self, host):
+        """호스트의 이상값 판정에 쓰는 {'offset': Quartiles, 'latency': Quartiles} (없으면 None)
+
+        항목별로 현재 세대 측정이 min_samples 미만이면 직전 세대
+        """
+        current = self._quartiles.get(host)
+        if current is None:
+            return None
+        previous = self._previous_quartiles.get(host)
+        return {name: previous[name] if previous and current[name].count < self.min_samples else current[name]
+                for name in self.FIELDS}
+
+    def _rotate_quartiles(self, host, at):
+        """현재 세대가 반감기보다 오래됐으면 새 세대 시작"""
+        started = self._quartiles_started.get(host)
+        if started is None:
+            self._quartiles_started[host] = at
+        elif at - started >= self.half_life:
+            self._previous_quartiles[host] = self._quartiles[host]
+            self._quartiles[host] = {name: Quartiles() for name in self.FIELDS}
+            self._quartiles_started[host] = at
+
+    def _is_outlier(self, quartiles, value):
+        if quartiles.count < self.min_samples:
+            return False
+        q1, q3 = quartiles.q1.value, quartiles.q3.value
+        margin = self.iqr_factor * max(q3 - q1, self.min_iqr)
+        return not q1 - margin <= value <= q3 + margin
+
+    def _reset_host(self, host):
+        self._hosts[host] = {name: DecayedStats(self.half_life) for name in self.FIELDS}
+        self._quartiles[host] = {name: Quartiles() for name in self.FIELDS}
+        self._previous_quartiles[host] = None
+        self._quartiles_started[host] = None
+
+    def add(self, host, offset, latency, at):
+        """측정 하나 반영
+
+        Returns:
+            bool: 반영했으면 True, 이상값으로 제외했으면 False
+        """
+        if host not in self._hosts:
+            self._reset_host(host)
+        self._rotate_quartiles(host, at)
+        quartiles = self.quartiles(host)
+        if self._is_outlier(quartiles['offset'], offset) or (latency > 0 and self._is_outlier(quartiles['latency'], latency)):
+            self._rejects[host] = self._rejects.get(host, 0) + 1
+            if self._rejects[host] < self.max_rejects:
+                return False
+            # 연속 이탈: 경로 변경/로컬 시계 보정으로 보고 이 측정부터 다시 누적
+            self._reset_host(host)
+            self._quartiles_started[host] = at
+        self._rejects[host] = 0
+        quartiles = self._quartiles[host]
+        entry = self._hosts[host]
+        entry['offset'].add(offset, at)
+        quartiles['offset'].add(offset)
+        if latency > 0:
+            entry['latency'].add(latency, at)
+            quartiles['latency'].add(latency)
+        return True
+
+    def clear(self, half_life=None):
+        if half_life is not None:
+            self.half_life = half_life
+        self._hosts.clear()
+        self._quartiles.clear()
+        self._previous_quartiles.clear()
+        self._quartiles_started.clear()
+        self._rejects.clear()
+
+    def to_dict(self):
+        """누적 데이터 저장용"""
+        return {
+            'half_life': self.half_life,
+            'hosts': {host: {name: stats.to_dict() for name, stats in entry.items()}
+                      for host, entry in self._hosts.items()},
+            'quartiles': {host: {name: quartiles.to_dict() for name, quartiles in entry.items()}
+                          for host, entry in self._quartiles.items()},
+            'previous_quartiles': {host: {name: quartiles.to_dict() for name, quartiles in entry.items()}
+                                   for host, entry in self._previous_quartiles.items() if entry},
+            'quartiles_started': dict(self._quartiles_started),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        store = cls(data.get('half_life', 7 * 86400.0))
+        for host, entry in data.get('hosts', {}).items():
+            store._hosts[host] = {name: DecayedStats.from_dict(entry.get(name, {}), store.half_life)
+                                  for name in cls.FIELDS}
+            saved = data.get('quartiles', {}).get(host, {})
+            store._quartiles[host] = {name: Quartiles.from_dict(saved[name]) if name in saved else Quartiles()
+                                      for name in cls.FIELDS}
+            previous = data.get('previous_quartiles', {}).get(host)
+            store._previous_quartiles[host] = ({name: Quartiles.from_dict(previous[name]) if name in previous
+                                                else Quartiles() for name in cls.FIELDS} if previous else None)
+            # 세대 시작 시각이 없던 이전 형식: 마지막 측정부터 한 반감기 동안만 기존 사분위수 사용
+            store._quartiles_started[host] = data.get('quartiles_started', {}).get(
+                host, store._hosts[host]['offset'].updated_at)
+        return store
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 시계 드리프트(skew) 추정
+- 오프셋을 로컬 시각에 대해 Theil-Sen 회귀 (쌍별 기울기의 중앙값, 이상값에 강함)
+- 누적 동기화 데이터와 시계 추적기 측정을 함께 사용
+- 목표 시각의 오프셋을 외삽하고, 외삽 거리에 비례해 커지는 불확실성을 함께 반환
+
+세션을 넘어 비교해야 하므로 로컬 시각은 monotonic 대신 벽시계(time.time()) 사용
+"""
+
+import math
+import statistics
+from collections import deque, namedtuple
+
+DriftFit = namedtuple('DriftFit', [
+    'slope',            # 드리프트 (초/초, 1e-6 = 1ppm)
+    'slope_sigma',      # 기울기 표준오차 추정
+    'intercept',        # reference_time 에서의 오프셋
+    'residual_sigma',   # 회귀선 대비 잔차의 강건 표준편차
+    'samples',
+    'span',             # 표본이 걸친 시간 (초)
+    'reference_time',   # 표본 시각의 중앙값
+])
+
+
+def _robust_sigma(values, center):
+    """MAD 기반 표준편차 추정"""
+    return 1.4826 * statistics.median(abs(v - center) for v in values)
+
+
+def theil_sen(points, min_dx=1.0):
+    """Theil-Sen 회귀
+
+    Args:
+        points: [(x, y)] 목록
+        min_dx: 이보다 가까운 두 점의 기울기는 잡음이 커서 제외
+
+    Returns:
+        tuple: (기울기 중앙값, 쌍별 기울기 목록) 또는 쌍이 없으면 (None, [])
+    """
+    slopes = []
+    for i in range(len(points)):
+        x1, y1 = points[i]
+        for j in range(i + 1, len(points)):
+            x2, y2 = points[j]
+            dx = x2 - x1
+            if abs(dx) >= min_dx:
+                slopes.append((y2 - y1) / dx)
+    if not slopes:
+        return None, []
+    return statistics.median(slopes), slopes
+
+
+class DriftEstimator:
+    """오프셋 시계열로부터 드리프트를 추정하고 목표 시각의 오프셋 예측"""
+
+    PRIOR_DRIFT_SIGMA = 20e-6  # 모델이 없을 때 가정하는 드리프트 크기 (일반 PC 수정 발진기)
+
+    def __init__(self, window=200, min_span=60.0, max_abs_drift=500e-6):
+        self.min_span = min_span            # 이보다 짧은 구간으로는 기울기를 믿지 않음
+        self.max_abs_drift = max_abs_drift  # 500ppm 넘는 기울기는 측정 오류로 간주
+        self._points = deque(maxlen=window)  # (로컬 시각, 오프셋)
+        self._fit = None
+        self._dirty = False
+
+    def clear(self):
+        self._points.clear()
+        self._fit = None
+        self._dirty = False
+
+    def add(self, local_time, offset):
+        self._points.append((local_time, offset))
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._points)
+
+    def fit(self):
+        """드리프트 모델 (표본이 부족하거나 기울기가 비현실적이면 None), 새 표본이 없으면 캐시 사용"""
+        if not self._dirty:
+            return self._fit
+        self._dirty = False
+        self._fit = None
+
+        points = list(self._points)
+        if len(points) < 5:
+            return None
+        times = [p[0] for p in points]
+        span = max(times) - min(times)
+        if span < self.min_span:
+            return None
+
+        slope, slopes = theil_sen(points)
+        if slope is None or abs(slope) > self.max_abs_drift:
+            return None
+
+        reference_time = statistics.median(times)
+        intercept = statistics.median(y - slope * (x - reference_time) for x, y in points)
+        residuals = [y - (intercept + slope * (x - reference_time)) for x, y in points]
+        self._fit = DriftFit(
+            slope=slope,
+            slope_sigma=_robust_sigma(slopes, slope) / math.sqrt(len(points)),
+            intercept=intercept,
+            residual_sigma=_robust_sigma(residuals, 0.0),
+            samples=len(points),
+            span=span,
+            reference_time=reference_time,
+        )
+        return self._fit
+
+    def predict(self, offset_now, local_now, local_target):
+        """local_now에 추정한 오프셋을 목표 시각까지 드리프트만큼 외삽
+
+        Returns:
+            tuple: (목표 시각의 예측 오프셋, 외삽 불확실성(초))
+                   모델이 없으면 오프셋은 그대로 두고 사전 드리프트 크기로 불확실성만 계산
+        """
+        model = self.fit()
+        horizon = local_target - local_now
+        if model is None:
+            return offset_now, self.PRIOR_DRIFT_SIGMA * abs(horizon)
+        return offset_now + model.slope * horizon, model.slope_sigma * abs(horizon)
@@ -11,7 +11,6 @@ import time
 import threading
 import webbrowser
 from datetime import datetime, timezone
-from urllib.request import urlopen
 import queue
 import statistics
 import ctypes
@@ -22,6 +21,29 @@ import json
 import logging
 import socket
 import struct
+from collections import deque
+from urllib.parse import urlparse
+
+from probe_transport import get_shared_transport, phase_durations_ms
+from probe_engine import ProbeEngine
+from http_date import parse_http_date
+from time_extractors import probe_method_for
+from clock_tracker import ClockTracker
+from drift_estimator import DriftEstimator
+from clock_kalman import ClockKalmanFilter
+from rtt_envelope import RttEnvelopeFilter
+from source_combiner import SourceCombiner, TimeSource
+from date_constraints import DateConstraintSolver
+from path_asymmetry import PathAsymmetryCalibrator
+from backend_clusters import BackendClusterer
+from changepoint import CusumDetector
+from decayed_stats import HostStatistics
+from batch_stats import MeasurementColumns, latency_mask, sigma_mask
+from bootstrap_ci import ArrivalBootstrap
+from fire_optimizer import FireTimeOptimizer
+from latency_profile import TimeOfDayLatencyModel
+from sync_strategies import (MultiSampleStrategy, SecondChangeStrategy, MonitoringStrategy, BurstEdgeStrategy,
+                             BisectionStrategy, EdgeSelectionStrategy)
 
 # pyautogui와 keyboard 모듈 임포트 (선택적)
 try:
@@ -45,6 +67,9 @@ except ImportError:
 
 
 class TimeSyncMacroGUI:
+    # 1초 단위 Date 헤더로도 ms 수준 오프셋을 주는 동기화 방법 (드리프트/클러스터 표본에 사용)
+    PRECISE_METHODS = ('second_change_catch', 'second_edge_bisection', 'second_edge_burst')
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("정밀 구매 타이밍 매크로 v2.0")
@@ -53,19 +78,54 @@ class TimeSyncMacroGUI:
         
         self.server_time_offset = 0
         self.network_latency = 0
+        self.offset_uncertainty = 0  # 오프셋 불확실성 (이분 탐색 최종 구간 폭의 절반)
+        self.predicted_offset_uncertainty = 0  # 목표 시각 오프셋 예측의 불확실성 (결합 구간 반폭)
+        self.offset_estimated_at = None  # server_time_offset을 추정한 로컬 시각 (드리프트 외삽 기준)
+        self.offset_withdrawn = False  # 추적기가 Date 구간 충돌로 스냅샷을 철회함 (재동기화 또는 재수렴 전까지 미동기화)
         # NTP 관련 변수 추가
         self.ntp_server_time_offset = 0
         self.ntp_network_latency = 0
-        # 적응형 지연 예측 시스템
-        self.adaptive_latency_history = []
+        self.ntp_offset_error = 0  # NTP 오프셋 오차 한계 (비대칭 한계 + 루트 지연/분산)
+        # 적응형 지연 예측 시스템 (오프셋/드리프트/지연 칼만 필터의 사후 추정)
+        # 사이트마다 서버 시계와 경로가 다르므로 호스트별로 따로 유지 (clock_filter는 대상 호스트 필터)
+        self.clock_filters = {}
         self.predicted_latency = 0
-        self.latency_variance = 0
+        self.latency_variance = 0  # 다음 측정 지연의 예측 분산 (사후 분산 + 측정 잡음)
         self.is_running = False
         self.log_queue = queue.Queue()
         self.measurement_history = []  # 측정 히스토리 저장
         self.browser_opened = False
         self.timing_adjustments = []  # 타이밍 조정 히스토리
         self.execution_time_history = [0.100]  # 클릭 실행시간 히스토리 (실측값 500ms로 초기화)
+        self.probe_transport = get_shared_transport()  # keep-alive 측정 연결 공유
+        self.reconnect_logged_hosts = set()  # 재연결 비용을 이미 기록한 호스트 (진단 측정은 호스트당 한 번)
+        self.probe_engine = ProbeEngine(self.probe_transport)  # 예약 발사 asyncio 측정 엔진
+        # 동기화 이후에도 낮은 빈도로 계속 측정해 오프셋을 최신으로 유지
+        # 추적 측정에서 경로 변화(지연/오프셋 계단 변화)가 감지되면 추적기가 빠르게 재동기화
+        self.clock_tracker = ClockTracker(self.probe_engine, interval=5.0,
+                                          on_update=self.apply_clock_snapshot,
+                                          on_change=self.apply_clock_change)
+        # 로컬 시계 드리프트 추정 (누적 데이터 + 추적 측정)
+        self.drift_estimator = DriftEstimator()
+        self.live_offset_samples = deque(maxlen=100)  # 추적기 측정 (로컬 시각, 오프셋)
+        self.rtt_envelopes = {}  # 호스트별 RTT 하한 추적 (다중 측정 오프셋 가중용)
+        self.source_combiner = SourceCombiner()  # NTP/HTTP 소스별 정답 구간 결합
+        self.last_combined = None  # 마지막 결합 결과 (불일치 소스 로그용)
+        self.date_constraints = {}  # 호스트별 Date 헤더 구간 제약 누적 (세션 간 유지)
+        # 측정 엔진 작업 스레드가 갱신하고 동기화/저장 스레드가 읽으므로 사전과 제출 순서를 함께 보호
+        self.date_constraints_lock = threading.Lock()
+        self.path_asymmetry = PathAsymmetryCalibrator()  # 호스트별 전방/복귀 지연 비율 (세션 간 유지)
+        self.active_host = None  # 동기화/발사 대상 호스트
+        self.backend_clusterer = BackendClusterer()  # 로드밸런서 뒤 백엔드별 시계 분리
+        self.backend_clusters = []  # 최근 정밀 측정의 백엔드 클러스터 (측정 수 내림차순)
+        self.backend_blend_offset = 0  # 클러스터 구분 없이 섞은 오프셋 중앙값
+        self.backend_shift = 0  # 발사 대상 백엔드 클러스터의 혼합 추정 대비 차이 (발사 중에만 적용)
+        self.host_stats = HostStatistics()  # 호스트별 시간 감쇠 누적 통계와 P² 사분위수 (측정당 O(1) 갱신)
+        self.sync_bootstrap = ArrivalBootstrap()  # 마지막 동기화의 오프셋/지연/도착 부트스트랩 신뢰구간
+        self.fire_optimizer = FireTimeOptimizer()  # 0~20ms 도착 확률 최대 발사 시각
+        self.wake_error_history = []  # 실제 깨어난 시각 - 예정 발사 시각 (최근 20회)
+        self.latency_model = TimeOfDayLatencyModel()  # 호스트 x 시간대별 지연 분포 (판매 시각 혼잡 반영)
+        self.probe_engine.add_observer(self.observe_probe_result)
         
         # 누적 동기화 데이터 (새로 추가)
         self.cumulative_measurements = []  # 모든 동기화 세션의 측정값 누적
@@ -73,6 +133,7 @@ class TimeSyncMacroGUI:
         self.cumulative_server_offset = 0  # 누적 평균 서버 오프셋
         self.cumulative_network_latency = 0  # 누적 평균 네트워크 지연
         self.offset_stability = 0  # 오프셋 안정성 (표준편차)
+        self.edge_stats = {}  # 호스트(netloc)별 엣지 주소 측정 통계 및 최적 주소
         
         # 구매 버튼 위치 관련 변수들
         self.purchase_button_positions = []  # 여러 좌표 저장
@@ -195,38 +256,106 @@ class TimeSyncMacroGUI:
             if end_time - time.perf_counter() > 0.0001:  # 0.1ms 이상 남았으면
                 time.sleep(0)  # yield to other threads
     
-    def update_adaptive_latency_prediction(self, new_latency):
-        """적응형 지연 시간 예측 업데이트"""
-        self.adaptive_latency_history.append(new_latency)
-        
-        # 최근 20개 측정값만 유지
-        if len(self.adaptive_latency_history) > 20:
-            self.adaptive_latency_history.pop(0)
-        
-        if len(self.adaptive_latency_history) >= 3:
-            import statistics
-            
-            # 가중 평균 (최근 값에 더 높은 가중치)
-            weights = [i + 1 for i in range(len(self.adaptive_latency_history))]
-            weighted_sum = sum(w * l for w, l in zip(weights, self.adaptive_latency_history))
-            weight_sum = sum(weights)
-            self.predicted_latency = weighted_sum / weight_sum
-            
-            # 분산 계산
-            self.latency_variance = statistics.variance(self.adaptive_latency_history)
-            
-            self.logger.debug(f"적응형 지연 예측 업데이트: {self.predicted_latency*1000:.1f}ms ± {self.latency_variance**0.5*1000:.1f}ms")
+    @property
+    def clock_filter(self):
+        """대상 호스트(active_host)의 칼만 필터"""
+        return self.host_clock_filter(self.active_host)
+    
+    def host_clock_filter(self, host):
+        """호스트의 칼만 필터 (없으면 생성)"""
+        host = host or ''
+        if host not in self.clock_filters:
+            self.clock_filters[host] = ClockKalmanFilter()
+        return self.clock_filters[host]
     
-    def get_optimized_click_timing(self, target_timestamp):
-        """최적화된 클릭 타이밍 계산"""
+    def is_precise_measurement(self, measurement):
+        """서버 시각을 초 미만 해상도로 얻은 측정인지
+
+        Date 헤더(1초 단위) 다중 측정의 오프셋은 최대 1초 톱니 오차가 있어 오프셋/기울기 추정에서 제외
+        """
+        return measurement.get('resolution', 1.0) < 0.5 or measurement.get('method') in self.PRECISE_METHODS
+    
+    def update_adaptive_latency_prediction(self, new_latency, measured_at=None):
+        """적응형 지연 시간 예측 업데이트 (칼만 필터에 지연 측정 하나 반영)"""
+        accepted = self.clock_filter.update_latency(new_latency, measured_at or time.time())
+        if not accepted:
+            self.logger.debug(f"지연 측정 이상값 제외: {new_latency*1000:.1f}ms")
+        self.refresh_filter_estimates()
+    
+    def refresh_filter_estimates(self):
+        """칼만 필터 사후 추정을 예측 지연 값에 반영"""
+        state = self.clock_filter.state()
+        self.predicted_latency = state.latency
+        self.latency_variance = state.latency_var + state.latency_noise
+        self.logger.debug(f"적응형 지연 예측 업데이트: {self.predicted_latency*1000:.1f}ms ± {self.latency_variance**0.5*1000:.1f}ms")
+    
+    @staticmethod
+    def offset_measurement_variance(measurement):
+        """누적 측정 하나의 오프셋 오차 분산
+
+        비대칭 경로 오차는 단방향 지연 범위 안에서 균등하다고 보고, 서버 시각 해상도와
+        이분 탐색 구간 폭(있으면)을 더함. 해상도 기록이 없는 예전 다중 측정은 Date 헤더(1초)
+        """
+        resolution = measurement.get('resolution')
+        if resolution is None:
+            resolution = 1.0 if measurement.get('method') == 'traditional_multi_sample' else 0.0
+        variance = measurement['latency'] ** 2 / 3 + resolution ** 2 / 12
+        if 'uncertainty' in measurement:
+            variance += measurement['uncertainty'] ** 2 / 3
+        return max(variance, 1e-8)
+    
+    def feed_clock_filter(self, measurement, weight=1.0):
+        """누적 측정 하나를 그 호스트의 칼만 필터에 반영
+
+        지연은 모든 측정에서, 오프셋은 정밀한 측정에서만 반영 (Date 헤더 톱니 오차가 사후 평균을 끌지 않도록)
+
+        Args:
+            weight: 시간 감쇠 가중치 (0~1), 측정 오차 분산을 가중치로 나눠 오래된 측정의 비중을 줄임
+        """
+        clock_filter = self.host_clock_filter(measurement.get('host'))
+        if self.is_precise_measurement(measurement):
+            clock_filter.update_offset(measurement['offset'], self.offset_measurement_variance(measurement) / weight,
+                                       measurement['timestamp'])
+        if measurement['latency'] > 0:
+            variance = None if weight >= 1.0 else clock_filter.state().latency_noise / weight
+            clock_filter.update_latency(measurement['latency'], measurement['timestamp'], variance)
+    
+    def rebuild_clock_filter(self, min_weight=1e-3):
+        """누적 데이터 전체로 호스트별 칼만 필터 재구성 (데이터 로드, 통계 재계산 시)
+
+        감쇠 통계와 같은 반감기로 측정마다 가중치를 매겨 반영하고, 가중치가 min_weight 미만인
+        오래된 측정(반감기의 약 10배)은 제외. 드리프트 초기값은 Theil-Sen 추정 (이상값에 강해 초반 수렴을 안정시킴)
+        """
+        self.rebuild_drift_samples()
+        drift = self.drift_estimator.fit()
+        now = time.time()
+        half_life = self.host_stats.half_life
+        self.clock_filters = {}
+        for m in sorted(self.cumulative_measurements, key=lambda m: m['timestamp']):
+            weight = min(1.0, 0.5 ** ((now - m['timestamp']) / half_life))
+            if weight < min_weight:
+                continue
+            host = m.get('host') or ''
+            if host not in self.clock_filters:
+                clock_filter = self.host_clock_filter(host)
+                if drift is not None:
+                    clock_filter.reset(drift=drift.slope, drift_var=max(drift.slope_sigma, 1e-6) ** 2)
+            self.feed_clock_filter(m, weight)
+        self.refresh_filter_estimates()
+    
+    def get_optimized_click_timing(self, target_timestamp, network_delay=None):
+        """최적화된 클릭 타이밍 계산
+
+        Args:
+            network_delay: 발사에 쓸 단방향 지연 (시간대 보정값 등, 없으면 현재 추정값)
+        """
         current_time = time.time()
         
-        # 기본 예측 지연시간 사용 (적응형이 있으면 사용, 없으면 기본값)
-        if self.predicted_latency > 0:
+        # 기본 예측 지연시간 사용 (칼만 필터 사후 평균이 있으면 사용, 없으면 기본값)
+        if network_delay is not None:
+            predicted_network_delay = network_delay
+        elif self.predicted_latency > 0:
             predicted_network_delay = self.predicted_latency
-            # 분산이 큰 경우 보수적으로 조정
-            if self.latency_variance > 0.001:  # 1ms 이상의 분산
-                predicted_network_delay += self.latency_variance**0.5  # 표준편차만큼 여유
         else:
             predicted_network_delay = self.network_latency
         
@@ -236,26 +365,28 @@ class TimeSyncMacroGUI:
         else:
             avg_execution_delay = 0.003  # 기본 3ms
         
-        # 시스템 부하 및 프로세스 우선순위 고려 (간단한 휴리스틱)
-        system_load_factor = 1.0
-        if len(self.adaptive_latency_history) > 5:
-            recent_variance = statistics.variance(self.adaptive_latency_history[-5:])
-            if recent_variance > 0.0001:  # 0.1ms 이상의 최근 분산
-                system_load_factor = 1.2  # 20% 여유 추가
+        # 목표 시각의 오프셋 (마지막 추정 이후 드리프트만큼 외삽)
+        target_offset, target_offset_uncertainty = self.predict_offset_at(target_timestamp)
+        self.predicted_offset_uncertainty = target_offset_uncertainty
+        
+        # 경로 비대칭 보정: HTTP 오프셋은 RTT/2 가정이므로 편향을 빼고 전방 지연을 더함
+        forward_delay = self.path_asymmetry.forward_delay(self.active_host, 2 * predicted_network_delay)
+        target_offset -= forward_delay - predicted_network_delay
         
         # 최적 클릭 시점 계산
         optimal_click_time = (target_timestamp 
-                             - predicted_network_delay * system_load_factor
+                             - forward_delay
                              - avg_execution_delay
-                             - self.server_time_offset)
+                             - target_offset)
         
         # 남은 시간 계산
         time_until_click = optimal_click_time - current_time
         
         self.logger.debug(f"최적 클릭 타이밍 계산: "
-                         f"예측지연={predicted_network_delay*1000:.1f}ms, "
+                         f"예측지연={predicted_network_delay*1000:.1f}ms(±{self.latency_variance**0.5*1000:.1f}ms), "
+                         f"전방지연={forward_delay*1000:.1f}ms, "
                          f"실행지연={avg_execution_delay*1000:.1f}ms, "
-                         f"부하계수={system_load_factor:.2f}, "
+                         f"목표시점 오프셋={target_offset*1000:+.2f}ms(±{target_offset_uncertainty*1000:.2f}ms), "
                          f"대기시간={time_until_click:.3f}s")
         
         return optimal_click_time, time_until_click
@@ -298,11 +429,17 @@ class TimeSyncMacroGUI:
                         # NTP 응답 파싱
                         unpacked = struct.unpack('!12I', response)
                         t3 = unpacked[10] + float(unpacked[11]) / 2**32 - 2208988800  # NTP epoch to Unix epoch
+                        root_delay = unpacked[1] / 2**16        # 16.16 고정소수점 (초)
+                        root_dispersion = unpacked[2] / 2**16
                         
                         # 네트워크 지연 및 오프셋 계산
                         latency = (t4 - t1) / 2
                         offset = t3 - (t1 + latency)
                         
+                        # 정답 구간: 경로 비대칭 한계(단방향 지연) + 서버의 기준 시계까지 거리
+                        error = latency + root_delay / 2 + root_dispersion
+                        self.source_combiner.submit_offset(f"ntp:{server}", 'ntp', offset, error, measured_at=t4)
+                        
                         if latency < best_latency:
                             best_latency = latency
                             best_offset = offset
@@ -311,6 +448,7 @@ class TimeSyncMacroGUI:
                             'server': server,
                             'offset': offset,
                             'latency': latency,
+                            'error': error,
                             'attempt': attempt + 1
                         })
                         
@@ -338,6 +476,7 @@ class TimeSyncMacroGUI:
             
             self.ntp_server_time_offset = best_measurement['offset']
             self.ntp_network_latency = best_measurement['latency']
+            self.ntp_offset_error = best_measurement['error']
             
             self.log(f"🎯 NTP 동기화 완료: {best_measurement['server']}")
             self.log(f"   최종 오프셋: {self.ntp_server_time_offset*1000:+.1f}ms")
@@ -364,6 +503,9 @@ class TimeSyncMacroGUI:
         self.url_var = tk.StringVar(value="https://")
         self.url_entry = ttk.Entry(main_frame, textvariable=self.url_var, width=50)
         self.url_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=5)
+        # URL 입력이 끝나면 DNS를 미리 조회해 둠
+        self.url_entry.bind('<FocusOut>', self.prefetch_url_dns)
+        self.url_entry.bind('<Return>', self.prefetch_url_dns)
         
         # 목표 시간 입력
         ttk.Label(main_frame, text="구매 시간:").grid(row=2, column=0, sticky=tk.W, pady=5)
@@ -413,7 +555,7 @@ class TimeSyncMacroGUI:
         
         # 정확도 및 측정 횟수 표시
         self.accuracy_var = tk.StringVar(value="-")
-        ttk.Label(info_frame, text="정확도 (표준편차):").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(info_frame, text="도착 오차 (95%):").grid(row=3, column=0, sticky=tk.W)
         ttk.Label(info_frame, textvariable=self.accuracy_var).grid(row=3, column=1, sticky=tk.W)
         
         self.measurement_count_var = tk.StringVar(value="0")
@@ -437,14 +579,18 @@ class TimeSyncMacroGUI:
         ttk.Label(info_frame, text="오프셋 안정성:").grid(row=9, column=0, sticky=tk.W)
         ttk.Label(info_frame, textvariable=self.stability_var).grid(row=9, column=1, sticky=tk.W)
         
+        self.backend_stability_var = tk.StringVar(value="-")
+        ttk.Label(info_frame, text="백엔드별 안정성:").grid(row=10, column=0, sticky=tk.W)
+        ttk.Label(info_frame, textvariable=self.backend_stability_var).grid(row=10, column=1, sticky=tk.W)
+        
         # 적응형 지연 예측 정보 추가
         self.predicted_latency_var = tk.StringVar(value="-")
-        ttk.Label(info_frame, text="예측 지연시간:").grid(row=10, column=0, sticky=tk.W)
-        ttk.Label(info_frame, textvariable=self.predicted_latency_var).grid(row=10, column=1, sticky=tk.W)
+        ttk.Label(info_frame, text="예측 지연시간:").grid(row=11, column=0, sticky=tk.W)
+        ttk.Label(info_frame, textvariable=self.predicted_latency_var).grid(row=11, column=1, sticky=tk.W)
         
         # 현재 시간 표시 (개선된 세로 배치)
         time_frame = ttk.LabelFrame(info_frame, text="실시간 시간", padding="5")
-        time_frame.grid(row=11, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        time_frame.grid(row=12, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
         # 서버 시간
         self.server_time_var = tk.StringVar()
@@ -484,6 +630,16 @@ class TimeSyncMacroGUI:
                                          command=self.ntp_sync_time)
         self.ntp_sync_button.pack(side=tk.LEFT, padx=5)
         
+        # NTP/HTTP 비교로 경로 비대칭 보정 버튼
+        self.asymmetry_button = ttk.Button(button_frame, text="🔀 비대칭 보정",
+                                           command=self.calibrate_path_asymmetry)
+        self.asymmetry_button.pack(side=tk.LEFT, padx=5)
+        
+        # 초 경계 이분 탐색 동기화 버튼
+        self.sync_bisection_button = ttk.Button(button_frame, text="✂️ 초경계 이분탐색",
+                                               command=lambda: self.sync_time(10, method='bisection'))
+        self.sync_bisection_button.pack(side=tk.LEFT, padx=5)
+        
         self.start_button = ttk.Button(button_frame, text="구매 매크로 시작", 
                                       command=self.start_macro)
         self.start_button.pack(side=tk.LEFT, padx=5)
@@ -508,6 +664,38 @@ class TimeSyncMacroGUI:
         ttk.Button(button_frame2, text="🗑️ 좌표 초기화", 
                   command=self.clear_all_positions).pack(side=tk.LEFT, padx=5)
         
+        # 여러 엣지 주소 중 가장 빠르고 안정적인 주소로 측정 연결 고정
+        self.edge_selection_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(button_frame2, text="🛰️ 최적 엣지 고정",
+                        variable=self.edge_selection_var).pack(side=tk.LEFT, padx=5)
+        
+        # 초 경계 버스트 포착 (간격 0 = 구간 폭에 맞춰 자동)
+        self.burst_mode_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(button_frame2, text="⚡ 버스트 포착",
+                        variable=self.burst_mode_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(button_frame2, text="간격(ms):").pack(side=tk.LEFT)
+        self.burst_spacing_var = tk.StringVar(value="0")
+        ttk.Spinbox(button_frame2, from_=0, to=100, increment=1, width=4,
+                    textvariable=self.burst_spacing_var).pack(side=tk.LEFT)
+        
+        # 백그라운드 시계 추적 측정 간격
+        ttk.Label(button_frame2, text="추적 간격(초):").pack(side=tk.LEFT, padx=(5, 0))
+        self.tracker_interval_var = tk.StringVar(value="5")
+        tracker_spinbox = ttk.Spinbox(button_frame2, from_=1, to=60, increment=1, width=4,
+                                      textvariable=self.tracker_interval_var,
+                                      command=self.update_tracker_interval)
+        tracker_spinbox.pack(side=tk.LEFT)
+        tracker_spinbox.bind('<FocusOut>', self.update_tracker_interval)
+        
+        # 누적 통계 반감기 (오래된 측정일수록 비중 감소)
+        ttk.Label(button_frame2, text="통계 반감기(일):").pack(side=tk.LEFT, padx=(5, 0))
+        self.stats_half_life_var = tk.StringVar(value="7")
+        half_life_spinbox = ttk.Spinbox(button_frame2, from_=0.5, to=365, increment=0.5, width=5,
+                                        textvariable=self.stats_half_life_var,
+                                        command=self.update_stats_half_life)
+        half_life_spinbox.pack(side=tk.LEFT)
+        half_life_spinbox.bind('<FocusOut>', self.update_stats_half_life)
+        
         ttk.Button(button_frame2, text="로그 지우기", 
                   command=self.clear_log).pack(side=tk.RIGHT, padx=5)
         
@@ -559,14 +747,15 @@ class TimeSyncMacroGUI:
         current_local_time = datetime.now()
         local_time_str = current_local_time.strftime("%H:%M:%S.%f")[:-3]  # ms까지 표시
         
-        if hasattr(self, 'server_time_offset') and self.server_time_offset != 0:
+        offset, _, _, snapshot_age = self.current_clock()
+        if offset != 0:
             # 서버 시간 계산 (로컬 시간 + 오프셋)
-            current_server_timestamp = time.time() + self.server_time_offset
+            current_server_timestamp = time.time() + offset
             current_server_time = datetime.fromtimestamp(current_server_timestamp)
             server_time_str = current_server_time.strftime("%H:%M:%S.%f")[:-3]
             
             # 시간차 계산 (밀리초)
-            time_diff_ms = self.server_time_offset * 1000
+            time_diff_ms = offset * 1000
             
             # GUI 업데이트
             self.server_time_var.set(f"{server_time_str}")
@@ -595,6 +784,10 @@ class TimeSyncMacroGUI:
             
             # 동기화 상태 업데이트
             sync_status_text = f"✅ 동기화 완료 ({abs(time_diff_ms):.1f}ms 차이)"
+            if snapshot_age is not None:
+                sync_status_text = f"🛰️ 추적 중 ({abs(time_diff_ms):.1f}ms 차이, {snapshot_age:.1f}초 전 갱신)"
+            elif self.offset_withdrawn:
+                sync_status_text = "⚠️ 추적 구간 충돌 - 재동기화 필요"
             if hasattr(self, 'sync_status'):
                 self.sync_status.set(sync_status_text)
                 
@@ -780,32 +973,28 @@ class TimeSyncMacroGUI:
     def precise_second_change_sync(self, url, max_attempts=10):
         """초 변화 순간을 캐치하여 정밀한 시간 동기화 수행
         
-        전략: 0.05초 간격으로 요청을 보내서 서버 시간의 초가 바뀌는 정확한 순간을 포착
+        전략: 20ms 간격으로 미리 예약한 요청들을 동시에 진행시켜 서버 시간의 초가 바뀌는 정확한 순간을 포착
         이렇게 하면 밀리초 단위의 정확한 동기화가 가능함
         """
+        if self.burst_mode_var.get():
+            if self.burst_second_edge_sync(url):
+                return True
+            self.log("⚠️ 버스트 포착 실패, 순차 초 변화 캐치로 전환...")
+        
         self.log("🎯 초 변화 순간 캐치 동기화 시작...")
         self.log("💡 전략: 서버 시간 초 전환 순간을 포착해 밀리초 정확도 확보")
         
         successful_measurements = []
+        strategy = SecondChangeStrategy()
+        self.probe_engine.prepare(url)
         
         for attempt in range(max_attempts):
             try:
                 self.log(f"시도 {attempt + 1}/{max_attempts}: 초 변화 순간 탐지 중...")
                 
-                # 1단계: 현재 서버 시간 확인
-                current_server_second = None
-                for _ in range(20):  # 최대 1초 동안 시도
-                    try:
-                        with urlopen(url, timeout=3) as response:
-                            server_time_str = response.headers.get('Date')
-                            if server_time_str:
-                                server_time = self.parse_server_time(server_time_str)
-                                if server_time:
-                                    current_server_second = server_time.second
-                                    break
-                    except:
-                        continue
-                    time.sleep(0.05)
+                # 1단계: 현재 서버 초 확인 → 2단계: 예약 발사로 초 변화 순간 포착
+                current_server_second, measurement = self.probe_engine.run(
+                    strategy.run_attempt(self.probe_engine, url))
                 
                 if current_server_second is None:
                     self.log(f"  ❌ 초기 서버 시간 획득 실패")
@@ -813,81 +1002,20 @@ class TimeSyncMacroGUI:
                 
                 self.log(f"  📍 현재 서버 초: {current_server_second}초")
                 
-                # 2단계: 초 변화 순간 대기 및 포착
-                change_detected = False
-                measurements_this_attempt = []
-                start_monitoring = time.perf_counter()
-                
-                while time.perf_counter() - start_monitoring < 2.0:  # 최대 2초 대기
-                    try:
-                        # 정밀한 타이밍 측정
-                        local_before = time.perf_counter()
-                        local_before_real = time.time()
-                        
-                        with urlopen(url, timeout=2) as response:
-                            local_after = time.perf_counter()
-                            local_after_real = time.time()
-                            
-                            server_time_str = response.headers.get('Date')
-                            if server_time_str:
-                                server_time = self.parse_server_time(server_time_str)
-                                if server_time and server_time.second != current_server_second:
-                                    # 🎯 초 변화 순간 포착!
-                                    change_detected = True
-                                    
-                                    # 네트워크 지연 계산
-                                    latency = (local_after - local_before) / 2
-                                    
-                                    # 서버 시간은 정확히 초 단위 (밀리초=0)
-                                    # 즉, server_time.second:00.000 시점
-                                    server_exact_timestamp = server_time.replace(microsecond=0).timestamp()
-                                    
-                                    # 로컬에서 해당 시점의 추정 시간
-                                    local_at_server_time = local_before_real + latency
-                                    
-                                    # 오프셋 계산
-                                    offset = server_exact_timestamp - local_at_server_time
-                                    
-                                    measurement = {
-                                        'attempt': attempt + 1,
-                                        'server_second_change': server_time.second,
-                                        'previous_second': current_server_second,
-                                        'latency': latency,
-                                        'offset': offset,
-                                        'local_before': local_before_real,
-                                        'local_after': local_after_real,
-                                        'server_exact_time': server_exact_timestamp,
-                                        'local_at_server_time': local_at_server_time,
-                                        'response_time': (local_after - local_before) * 1000
-                                    }
-                                    
-                                    measurements_this_attempt.append(measurement)
-                                    
-                                    # 로깅
-                                    change_time = datetime.fromtimestamp(server_exact_timestamp)
-                                    local_time = datetime.fromtimestamp(local_at_server_time)
-                                    
-                                    self.log(f"  🎯 초 변화 포착! {current_server_second}→{server_time.second}초")
-                                    self.log(f"    서버 정확 시간: {change_time.strftime('%H:%M:%S.000')}")
-                                    self.log(f"    로컬 추정 시간: {local_time.strftime('%H:%M:%S.%f')[:-3]}")
-                                    self.log(f"    네트워크 지연: {latency*1000:.1f}ms")
-                                    self.log(f"    시간 오프셋: {offset*1000:+.1f}ms")
-                                    
-                                    break
+                if measurement:
+                    measurement['attempt'] = attempt + 1
+                    successful_measurements.append(measurement)
                     
-                    except Exception as e:
-                        # 조용히 계속 시도
-                        pass
-                    
-                    # 0.05초 간격으로 재시도
-                    time.sleep(0.05)
-                
-                if change_detected and measurements_this_attempt:
-                    # 이번 시도에서 여러 측정값이 있다면 가장 낮은 지연시간 선택
-                    best_measurement = min(measurements_this_attempt, key=lambda x: x['latency'])
-                    successful_measurements.append(best_measurement)
+                    # 로깅
+                    change_time = datetime.fromtimestamp(measurement['server_exact_time'])
+                    local_time = datetime.fromtimestamp(measurement['local_at_server_time'])
                     
-                    self.log(f"  ✅ 시도 {attempt + 1} 성공! (지연: {best_measurement['latency']*1000:.1f}ms)")
+                    self.log(f"  🎯 초 변화 포착! {current_server_second}→{measurement['server_second_change']}초")
+                    self.log(f"    서버 정확 시간: {change_time.strftime('%H:%M:%S.000')}")
+                    self.log(f"    로컬 추정 시간: {local_time.strftime('%H:%M:%S.%f')[:-3]}")
+                    self.log(f"    네트워크 지연: {measurement['latency']*1000:.1f}ms")
+                    self.log(f"    시간 오프셋: {measurement['offset']*1000:+.1f}ms")
+                    self.log(f"  ✅ 시도 {attempt + 1} 성공! (지연: {measurement['latency']*1000:.1f}ms)")
                     
                     # 연속 3회 성공하면 충분
                     if len(successful_measurements) >= 3:
@@ -896,9 +1024,6 @@ class TimeSyncMacroGUI:
                 else:
                     self.log(f"  ❌ 시도 {attempt + 1} 실패: 초 변화 감지 안됨")
                 
-                # 다음 시도 전 잠시 대기
-                time.sleep(0.1)
-                
             except Exception as e:
                 self.log(f"  ❌ 시도 {attempt + 1} 오류: {e}")
                 continue
@@ -909,9 +1034,7 @@ class TimeSyncMacroGUI:
             offsets = [m['offset'] for m in successful_measurements]
             
             # 이상값 제거 (지연시간 기준)
-            median_latency = statistics.median(latencies)
-            clean_measurements = [m for m in successful_measurements 
-                                if m['latency'] <= median_latency * 1.5]
+            clean_measurements = [m for m, keep in zip(successful_measurements, latency_mask(latencies)) if keep]
             
             if clean_measurements:
                 clean_latencies = [m['latency'] for m in clean_measurements]
@@ -935,13 +1058,24 @@ class TimeSyncMacroGUI:
                     })
                 self.update_cumulative_sync_data(session_measurements)
                 
+                # 정답 구간: 새 초는 직전 발사 간격 안에서 시작됐고, 도착 시각은 RTT 안 어딘가
+                session_offset = statistics.median(clean_offsets)
+                session_latency = statistics.median(clean_latencies)
+                self.source_combiner.submit(
+                    'http:second_change', 'second_change',
+                    session_offset - session_latency,
+                    session_offset + strategy.interval + session_latency,
+                    authoritative=True, host=urlparse(url).netloc)
+                
                 # 결과 로깅
                 self.log("=" * 60)
                 self.log("🎯 초 변화 순간 캐치 동기화 완료!")
                 self.log(f"📊 성공 측정: {len(clean_measurements)}/{max_attempts}회")
                 self.log(f"🌐 서버 시간차: {self.server_time_offset*1000:+.1f}ms (±{offset_std*1000:.1f}ms)")
                 self.log(f"⚡ 네트워크 지연: {self.network_latency*1000:.1f}ms (±{latency_std*1000:.1f}ms)")
-                self.log(f"🔬 예상 정확도: ±{(offset_std + latency_std)*1000:.1f}ms")
+                self.fit_sync_bootstrap(clean_offsets, clean_latencies,
+                                        self.server_time_offset, self.network_latency)
+                self.log_sync_bootstrap()
                 self.log(f"💡 방법: 서버 초 전환 순간 포착으로 밀리초 정확도 확보")
                 self.log("=" * 60)
                 
@@ -964,6 +1098,137 @@ class TimeSyncMacroGUI:
         self.log("❌ 초 변화 순간 캐치 동기화 실패!")
         return False
     
+    def burst_second_edge_sync(self, url):
+        """버스트 초 경계 포착 동기화
+        
+        전략: 미리 확보한 연결들로 측정 여러 개를 간격을 두고 한꺼번에 발사해, 서버 도착 시각이
+        예상 초 경계 앞뒤에 고르게 걸치게 함. 어느 측정부터 새 초를 봤는지로 구간을 한 번에 축소
+        누적된 Date 구간 제약이 있으면 그 구간에서 바로 시작 (첫 확인 측정 생략)
+        """
+        try:
+            spacing_ms = float(self.burst_spacing_var.get())
+        except (ValueError, tk.TclError):
+            spacing_ms = 0
+        strategy = BurstEdgeStrategy(fan=self.probe_engine.max_in_flight,
+                                     spacing=spacing_ms / 1000 if spacing_ms > 0 else None)
+        spacing_text = f"{spacing_ms:g}ms 간격" if spacing_ms > 0 else "자동 간격"
+        self.log(f"⚡ 버스트 초 경계 포착 시작... ({strategy.fan}개 동시, {spacing_text})")
+        
+        prior = None
+        with self.date_constraints_lock:
+            solver = self.date_constraints.get(urlparse(url).netloc)
+            bounds = solver.bounds(time.time()) if solver else None
+        if bounds is not None and bounds[1] - bounds[0] < 1.0:
+            prior = bounds
+            self.log(f"  📐 누적 Date 구간에서 시작: 폭 {(bounds[1] - bounds[0])*1000:.1f}ms")
+        
+        def on_burst(index, lo, hi, answered):
+            self.log(f"  버스트 {index}: 구간 [{lo*1000:+.1f}, {hi*1000:+.1f})ms, "
+                     f"폭 {(hi - lo)*1000:.1f}ms (응답 {answered}/{strategy.fan})")
+        
+        start = time.perf_counter()
+        try:
+            self.probe_engine.prepare(url, strategy.fan)
+            result = self.probe_engine.run(
+                strategy.run(self.probe_engine, url, prior=prior,
+                             one_way=self.network_latency or None, on_burst=on_burst))
+        except Exception as e:
+            self.log(f"  ❌ 버스트 오류: {e}")
+            result = None
+        
+        if not result:
+            return False
+        
+        self.server_time_offset = result['offset']
+        self.network_latency = result['latency']
+        # 구간 충돌이 있었으면 구간 폭보다 넓게 보고됨
+        self.offset_uncertainty = result['uncertainty']
+        
+        self.update_cumulative_sync_data([{
+            'offset': result['offset'],
+            'latency': result['latency'],
+            'uncertainty': result['uncertainty'],
+            'method': 'second_edge_burst'
+        }])
+        # 구간은 도착 시각을 RTT 중앙으로 가정해 계산했으므로 단방향 지연만큼 넓혀 제출
+        self.source_combiner.submit('http:burst', 'burst',
+                                    result['lo'] - result['latency'], result['hi'] + result['latency'],
+                                    authoritative=True, host=urlparse(url).netloc)
+        
+        self.log("=" * 60)
+        self.log("⚡ 버스트 초 경계 포착 완료!")
+        self.log(f"📊 버스트 {result['bursts']}회, 요청 {result['probes']}회 "
+                f"(구간 충돌 {result['conflicts']}회), 소요 {time.perf_counter() - start:.2f}초")
+        self.log(f"🌐 서버 시간차: {result['offset']*1000:+.1f}ms (±{self.offset_uncertainty*1000:.1f}ms)")
+        self.log(f"⚡ 네트워크 지연: {result['latency']*1000:.1f}ms")
+        self.log("=" * 60)
+        
+        self.logger.info(f"버스트 초 경계 포착 완료: 오프셋 구간 [{result['lo']*1000:+.3f}, "
+                         f"{result['hi']*1000:+.3f})ms, 버스트 {result['bursts']}회, 요청 {result['probes']}회")
+        return True
+    
+    def bisection_second_edge_sync(self, url, max_probes=10):
+        """서버 초 경계 이분 탐색 동기화
+        
+        전략: 다음 요청의 서버 도착 시각이 현재 오프셋 구간 중앙에 해당하는 초 경계와 겹치도록 예약
+        응답의 초가 바뀌었는지로 구간을 절반씩 좁혀 8~10회 요청으로 수 ms 구간 확보
+        최종 구간 폭은 offset_uncertainty로 저장되어 발사 타이밍 계산에 사용됨
+        """
+        self.log("✂️ 초 경계 이분 탐색 동기화 시작...")
+        self.log("💡 전략: 요청 도착 시각을 오프셋 구간 중앙의 초 경계에 맞춰 구간을 절반씩 축소")
+        
+        def on_probe(index, lo, hi, rtt):
+            self.log(f"  탐색 {index}/{max_probes}: 구간 [{lo*1000:+.1f}, {hi*1000:+.1f})ms, "
+                     f"폭 {(hi - lo)*1000:.1f}ms (RTT {rtt*1000:.1f}ms)")
+        
+        try:
+            result = self.probe_engine.run(
+                BisectionStrategy(max_probes=max_probes).run(
+                    self.probe_engine, url, on_probe=on_probe))
+        except Exception as e:
+            self.log(f"  ❌ 이분 탐색 오류: {e}")
+            result = None
+        
+        if not result:
+            self.log("❌ 초 경계 이분 탐색 동기화 실패!")
+            return False
+        
+        self.server_time_offset = result['offset']
+        self.network_latency = result['latency']
+        # 구간 충돌이 있었으면 구간 폭보다 넓게 보고됨
+        self.offset_uncertainty = result['uncertainty']
+        
+        self.update_cumulative_sync_data([{
+            'offset': result['offset'],
+            'latency': result['latency'],
+            'uncertainty': result['uncertainty'],
+            'method': 'second_edge_bisection'
+        }])
+        # 구간은 도착 시각을 RTT 중앙으로 가정해 계산했으므로 단방향 지연만큼 넓혀 제출
+        self.source_combiner.submit('http:bisection', 'bisection',
+                                    result['lo'] - result['latency'], result['hi'] + result['latency'],
+                                    authoritative=True, host=urlparse(url).netloc)
+        
+        # 결과 로깅
+        self.log("=" * 60)
+        self.log("✂️ 초 경계 이분 탐색 동기화 완료!")
+        self.log(f"📊 요청 횟수: {result['probes']}회 (구간 충돌 {result['conflicts']}회)")
+        self.log(f"🌐 서버 시간차: {result['offset']*1000:+.1f}ms")
+        self.log(f"📏 최종 구간 폭: {result['width']*1000:.1f}ms (±{self.offset_uncertainty*1000:.1f}ms)")
+        self.log(f"⚡ 네트워크 지연: {result['latency']*1000:.1f}ms")
+        self.log("=" * 60)
+        
+        self.logger.info("="*60)
+        self.logger.info("초 경계 이분 탐색 동기화 완료")
+        self.logger.info(f"오프셋 구간: [{result['lo']*1000:+.3f}, {result['hi']*1000:+.3f})ms, "
+                         f"폭 {result['width']*1000:.3f}ms")
+        for i, step in enumerate(result['history']):
+            self.logger.debug(f"탐색 {i+1}: [{step['lo']*1000:+.3f}, {step['hi']*1000:+.3f})ms, "
+                              f"RTT {step['rtt']*1000:.3f}ms")
+        self.logger.info("="*60)
+        
+        return True
+    
     def update_cumulative_sync_data(self, session_measurements):
         """누적 동기화 데이터 업데이트"""
         if not session_measurements:
@@ -973,18 +1238,34 @@ class TimeSyncMacroGUI:
         self.session_count += 1
         
         # 이번 세션의 측정값들을 누적 데이터에 추가
+        new_records = []
         for measurement in session_measurements:
             measurement_data = {
                 'session': self.session_count,
+                'host': self.active_host or '',
                 'timestamp': time.time(),
                 'offset': measurement.get('offset', 0),
                 'latency': measurement.get('latency', 0),
                 'method': measurement.get('method', 'unknown')
             }
+            if 'resolution' in measurement:
+                measurement_data['extractor'] = measurement['extractor']
+                measurement_data['resolution'] = measurement['resolution']
+            if 'uncertainty' in measurement:
+                measurement_data['uncertainty'] = measurement['uncertainty']
+            if measurement.get('backend'):
+                measurement_data['backend'] = measurement['backend']
             self.cumulative_measurements.append(measurement_data)
+            self.feed_clock_filter(measurement_data)
+            self.host_stats.add(measurement_data['host'], measurement_data['offset'],
+                                measurement_data['latency'], measurement_data['timestamp'])
+            self.latency_model.add(measurement_data['host'], measurement_data['latency'],
+                                   measurement_data['timestamp'])
+            new_records.append(measurement_data)
+        self.refresh_filter_estimates()
         
-        # 누적 통계 계산
-        self.calculate_cumulative_statistics()
+        # 누적 통계 갱신 (이번 세션 측정만 반영)
+        self.update_incremental_statistics(new_records)
         
         # GUI 업데이트
         self.update_cumulative_display()
@@ -996,54 +1277,136 @@ class TimeSyncMacroGUI:
         self.log(f"📊 누적 데이터 업데이트: {self.session_count}번째 세션, 총 {len(self.cumulative_measurements)}개 측정값")
     
     def calculate_cumulative_statistics(self):
-        """누적 통계 계산"""
+        """누적 통계 전체 재계산 (이전 형식 데이터 로드, 반감기 변경 시)
+
+        호스트별로 IQR 이상값을 제거한 뒤 시간 순서대로 감쇠 통계에 다시 누적
+        """
         if not self.cumulative_measurements:
             return
         
-        # 모든 오프셋과 지연시간 추출
-        all_offsets = [m['offset'] for m in self.cumulative_measurements]
-        all_latencies = [m['latency'] for m in self.cumulative_measurements]
-        
-        # 이상값 제거 (IQR 방법 사용)
-        def remove_outliers_iqr(data):
-            if len(data) < 4:
-                return data
-            
-            q1 = statistics.quantiles(data, n=4)[0]  # 25th percentile
-            q3 = statistics.quantiles(data, n=4)[2]  # 75th percentile
-            iqr = q3 - q1
-            
-            lower_bound = q1 - 1.5 * iqr
-            upper_bound = q3 + 1.5 * iqr
-            
-            return [x for x in data if lower_bound <= x <= upper_bound]
-        
-        # 이상값 제거된 데이터
-        clean_offsets = remove_outliers_iqr(all_offsets)
-        clean_latencies = remove_outliers_iqr(all_latencies)
-        
-        if clean_offsets:
-            # 누적 평균 계산 (중앙값 사용 - 더 안정적)
-            self.cumulative_server_offset = statistics.median(clean_offsets)
-            self.cumulative_network_latency = statistics.median(clean_latencies)
-            
-            # 안정성 계산 (표준편차)
-            if len(clean_offsets) > 1:
-                self.offset_stability = statistics.stdev(clean_offsets)
-            else:
-                self.offset_stability = 0
+        # 이상값 제거 (IQR 방법 사용, 기록이 길면 NumPy 벡터 연산)
+        columns = MeasurementColumns.from_records(self.cumulative_measurements)
+        by_host = columns.groups('host')
+        
+        self.host_stats.clear()
+        clean_count = 0
+        for host, indices in by_host.items():
+            # 이상값 제거된 데이터
+            offset_ok, latency_ok = columns.clean_mask(indices)
+            order = sorted(range(len(indices)), key=lambda k: self.cumulative_measurements[indices[k]]['timestamp'])
+            for k in order:
+                if not offset_ok[k]:
+                    continue
+                m = self.cumulative_measurements[indices[k]]
+                latency = m['latency'] if latency_ok[k] else 0
+                clean_count += self.host_stats.add(host, m['offset'], latency, m['timestamp'])
+        
+        self.logger.info(f"누적 통계 재계산: 세션 {self.session_count}, "
+                       f"총 측정값 {len(self.cumulative_measurements)}개, "
+                       f"정제된 측정값 {clean_count}개, 호스트 {len(by_host)}개 "
+                       f"(반감기 {self.host_stats.half_life/86400:g}일)")
+        
+        # 오프셋은 상수가 아니라 로컬 시계 드리프트만큼 변하므로 기울기도 추정
+        # 칼만 필터도 같은 반감기로 감쇠한 측정으로 다시 구성
+        self.rebuild_clock_filter()
+        self.apply_cumulative_estimates(self.drift_estimator.fit())
+    
+    def update_incremental_statistics(self, records):
+        """새 측정만 반영해 누적 통계 갱신 (세션 추가 비용이 전체 기록 크기와 무관)
+
+        칼만 필터와 호스트 감쇠 통계는 측정마다 이미 갱신됐고, 드리프트 표본도 새 측정만 추가
+        """
+        for m in records:
+            if self.is_precise_measurement(m):
+                self.drift_estimator.add(m['timestamp'], m['offset'])
+        self.apply_cumulative_estimates(self.drift_estimator.fit())
+    
+    def apply_cumulative_estimates(self, drift=None):
+        """대상 호스트(active_host)의 칼만 필터 상태와 감쇠 통계를 현재 추정값/안정성에 반영
+
+        다른 호스트의 측정은 쓰지 않음 (대상 호스트 기록이 없으면 현재 값을 유지)
+        """
+        # 누적 추정값은 대상 호스트 칼만 필터 사후 평균 (측정마다 이미 반영됨, 드리프트 포함)
+        # 정밀 측정이 없는 호스트(Date 헤더만)는 오프셋이 초기화되지 않으므로 지연만 반영
+        state = self.clock_filter.state()
+        if state.updates and self.clock_filter.initialized:
+            self.cumulative_server_offset = state.offset
+            self.cumulative_network_latency = state.latency
             
-            # 현재 사용 중인 값들을 누적 평균으로 업데이트
+            # 현재 사용 중인 값들을 누적 추정값으로 업데이트
             self.server_time_offset = self.cumulative_server_offset
             self.network_latency = self.cumulative_network_latency
+            self.offset_estimated_at = state.updated_at
             
-            # 상세 로그
-            self.logger.info(f"누적 통계 업데이트: 세션 {self.session_count}, "
-                           f"총 측정값 {len(self.cumulative_measurements)}개, "
-                           f"정제된 측정값 {len(clean_offsets)}개")
-            self.logger.info(f"누적 평균 오프셋: {self.cumulative_server_offset*1000:+.3f}ms")
-            self.logger.info(f"누적 평균 지연: {self.cumulative_network_latency*1000:.3f}ms")
+            self.logger.info(f"누적 평균 오프셋: {self.cumulative_server_offset*1000:+.3f}ms "
+                           f"(±{state.offset_var**0.5*1000:.3f}ms)")
+            self.logger.info(f"누적 평균 지연: {self.cumulative_network_latency*1000:.3f}ms "
+                           f"(±{state.latency_var**0.5*1000:.3f}ms)")
+        elif state.latency > 0:
+            self.cumulative_network_latency = state.latency
+            self.network_latency = self.cumulative_network_latency
+        
+        # 안정성: 대상 호스트 측정의 시간 감쇠 표준편차 (오래된 측정은 비중이 작음)
+        host = self.active_host or ''
+        stats = self.host_stats.stats(host)
+        if stats is not None:
+            offset_stats = stats['offset']
+            self.offset_stability = offset_stats.stdev
+            self.logger.info(f"호스트 {host or '(미상)'} 감쇠 통계: 오프셋 {offset_stats.mean*1000:+.3f}ms "
+                           f"±{offset_stats.stdev*1000:.3f}ms, 지연 {stats['latency'].mean*1000:.3f}ms, "
+                           f"유효 표본 {offset_stats.effective_samples:.1f}/{offset_stats.count}개")
+            quartiles = self.host_stats.quartiles(host)
+            if quartiles is not None and quartiles['offset'].count:
+                for name, label, spec in (('offset', '오프셋', '+.3f'), ('latency', '지연', '.3f')):
+                    q = quartiles[name]
+                    if q.count:
+                        self.logger.info(f"호스트 {host or '(미상)'} {label} 중앙값 {q.median.value*1000:{spec}}ms, "
+                                       f"IQR {q.q1.value*1000:{spec}}~{q.q3.value*1000:{spec}}ms")
             self.logger.info(f"오프셋 안정성: ±{self.offset_stability*1000:.3f}ms")
+        
+        if drift is not None:
+            self.logger.info(f"드리프트 추정: {drift.slope*1e6:+.2f}ppm (±{drift.slope_sigma*1e6:.2f}ppm, "
+                           f"표본 {drift.samples}개, {drift.span/60:.1f}분)")
+        
+        # 백엔드별 시계가 다르면 섞인 표준편차 대신 클러스터 내부 표준편차(합동)를 안정성으로 사용
+        self.update_backend_clusters(drift)
+        clusters = [c for c in self.backend_clusters if c.samples > 1]
+        if len(self.backend_clusters) > 1 and clusters:
+            pooled = sum((c.samples - 1) * c.stability ** 2 for c in clusters) / sum(c.samples - 1 for c in clusters)
+            self.offset_stability = pooled ** 0.5
+            for c in self.backend_clusters:
+                self.logger.info(f"백엔드 클러스터 {c.label}: {c.offset*1000:+.3f}ms "
+                               f"±{c.stability*1000:.3f}ms ({c.samples}개, 주소 {c.addresses})")
+    
+    def update_backend_clusters(self, drift=None, window=500):
+        """대상 호스트의 최근 정밀 측정을 백엔드별 시계 클러스터로 분류
+
+        세션을 넘는 측정이므로 드리프트만큼 현재 시각 기준으로 옮긴 뒤 비교
+        """
+        now = time.time()
+        slope = drift.slope if drift is not None else 0.0
+        host = self.active_host or ''
+        samples = []
+        for m in self.cumulative_measurements[-window:]:
+            if m.get('host', '') != host:
+                continue
+            if m.get('resolution', 1.0) >= 0.5 and m.get('method') not in self.PRECISE_METHODS:
+                continue
+            samples.append({
+                'offset': m['offset'] + slope * (now - m['timestamp']),
+                'hints': dict(m.get('backend', {})),
+                'uncertainty': m.get('uncertainty', m.get('resolution', 0.0) / 2),
+            })
+        self.backend_clusters = self.backend_clusterer.cluster(samples)
+        self.backend_blend_offset = statistics.median(s['offset'] for s in samples) if samples else 0
+    
+    def select_backend_cluster(self, url):
+        """발사 연결이 향하는 백엔드 클러스터 (백엔드가 하나뿐이면 None)"""
+        if len(self.backend_clusters) < 2:
+            return None
+        return BackendClusterer.select(self.backend_clusters,
+                                       self.probe_transport.idle_connection_ids(url),
+                                       self.probe_transport.pinned_address(url))
     
     def update_cumulative_display(self):
         """누적 동기화 정보 GUI 업데이트"""
@@ -1069,6 +1432,16 @@ class TimeSyncMacroGUI:
             self.stability_var.set(f"±{self.offset_stability*1000:.1f}ms {stability_status}")
         else:
             self.stability_var.set("-")
+        
+        # 백엔드별 안정성 (측정이 많은 순서로 최대 3개)
+        if len(self.backend_clusters) > 1:
+            self.backend_stability_var.set(" / ".join(
+                f"{c.label} {c.offset*1000:+.1f}ms ±{c.stability*1000:.1f}ms ({c.samples})"
+                for c in self.backend_clusters[:3]))
+        elif self.backend_clusters:
+            self.backend_stability_var.set("단일 백엔드")
+        else:
+            self.backend_stability_var.set("-")
     
     def get_reliability_score(self):
         """신뢰도 점수 계산 (0-100)"""
@@ -1110,6 +1483,11 @@ class TimeSyncMacroGUI:
                 'cumulative_server_offset': self.cumulative_server_offset,
                 'cumulative_network_latency': self.cumulative_network_latency,
                 'offset_stability': self.offset_stability,
+                'edge_stats': self.edge_stats,
+                'date_constraints': self.date_constraints_to_dict(),
+                'path_asymmetry': self.path_asymmetry.to_dict(),
+                'host_stats': self.host_stats.to_dict(),
+                'latency_profile': self.latency_model.to_dict(),
                 'last_updated': datetime.now().isoformat()
             }
             
@@ -1137,6 +1515,24 @@ class TimeSyncMacroGUI:
                 self.cumulative_server_offset = cumulative_data.get('cumulative_server_offset', 0)
                 self.cumulative_network_latency = cumulative_data.get('cumulative_network_latency', 0)
                 self.offset_stability = cumulative_data.get('offset_stability', 0)
+                self.edge_stats = cumulative_data.get('edge_stats', {})
+                date_constraints = {host: DateConstraintSolver.from_dict(data)
+                                    for host, data in cumulative_data.get('date_constraints', {}).items()}
+                with self.date_constraints_lock:
+                    self.date_constraints = date_constraints
+                self.path_asymmetry = PathAsymmetryCalibrator.from_dict(cumulative_data.get('path_asymmetry', {}))
+                if 'host_stats' in cumulative_data:
+                    self.host_stats = HostStatistics.from_dict(cumulative_data['host_stats'])
+                    self.stats_half_life_var.set(f"{self.host_stats.half_life/86400:g}")
+                    # 칼만 필터는 감쇠 통계와 같은 반감기로 재구성
+                    self.rebuild_clock_filter()
+                else:
+                    # 호스트별 감쇠 통계가 없던 이전 형식: 한 번 전체 재계산
+                    self.calculate_cumulative_statistics()
+                if 'latency_profile' in cumulative_data:
+                    self.latency_model = TimeOfDayLatencyModel.from_dict(cumulative_data['latency_profile'])
+                else:
+                    self.latency_model.rebuild(self.cumulative_measurements)
                 
                 # 로드된 데이터로 현재 동기화 값 설정
                 if self.cumulative_server_offset != 0:
@@ -1157,64 +1553,77 @@ class TimeSyncMacroGUI:
             self.logger.info(f"누적 데이터 로드 실패 또는 없음: {e}")
     
     def parse_server_time(self, server_time_str):
-        """서버 시간 문자열을 파싱"""
-        try:
-            time_formats = [
-                '%a, %d %b %Y %H:%M:%S GMT',
-                '%a, %d %b %Y %H:%M:%S %Z',
-                '%d %b %Y %H:%M:%S GMT',
-            ]
-            
-            for fmt in time_formats:
-                try:
-                    server_time = datetime.strptime(server_time_str, fmt)
-                    return server_time.replace(tzinfo=timezone.utc)
-                except ValueError:
-                    continue
+        """서버 시간 문자열을 파싱 (공용 고속 파서 사용, UTC datetime 반환)"""
+        if not server_time_str:
             return None
-        except:
+        server_timestamp = parse_http_date(server_time_str)
+        if server_timestamp is None:
             return None
+        return datetime.fromtimestamp(server_timestamp, timezone.utc)
 
     def continuous_sync_monitoring(self, url, duration=30):
-        """연속적인 시간 동기화 모니터링"""
-        self.log(f"{duration}초 동안 연속 모니터링을 시작합니다...")
+        """연속적인 시간 동기화 모니터링
         
-        start_time = time.perf_counter()
-        measurements = []
+        지연/오프셋 흐름에 CUSUM 변화점 탐지를 걸어, 경로가 바뀌면(VPN 재연결, Wi-Fi 로밍 등)
+        변화 이전 측정을 버리고 빠른 재동기화 버스트를 실행한 뒤 남은 시간 동안 모니터링을 이어감
+        """
+        self.log(f"{duration}초 동안 연속 모니터링을 시작합니다...")
         
-        while time.perf_counter() - start_time < duration and self.is_running:
-            try:
-                local_before = time.perf_counter()
-                
-                with urlopen(url, timeout=5) as response:
-                    local_after = time.perf_counter()
-                    latency = (local_after - local_before) / 2
-                    
-                    server_time_str = response.headers.get('Date')
-                    if server_time_str:
-                        server_time = datetime.strptime(
-                            server_time_str, '%a, %d %b %Y %H:%M:%S %Z'
-                        ).replace(tzinfo=timezone.utc)
-                        
-                        server_timestamp = server_time.timestamp()
-                        local_timestamp = local_before + latency
-                        offset = server_timestamp - local_timestamp
-                        
-                        measurements.append({
-                            'latency': latency,
-                            'offset': offset,
-                            'timestamp': local_before
-                        })
-                        
-                        if len(measurements) % 5 == 0:  # 5회마다 로그
-                            self.log(f"연속 측정 {len(measurements)}회: 지연 {latency*1000:.1f}ms")
-                
-                self.precise_sleep(1.0)  # 1초 간격
-                
-            except Exception as e:
-                self.log(f"연속 측정 오류: {e}")
-                self.precise_sleep(1.0)
+        received = []
+        detectors = {'지연': CusumDetector(), '오프셋': CusumDetector()}
+        fed = {name: [] for name in detectors}  # 탐지기 순번 -> 측정 순번
+        changes = []  # (탐지기 이름, Changepoint)
+        
+        def on_measurement(measurement):
+            measurement['sequence'] = len(fed['지연'])
+            received.append(measurement)
+            values = [('지연', measurement['latency'])]
+            if measurement['resolution'] < 0.5:  # Date 헤더 오프셋은 1초 톱니 잡음이라 제외
+                values.append(('오프셋', measurement['offset']))
+            for name, value in values:
+                fed[name].append(measurement['sequence'])
+                change = detectors[name].update(value)
+                if change is not None:
+                    changes.append((name, change))
+            if len(received) % 5 == 0:  # 5회마다 로그
+                self.log(f"연속 측정 {len(received)}회: 지연 {measurement['latency']*1000:.1f}ms")
+        
+        deadline = time.perf_counter() + duration
+        resyncs = 0
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining < 1.0:
+                break
+            self.probe_engine.run(
+                MonitoringStrategy(remaining, interval=1.0).run(  # 1초 간격
+                    self.probe_engine, url,
+                    on_measurement=on_measurement,
+                    on_error=lambda e: self.log(f"연속 측정 오류: {e}"),
+                    should_continue=lambda: self.is_running and not changes))
+            if not changes or not self.is_running:
+                break
+            
+            # 구간 변화: 변화 시작 이전 측정 폐기 (두 탐지기 중 더 늦은 시작점 기준)
+            keep_from = 0
+            for name, change in changes:
+                self.log(f"🔀 {name} 구간 변화 감지: {change.before*1000:.1f}ms → {change.after*1000:.1f}ms "
+                         f"(변화 후 {change.index - change.change_index + 1}회 측정에서 탐지)")
+                keep_from = max(keep_from, fed[name][change.change_index])
+            self.logger.info(f"구간 변화: {[(name, change._asdict()) for name, change in changes]}")
+            received[:] = [m for m in received if m['sequence'] >= keep_from]
+            changes.clear()
+            
+            # 새 경로의 RTT 하한으로 다시 시작하고 빠른 재동기화
+            self.rtt_envelopes.pop(urlparse(url).netloc, None)
+            resyncs += 1
+            self.log(f"⚡ 빠른 재동기화 ({resyncs}회째)...")
+            if received and received[-1]['resolution'] < 0.5:
+                self.measure_server_time_offset(url, 5)
+            else:
+                self.burst_second_edge_sync(url)
         
+        # 통계는 마지막 구간의 측정만 사용
+        measurements = received
         if measurements:
             # 통계 계산
             latencies = [m['latency'] for m in measurements]
@@ -1226,7 +1635,8 @@ class TimeSyncMacroGUI:
             latency_std = statistics.stdev(latencies) if len(latencies) > 1 else 0
             offset_std = statistics.stdev(offsets) if len(offsets) > 1 else 0
             
-            self.log(f"연속 측정 완료: {len(measurements)}회")
+            resync_note = f" (구간 변화로 재동기화 {resyncs}회, 마지막 구간만 사용)" if resyncs else ""
+            self.log(f"연속 측정 완료: {len(measurements)}회{resync_note}")
             self.log(f"평균 지연: {self.network_latency*1000:.1f}ms (±{latency_std*1000:.1f}ms)")
             self.log(f"시간차: {self.server_time_offset*1000:.1f}ms (±{offset_std*1000:.1f}ms)")
             
@@ -1331,8 +1741,385 @@ class TimeSyncMacroGUI:
                         f"  - YYYY-MM-DD HH:MM:SS.mmm (예: 2025-08-22 15:30:45.123)\n"
                         f"입력값: '{target_time}'")
     
-    def sync_time(self, num_samples=5):
-        """시간 동기화 실행"""
+    def update_tracker_interval(self, event=None):
+        """시계 추적 측정 간격 변경"""
+        try:
+            interval = float(self.tracker_interval_var.get())
+        except ValueError:
+            return
+        self.clock_tracker.interval = max(1.0, interval)
+    
+    def update_stats_half_life(self, event=None):
+        """누적 통계 반감기 변경 (기존 감쇠 상태는 반감기가 달라 재사용할 수 없으므로 한 번 재계산)"""
+        try:
+            half_life = float(self.stats_half_life_var.get()) * 86400
+        except ValueError:
+            return
+        if half_life <= 0 or abs(half_life - self.host_stats.half_life) < 1:
+            return
+        self.host_stats.clear(half_life)
+        self.calculate_cumulative_statistics()
+        self.update_cumulative_display()
+        self.save_cumulative_data()
+        self.log(f"📉 누적 통계 반감기 {half_life/86400:g}일로 재계산")
+    
+    def apply_clock_snapshot(self, snapshot):
+        """시계 추적기 스냅샷을 현재 추정값에 반영 (추적 스레드에서 호출, None은 스냅샷 철회)"""
+        if snapshot is None:
+            # Date 구간 충돌: 철회된 추적 구간을 결합에서 빼고, 다시 좁혀질 때까지 미동기화로 표시
+            self.source_combiner.remove('http:tracker', self.tracker_host())
+            self.offset_withdrawn = True
+            self.log(f"⚠️ 시계 추적 구간 충돌 ({self.clock_tracker.conflicts}회): 추정값 철회, 재동기화 필요")
+            return
+        self.offset_withdrawn = False
+        self.offset_estimated_at = snapshot.updated_at
+        if snapshot.extractor == 'seed':
+            return
+        self.server_time_offset = snapshot.offset
+        self.network_latency = snapshot.latency
+        self.offset_uncertainty = snapshot.uncertainty
+        self.live_offset_samples.append((snapshot.updated_at, snapshot.offset))
+        self.drift_estimator.add(snapshot.updated_at, snapshot.offset)
+        # 추적기 오프셋은 구간 반폭(uncertainty) 안에서 균등하다고 보고 필터에 반영
+        self.clock_filter.update_offset(snapshot.offset, max(snapshot.uncertainty ** 2 / 3, 1e-8),
+                                        snapshot.updated_at)
+        self.source_combiner.submit_offset('http:tracker', snapshot.extractor, snapshot.offset,
+                                           snapshot.uncertainty, authoritative=True,
+                                           measured_at=snapshot.updated_at, host=self.tracker_host())
+        self.update_adaptive_latency_prediction(snapshot.latency, snapshot.updated_at)
+        if snapshot.samples == 1:
+            self.log(f"🛰️ 시계 추적 시작: {self.clock_tracker.interval:g}초마다 측정 ({snapshot.extractor})")
+        self.logger.debug(f"시계 추적 갱신 #{snapshot.samples}: 오프셋 {snapshot.offset*1000:+.2f}ms "
+                          f"±{snapshot.uncertainty*1000:.2f}ms, 지연 {snapshot.latency*1000:.2f}ms")
+    
+    def apply_clock_change(self, stream, change):
+        """추적기 구간 변화 알림 (추적 스레드에서 호출): 이전 경로의 RTT 하한을 버림
+
+        추적기는 스스로 이전 측정을 버리고 짧은 간격으로 재측정해 새 스냅샷을 내보냄
+        """
+        name = '지연' if stream == 'latency' else '오프셋'
+        host = self.tracker_host()
+        if host:
+            self.rtt_envelopes.pop(host, None)
+        self.log(f"🔀 {name} 구간 변화 감지: {change.before*1000:.1f}ms → {change.after*1000:.1f}ms "
+                 f"(변화 후 {change.index - change.change_index + 1}회 측정에서 탐지), "
+                 f"빠른 재동기화 ({self.clock_tracker.resyncs}회째)")
+        self.logger.info(f"추적 구간 변화 {host}: {stream} {change._asdict()}")
+    
+    def apply_combined_sources(self):
+        """필터 예측과 소스 결합 구간을 현재 오프셋/불확실성에 반영
+
+        Returns:
+            CombinedInterval 또는 소스가 없으면 None
+        """
+        self.server_time_offset, self.offset_uncertainty = self.predict_offset_at(
+            time.time() + self.server_time_offset)
+        combined = self.last_combined
+        if combined is None:
+            return None
+        self.log_combined_sources(combined)
+        return combined
+    
+    def log_combined_sources(self, combined):
+        """소스 결합 결과 로그 (불일치 소스 경고 포함)"""
+        self.log(f"🧭 소스 결합: {len(combined.truechimers)}개 일치, "
+                f"구간 [{combined.lo*1000:+.1f}, {combined.hi*1000:+.1f}]ms "
+                f"→ {combined.offset*1000:+.1f}ms ±{combined.uncertainty*1000:.1f}ms")
+        if combined.falsetickers:
+            self.log(f"⚠️ 불일치 소스 제외: {', '.join(combined.falsetickers)}")
+        self.logger.info(f"소스 결합: 일치 {combined.truechimers}, 불일치 {combined.falsetickers}, "
+                         f"구간 [{combined.lo*1000:+.3f}, {combined.hi*1000:+.3f}]ms")
+
+    def fit_sync_bootstrap(self, offsets, latencies, offset_estimate, latency_estimate):
+        """동기화 직후 정제된 측정으로 부트스트랩 신뢰구간 계산 (도착 오차 표시 갱신)"""
+        bootstrap = self.sync_bootstrap.fit(offsets, latencies, offset_estimate, latency_estimate)
+        if not bootstrap.fitted:
+            return
+        self.accuracy_var.set(f"{bootstrap.arrival_ci.lo*1000:+.1f} ~ {bootstrap.arrival_ci.hi*1000:+.1f}ms")
+        self.logger.info(f"부트스트랩 {int(bootstrap.level*100)}% 구간 (측정 {bootstrap.samples}개, "
+                         f"{bootstrap.elapsed*1000:.1f}ms): "
+                         f"오프셋 [{bootstrap.offset_ci.lo*1000:+.3f}, {bootstrap.offset_ci.hi*1000:+.3f}]ms, "
+                         f"지연 [{bootstrap.latency_ci.lo*1000:.3f}, {bootstrap.latency_ci.hi*1000:.3f}]ms, "
+                         f"도착 오차 [{bootstrap.arrival_ci.lo*1000:+.3f}, {bootstrap.arrival_ci.hi*1000:+.3f}]ms")
+
+    def log_sync_bootstrap(self):
+        """부트스트랩 신뢰구간 GUI 로그"""
+        bootstrap = self.sync_bootstrap
+        if not bootstrap.fitted:
+            return
+        level = int(bootstrap.level * 100)
+        self.log(f"🔬 {level}% 신뢰구간: 오프셋 {bootstrap.offset_ci.lo*1000:+.1f}~{bootstrap.offset_ci.hi*1000:+.1f}ms, "
+                f"지연 {bootstrap.latency_ci.lo*1000:.1f}~{bootstrap.latency_ci.hi*1000:.1f}ms")
+        self.log(f"🔬 예상 도착 오차 ({level}%): {bootstrap.arrival_ci.lo*1000:+.1f}~{bootstrap.arrival_ci.hi*1000:+.1f}ms")
+
+    def observe_probe_result(self, url, result):
+        """측정 엔진 관찰자: Date 헤더가 있는 모든 측정을 호스트별 구간 제약에 누적 (작업 스레드)
+
+        구간 제약은 모든 호스트에 대해 누적하지만 소스 결합에는 대상 호스트(active_host)의
+        구간만 제출 (다른 호스트의 서버 시계가 발사 기준 구간을 끌어당기지 않도록)
+        여러 작업 스레드가 동시에 호출하므로 반영과 구간 제출을 한 잠금 안에서 처리
+        (다른 스레드의 반영 사이에 끼어 이전 구간을 나중에 제출하지 않도록)
+        """
+        host = urlparse(url).netloc
+        with self.date_constraints_lock:
+            solver = self.date_constraints.get(host)
+            if solver is None:
+                solver = self.date_constraints[host] = DateConstraintSolver()
+            if solver.add_result(result) is None or host != self.active_host:
+                return
+            lo, hi = solver.bounds()
+            self.source_combiner.submit(f"date:{host}", 'date_constraints', lo, hi, authoritative=True,
+                                        measured_at=result['local_before'] + result['rtt'], host=host)
+    
+    def date_constraints_to_dict(self):
+        """누적 데이터 저장용 호스트별 Date 구간 제약"""
+        with self.date_constraints_lock:
+            return {host: solver.to_dict() for host, solver in self.date_constraints.items()}
+    
+    def log_date_constraints(self, url):
+        """누적된 Date 구간 제약 로그"""
+        with self.date_constraints_lock:
+            solver = self.date_constraints.get(urlparse(url).netloc)
+            bounds = solver.bounds(time.time()) if solver else None
+            if bounds is None:
+                return
+            observations, conflicts = solver.observations, solver.conflicts
+        lo, hi = bounds
+        self.log(f"📐 Date 구간 제약: [{lo*1000:+.1f}, {hi*1000:+.1f}]ms, 폭 {(hi - lo)*1000:.1f}ms "
+                f"(관측 {observations}개, 재시작 {conflicts}회)")
+    
+    def rtt_envelope_for(self, url):
+        """호스트별 RTT 하한 필터 (동기화 세션을 넘어 하한 유지)"""
+        host = urlparse(url).netloc
+        if host not in self.rtt_envelopes:
+            self.rtt_envelopes[host] = RttEnvelopeFilter()
+        return self.rtt_envelopes[host]
+    
+    def rebuild_drift_samples(self):
+        """누적 데이터 중 정밀한 측정과 추적기 측정으로 드리프트 표본 재구성
+
+        Date 헤더 다중 측정은 최대 1초 오차가 있어 기울기 추정에서 제외
+        """
+        self.drift_estimator.clear()
+        for m in self.cumulative_measurements:
+            if self.is_precise_measurement(m):
+                self.drift_estimator.add(m['timestamp'], m['offset'])
+        for local_time, offset in self.live_offset_samples:
+            self.drift_estimator.add(local_time, offset)
+    
+    def plan_fire_time(self, forward_delay, click_execution_time, offset_uncertainty, latency_spread=1.0,
+                       network_latency=None):
+        """도착 창 확률이 최대인 발사 선행 시간 (동기화 부트스트랩 전이면 None)
+
+        지연은 마지막 동기화의 요청별 지연 편차를 현재 전방 지연 기준으로 옮긴 표본
+        (latency_spread: 목표 시간대의 지연 분산 비율, 편차에 곱함,
+        network_latency: forward_delay를 구한 단방향(RTT/2) 지연, 없으면 현재 추정값),
+        실행시간/깨어남 오차는 최근 실측, 오프셋 오차는 목표 시각 불확실성(offset_uncertainty) 구간의 균등 격자
+        """
+        latency_errors = self.sync_bootstrap.latency_errors
+        if latency_errors is None:
+            return None
+        # 편차는 단방향(RTT/2) 기준이므로 전방 지연 비율만큼 조정 (정렬된 재표본에서 분위수 256개만 사용)
+        if network_latency is None:
+            network_latency = self.network_latency
+        scale = forward_delay / network_latency if network_latency > 0 else 1.0
+        scale *= latency_spread
+        step = max(1, len(latency_errors) // 256)
+        latencies = [forward_delay + e * scale for e in latency_errors[::step]]
+        recent_times = self.execution_time_history[-10:]
+        execution_times = recent_times if len(recent_times) >= 3 else [click_execution_time]
+        wake_errors = self.wake_error_history or [0.0]
+        u = offset_uncertainty
+        offset_errors = [-u + (2 * i + 1) * u / 64 for i in range(64)] if u > 0 else [0.0]
+        self.fire_optimizer.set_distributions(latencies, execution_times, wake_errors, offset_errors)
+        return self.fire_optimizer.optimize()
+    
+    def fire_plan_inputs(self):
+        """plan_fire_time이 인자 외에 읽는 상태 (fire_plan_changed로 비교해 발사 직전 재계획 여부 판단)"""
+        return (self.sync_bootstrap.latency_errors, tuple(self.execution_time_history[-10:]),
+                tuple(self.wake_error_history))
+    
+    @staticmethod
+    def fire_plan_changed(before, after):
+        """발사 계획 입력이 바뀌었는지 (부트스트랩 재표본은 다시 적합할 때마다 새 객체라 동일성으로 비교)"""
+        return before[0] is not after[0] or before[1:] != after[1:]
+    
+    def forecast_latency(self, target_timestamp, estimated_at=None):
+        """목표 시간대의 지연 분포로 보정한 발사용 지연
+
+        현재 지연은 estimated_at(없으면 대상 호스트 마지막 측정 시각)에 잰 값이므로,
+        두 시각의 시간대 예측 중앙값 차이만큼 옮김 (같은 시간대면 그대로)
+        공유 추정값(network_latency, predicted_latency)은 바꾸지 않음 (실행마다 보정이 누적되지 않도록)
+
+        Returns:
+            tuple: (지연, 예측 지연(없으면 0), 목표 시간대 / 추정 시간대 IQR 비율 (발사 최적화의 지연 편차 배율, 0.5~3))
+        """
+        unchanged = (self.network_latency, self.predicted_latency, 1.0)
+        host = self.active_host or ''
+        if estimated_at is None:
+            host_records = (m for m in reversed(self.cumulative_measurements) if m.get('host', '') == host)
+            last = next(host_records, None)
+            estimated_at = last['timestamp'] if last else time.time()
+        target = self.latency_model.predict(host, target_timestamp)
+        reference = self.latency_model.predict(host, estimated_at)
+        if target is None or reference is None or target.bucket == reference.bucket:
+            return unchanged
+        if target.source == 'host' and reference.source == 'host':
+            return unchanged  # 두 시간대 모두 자체 표본이 없으면 구분할 정보가 없음
+        shift = target.median - reference.median
+        reference_iqr = reference.q3 - reference.q1
+        spread = (target.q3 - target.q1) / reference_iqr if reference_iqr > 0 else 1.0
+        spread = max(0.5, min(3.0, spread))
+        latency = max(0.0, self.network_latency + shift)
+        predicted_latency = max(0.0, self.predicted_latency + shift) if self.predicted_latency > 0 else 0.0
+        self.log(f"🕒 시간대 지연 모델: 목표 {self.latency_model.bucket_label(target.bucket)} "
+                f"중앙값 {target.median*1000:.1f}ms ({target.samples}개) vs "
+                f"추정 시각 {self.latency_model.bucket_label(reference.bucket)} {reference.median*1000:.1f}ms "
+                f"→ 지연 {shift*1000:+.1f}ms, 편차 x{spread:.2f}")
+        self.logger.info(f"시간대 지연 예측: 목표 {target}, 기준 {reference}, 보정 {shift*1000:+.3f}ms")
+        return latency, predicted_latency, spread
+    
+    def predict_offset_at(self, server_timestamp):
+        """서버 시각 server_timestamp 시점의 오프셋 예측
+
+        칼만 필터에 측정이 있으면 필터 예측(평균 ± 3σ)을, 없으면 현재 오프셋을 드리프트로
+        외삽한 값을 NTP/HTTP 소스 구간과 결합
+
+        Returns:
+            tuple: (예측 오프셋, 불확실성) - 소스가 있으면 결합 구간의 중앙과 반폭
+        """
+        local_target = server_timestamp - self.server_time_offset
+        extra = []
+        if self.clock_filter.initialized:
+            offset, variance = self.clock_filter.predict_offset(local_target)
+            uncertainty = variance ** 0.5
+            extra.append(TimeSource('http:filter', 'kalman', offset - 3 * uncertainty,
+                                    offset + 3 * uncertainty, True, time.time()))
+        else:
+            estimated_at = self.offset_estimated_at
+            if estimated_at is None:
+                estimated_at = (self.cumulative_measurements[-1]['timestamp']
+                                if self.cumulative_measurements else time.time())
+            offset, drift_uncertainty = self.drift_estimator.predict(self.server_time_offset, estimated_at, local_target)
+            uncertainty = (self.offset_uncertainty ** 2 + drift_uncertainty ** 2) ** 0.5
+        
+        # NTP 구간은 실제 오프셋 기준이므로 대상 호스트의 경로 비대칭 편향만큼 옮겨 HTTP 기준에 맞춤
+        shifts = None
+        if self.active_host:
+            shifts = {'ntp': self.path_asymmetry.bias(self.active_host, 2 * self.network_latency)}
+        # 다른 호스트에서 측정한 HTTP 소스는 제외 (호스트 무관한 NTP 소스와 대상 호스트 소스만)
+        combined = self.source_combiner.combine(extra=extra, shifts=shifts, host=self.active_host or '')
+        self.last_combined = combined
+        if combined is not None:
+            offset, uncertainty = combined.offset, combined.uncertainty
+        # 발사 중이면 대상 백엔드 클러스터와 혼합 추정의 차이 반영
+        return offset + self.backend_shift, uncertainty
+    
+    def set_active_host(self, host):
+        """동기화/발사 대상 호스트 지정 (바뀌면 이전 호스트에서 측정한 소스 구간 정리)"""
+        previous, self.active_host = self.active_host, host
+        if previous is not None and previous != host:
+            self.source_combiner.clear_host(previous)
+            self.last_combined = None
+    
+    def tracker_host(self):
+        """시계 추적기가 측정 중인 호스트 (추적 전이면 None)"""
+        url = self.clock_tracker.url
+        return urlparse(url).netloc if url else None
+    
+    def current_clock(self):
+        """카운트다운/발사 스레드용 현재 추정값 (offset, latency, uncertainty, 스냅샷 나이 또는 None)"""
+        snapshot = self.clock_tracker.snapshot()
+        if snapshot is None:
+            return self.server_time_offset, self.network_latency, self.offset_uncertainty, None
+        return snapshot.offset, snapshot.latency, snapshot.uncertainty, snapshot.age()
+    
+    def prefetch_url_dns(self, event=None):
+        """입력된 URL 호스트의 DNS를 백그라운드에서 미리 조회 (측정 연결 시 캐시 사용)"""
+        url = self.url_var.get().strip()
+        if not url or url == "https://":
+            return
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        try:
+            self.probe_transport.prefetch(url)
+            self.apply_saved_edge(url)
+        except Exception as e:
+            self.logger.debug(f"DNS 사전 조회 실패: {e}")
+    
+    def apply_saved_edge(self, url):
+        """이전 세션에서 선택한 최적 엣지로 바로 고정 (동기화 시 다시 측정해 갱신)"""
+        if not self.edge_selection_var.get():
+            return
+        host = urlparse(url).netloc
+        saved = self.edge_stats.get(host)
+        if saved and saved.get('best') and self.probe_transport.pinned_address(url) is None:
+            self.probe_transport.pin_address(url, saved['best'])
+            self.log(f"🛰️ 저장된 최적 엣지 사용: {host} → {saved['best']}")
+    
+    def select_best_edge(self, url, rounds=5):
+        """모든 엣지 주소를 동시에 측정해 가장 빠르고 안정적인 주소로 측정 연결 고정"""
+        host = urlparse(url).netloc  # 엣지 고정과 같이 포트별로 구분
+        try:
+            stats = self.probe_engine.run(EdgeSelectionStrategy(rounds=rounds).run(self.probe_engine, url))
+        except Exception as e:
+            self.log(f"엣지 측정 실패: {e}")
+            return None
+        
+        if not stats:
+            return None
+        if len(stats) == 1:
+            self.log(f"🛰️ 엣지 주소 1개: {stats[0]['address']} (선택 불필요)")
+        else:
+            self.log(f"🛰️ 엣지 주소 {len(stats)}개 측정 ({rounds}회씩 동시 발사)")
+            for entry in stats:
+                if entry['samples'] == 0:
+                    self.log(f"  {entry['address']}: 측정 실패 ({entry['failures']}회)")
+                    continue
+                failure_note = f", 실패 {entry['failures']}회" if entry['failures'] else ""
+                self.log(f"  {entry['address']}: RTT 중앙값 {entry['median_rtt']:.1f}ms, "
+                        f"최소 {entry['min_rtt']:.1f}ms, 지터 {entry['jitter']:.1f}ms{failure_note}")
+        
+        best = stats[0]
+        if best['samples'] == 0:
+            self.log("⚠️ 응답한 엣지가 없어 주소 고정 안 함")
+            return None
+        
+        self.probe_transport.pin_address(url, best['address'])
+        self.edge_stats[host] = {
+            'best': best['address'],
+            'updated': time.time(),
+            'addresses': {entry['address']: {k: v for k, v in entry.items() if k != 'address'}
+                          for entry in stats},
+        }
+        self.log(f"📌 최적 엣지 고정: {best['address']} (점수 {best['score']:.1f})")
+        self.logger.info(f"엣지 선택 결과 {host}: {json.dumps(stats)}")
+        return best['address']
+    
+    def log_reconnect_timings(self, url):
+        """콜드/웜 재연결 비용을 측정해 로그에 기록"""
+        try:
+            timings = self.probe_transport.measure_reconnect(url)
+        except Exception as e:
+            self.log(f"재연결 비용 측정 실패: {e}")
+            return
+        
+        for label, name in (('cold', '콜드'), ('warm', '웜')):
+            t = timings[label]
+            detail = f"DNS {t['dns']:.1f}ms, TCP {t['tcp']:.1f}ms"
+            if t['tls'] is not None:
+                detail += f", TLS {t['tls']:.1f}ms{' (세션 재개)' if t['tls_resumed'] else ''}"
+            cache_note = " (DNS 캐시)" if t['dns_cached'] else ""
+            self.log(f"🔁 {name} 재연결: {t['total']:.1f}ms{cache_note} - {detail}")
+            self.logger.info(f"{name} 재연결 비용: {json.dumps(t)}")
+    
+    def sync_time(self, num_samples=5, method=None):
+        """시간 동기화 실행
+        
+        Args:
+            num_samples: 측정 횟수 (이분 탐색에서는 최대 요청 수)
+            method: 'bisection'이면 초 경계 이분 탐색, None이면 측정 횟수에 따라 자동 선택
+        """
         url = self.url_var.get().strip()
         if not url or url == "https://":
             messagebox.showerror("오류", "URL을 입력하세요.")
@@ -1341,12 +2128,16 @@ class TimeSyncMacroGUI:
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
             self.url_var.set(url)
+        self.set_active_host(urlparse(url).netloc)
         
         def sync_thread():
             try:
                 self.log(f"정밀 시간 동기화 시작...")
+                self.clock_tracker.pause()  # 동기화 측정 중에는 추적 측정 중지
                 self.sync_button.config(state=tk.DISABLED)
                 self.sync_intensive_button.config(state=tk.DISABLED)
+                self.sync_bisection_button.config(state=tk.DISABLED)
+                self.offset_uncertainty = 0
                 
                 # 브라우저 미리 열기
                 if not self.browser_opened:
@@ -1358,8 +2149,33 @@ class TimeSyncMacroGUI:
                     except Exception as e:
                         self.log(f"브라우저 미리 열기 실패: {e}")
                 
+                # 여러 엣지 주소 중 최적 주소로 측정 연결 고정
+                if self.edge_selection_var.get():
+                    self.apply_saved_edge(url)
+                    self.select_best_edge(url)
+                
+                # 재연결 비용 진단은 호스트당 한 번만, 측정 연결을 확보하기 전에 실행
+                # (매 동기화마다 추가 연결을 맺으면 측정 경로가 늦어지고 keep-alive 풀이 흐트러짐)
+                if self.active_host not in self.reconnect_logged_hosts:
+                    self.reconnect_logged_hosts.add(self.active_host)
+                    self.log_reconnect_timings(url)
+                
+                # 측정용 keep-alive 연결 미리 확보 (DNS/TCP/TLS 비용을 측정에서 제외)
+                try:
+                    warm_start = time.perf_counter()
+                    warmed = self.probe_transport.warm_up(url)
+                    self.log(f"🔗 측정 연결 준비: {warmed}개 ({(time.perf_counter() - warm_start)*1000:.1f}ms)")
+                except Exception as e:
+                    self.log(f"측정 연결 준비 실패: {e}")
+                
                 # 🎯 우선 시도: 초 변화 순간 캐치 방법 (고정밀도)
-                if num_samples <= 10:  # 일반 동기화에서는 새 방법 사용
+                if method == 'bisection':
+                    self.log("✂️ 이분 탐색 방법: 서버 초 경계 구간 축소...")
+                    success = self.bisection_second_edge_sync(url, max_probes=num_samples)
+                    if not success:
+                        self.log("⚠️ 이분 탐색 실패, 초 변화 캐치로 전환...")
+                        success = self.precise_second_change_sync(url, max_attempts=3)
+                elif num_samples <= 10:  # 일반 동기화에서는 새 방법 사용
                     self.log("🎯 고정밀 방법: 초 변화 순간 캐치 동기화 시도...")
                     success = self.precise_second_change_sync(url, max_attempts=min(num_samples, 5))
                 else:
@@ -1382,12 +2198,20 @@ class TimeSyncMacroGUI:
                     success = self.measure_server_time_offset(url, num_samples)
                 
                 if success:
+                    self.log_date_constraints(url)
+                    self.apply_combined_sources()
                     self.sync_status.set("동기화 완료")
                     self.latency_var.set(f"{self.network_latency*1000:.1f}ms")
                     self.offset_var.set(f"{self.server_time_offset*1000:.1f}ms")
                     
-                    # 정확도 계산
-                    if hasattr(self, 'measurement_history') and len(self.measurement_history) > 1:
+                    # 동기화 결과에서 시작해 백그라운드로 계속 추적
+                    self.clock_tracker.seed(self.server_time_offset, self.offset_uncertainty,
+                                            self.network_latency)
+                    self.clock_tracker.start(url)
+                    
+                    # 정확도 계산 (부트스트랩 도착 오차 구간이 없을 때만 지연 표준편차 표시)
+                    if (not self.sync_bootstrap.fitted and hasattr(self, 'measurement_history')
+                            and len(self.measurement_history) > 1):
                         latencies = [m['latency'] for m in self.measurement_history[-num_samples:]]
                         std_dev = statistics.stdev(latencies) if len(latencies) > 1 else 0
                         self.accuracy_var.set(f"±{std_dev*1000:.1f}ms")
@@ -1413,11 +2237,78 @@ class TimeSyncMacroGUI:
                     self.log("❌ 모든 동기화 방법 실패!")
                 
             finally:
+                self.clock_tracker.resume()
                 self.sync_button.config(state=tk.NORMAL)
                 self.sync_intensive_button.config(state=tk.NORMAL)
+                self.sync_bisection_button.config(state=tk.NORMAL)
         
         threading.Thread(target=sync_thread, daemon=True).start()
     
+    def calibrate_path_asymmetry(self):
+        """NTP 오프셋과 대상 서버 HTTP 오프셋을 비교해 호스트의 전방/복귀 지연 비율 보정
+        
+        HTTP 오프셋은 단방향 지연을 RTT/2로 가정하므로, 대상 서버 시계가 NTP로 맞춰져 있다면
+        두 오프셋의 차이가 곧 경로 비대칭 편향 (전방 지연 - RTT/2)
+        """
+        url = self.url_var.get().strip()
+        if not url or url == "https://":
+            messagebox.showerror("오류", "URL을 입력하세요.")
+            return
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+            self.url_var.set(url)
+        host = urlparse(url).netloc
+        self.set_active_host(host)
+        
+        def calibrate_thread():
+            try:
+                self.asymmetry_button.config(state=tk.DISABLED)
+                self.log(f"🔀 경로 비대칭 보정 시작: {host}")
+                
+                if not self.measure_ntp_time_offset():
+                    self.log("❌ 비대칭 보정 실패: NTP 측정 불가")
+                    return
+                ntp_offset = self.ntp_server_time_offset
+                
+                # HTTP 오프셋: 최근 추적 스냅샷이 충분히 정밀하면 사용, 아니면 버스트로 새로 측정
+                snapshot = self.clock_tracker.snapshot()
+                if snapshot is not None and snapshot.age() < 30 and snapshot.uncertainty < 0.005:
+                    http_offset, latency, http_uncertainty = snapshot.offset, snapshot.latency, snapshot.uncertainty
+                    self.log(f"  HTTP 오프셋: 추적 스냅샷 ({snapshot.age():.1f}초 전)")
+                else:
+                    self.clock_tracker.pause()
+                    try:
+                        if not self.burst_second_edge_sync(url):
+                            self.log("❌ 비대칭 보정 실패: HTTP 측정 불가")
+                            return
+                    finally:
+                        self.clock_tracker.resume()
+                    http_offset, latency, http_uncertainty = (self.server_time_offset, self.network_latency,
+                                                              self.offset_uncertainty)
+                
+                rtt = 2 * latency
+                entry = self.path_asymmetry.add(host, http_offset, ntp_offset, rtt,
+                                                http_uncertainty + self.ntp_offset_error)
+                self.log(f"  HTTP {http_offset*1000:+.1f}ms ±{http_uncertainty*1000:.1f}ms, "
+                         f"NTP {ntp_offset*1000:+.1f}ms ±{self.ntp_offset_error*1000:.1f}ms, RTT {rtt*1000:.1f}ms")
+                if entry is None:
+                    self.log("⚠️ 차이가 RTT/2를 넘음: 대상 서버 시계가 NTP와 맞지 않아 보정하지 않음")
+                    return
+                
+                calibration = self.path_asymmetry.get(host)
+                fraction = calibration['forward_fraction']
+                self.log(f"✅ 경로 비대칭 보정 완료: 전방 {fraction*100:.0f}% / 복귀 {(1 - fraction)*100:.0f}% "
+                         f"(편향 {entry['bias']*1000:+.1f}ms, ±{calibration['uncertainty']*100:.0f}%, "
+                         f"보정 {calibration['samples']}회)")
+                self.logger.info(f"경로 비대칭 보정 {host}: {json.dumps(entry)}")
+                self.save_cumulative_data()
+            except Exception as e:
+                self.log(f"❌ 비대칭 보정 오류: {e}")
+            finally:
+                self.asymmetry_button.config(state=tk.NORMAL)
+        
+        threading.Thread(target=calibrate_thread, daemon=True).start()
+    
     def ntp_sync_time(self):
         """NTP 기반 초정밀 시간 동기화"""
         def ntp_sync_thread():
@@ -1428,12 +2319,8 @@ class TimeSyncMacroGUI:
                 success = self.measure_ntp_time_offset()
                 
                 if success:
-                    # NTP 결과를 기본 동기화 변수에도 적용
-                    self.server_time_offset = self.ntp_server_time_offset
-                    self.network_latency = self.ntp_network_latency
-                    
-                    # 적응형 지연 예측에 추가
-                    self.update_adaptive_latency_prediction(self.ntp_network_latency)
+                    # NTP 구간을 HTTP 소스와 결합 (NTP 지연은 대상 서버 지연이 아니므로 반영하지 않음)
+                    self.apply_combined_sources()
                     
                     self.sync_status.set("NTP 동기화 완료")
                     self.latency_var.set(f"{self.network_latency*1000:.1f}ms")
@@ -1441,7 +2328,7 @@ class TimeSyncMacroGUI:
                     self.predicted_latency_var.set(f"{self.predicted_latency*1000:.1f}ms")
                     
                     self.log("✅ NTP 초정밀 동기화 완료!")
-                    self.log(f"🎯 최종 정확도: 서브밀리초급 (±{(self.latency_variance**0.5)*1000:.1f}ms)")
+                    self.log(f"🎯 최종 정확도: ±{self.offset_uncertainty*1000:.1f}ms (결합 구간 반폭)")
                 else:
                     self.sync_status.set("NTP 동기화 실패")
                     self.log("❌ NTP 동기화 실패 - HTTP 동기화를 시도해보세요")
@@ -1451,6 +2338,26 @@ class TimeSyncMacroGUI:
         
         threading.Thread(target=ntp_sync_thread, daemon=True).start()
     
+    def format_probe_phases(self, phases_ns):
+        """측정 단계별 소요시간을 로그용 문자열로 변환"""
+        labels = [('dns', 'DNS'), ('tcp', 'TCP'), ('tls', 'TLS'),
+                  ('send', '요청 전송'), ('wait', '첫 바이트'), ('headers', '헤더')]
+        durations = phase_durations_ms(phases_ns)
+        return ", ".join(f"{label} {durations[key]:.2f}ms"
+                         for key, label in labels if durations[key] is not None)
+    
+    def detect_probe_method(self, url):
+        """응답 헤더를 보고 본문에서 서버 시각을 읽어야 하는지 판단 (JSON 시간 API면 GET)"""
+        try:
+            result = self.probe_transport.probe(url)
+        except Exception as e:
+            self.logger.debug(f"측정 방식 확인 실패: {e}")
+            return 'HEAD'
+        method = probe_method_for(result)
+        if method != 'HEAD':
+            self.logger.info(f"본문 기반 서버 시각 사용: {method} 요청으로 측정")
+        return method
+    
     def measure_server_time_offset(self, url, num_samples):
         """서버 시간 동기화 측정 (초정밀 버전 + 상세 로깅)"""
         offsets = []
@@ -1466,158 +2373,104 @@ class TimeSyncMacroGUI:
         self.logger.info(f"세션 시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
         self.logger.info("-"*60)
         
-        for i in range(num_samples):
-            try:
-                # 여러 번 측정해서 가장 높은 품질의 응답 사용
-                best_latency = float('inf')
-                best_offset = 0
-                best_measurement = None
-                best_quality = 0  # 품질 점수 초기화 추가
-                
-                        # 각 샘플마다 5번 빠른 측정 시도 (개선: 3→5)
-                for attempt in range(5):  # 시도 횟수 증가
-                    try:
-                        # 정밀한 시간 측정을 위해 perf_counter와 time() 모두 사용
-                        local_before_real = time.time()
-                        local_before_precise = time.perf_counter()
-                        
-                        with urlopen(url, timeout=3) as response:  # 타임아웃 단축 (5→3초)
-                            local_after_real = time.time()
-                            local_after_precise = time.perf_counter()
-                            
-                            # 정밀한 지연시간 계산 (perf_counter 사용)
-                            latency = (local_after_precise - local_before_precise) / 2
-                            
-                            server_time_str = response.headers.get('Date')
-                            if server_time_str:
-                                # 서버 시간 파싱 (개선된 형식 지원)
-                                server_time = None
-                                time_formats = [
-                                    '%a, %d %b %Y %H:%M:%S GMT',
-                                    '%a, %d %b %Y %H:%M:%S %Z',
-                                    '%d %b %Y %H:%M:%S GMT',
-                                    '%a, %d %b %Y %H:%M:%S.%f GMT',  # 마이크로초 지원
-                                ]
-                                
-                                for fmt in time_formats:
-                                    try:
-                                        server_time = datetime.strptime(server_time_str, fmt)
-                                        break
-                                    except ValueError:
-                                        continue
-                                
-                                if server_time:
-                                    server_time = server_time.replace(tzinfo=timezone.utc)
-                                    server_timestamp = server_time.timestamp()
-                                    
-                                    # 네트워크 지연을 고려한 로컬 시간
-                                    local_timestamp_at_server = local_before_real + latency
-                                    offset = server_timestamp - local_timestamp_at_server
-                                    
-                                    # 응답 품질 점수 계산 (지연시간과 일관성 고려)
-                                    quality_score = 1.0 / (latency + 0.001)  # 낮은 지연시간이 높은 점수
-                                    
-                                    # 가장 높은 품질의 응답 선택
-                                    if quality_score > best_quality:
-                                        best_quality = quality_score
-                                        best_latency = latency
-                                        best_offset = offset
-                                        best_measurement = {
-                                            'sample': i + 1,
-                                            'attempt': attempt + 1,
-                                            'latency': latency,
-                                            'offset': offset,
-                                            'quality_score': quality_score,
-                                            'local_before': local_before_real,
-                                            'local_after': local_after_real,
-                                            'server_time': server_timestamp,
-                                            'server_time_str': server_time_str,
-                                            'local_timestamp_at_server': local_timestamp_at_server,
-                                            'response_time': (local_after_precise - local_before_precise) * 1000  # ms
-                                        }
-                    
-                    except Exception as e:
-                        self.logger.warning(f"측정 {i+1} 시도 {attempt+1} 실패: {e}")
-                        continue
-                    
-                    # 더 짧은 간격으로 재시도 (10ms → 5ms)
-                    time.sleep(0.005)
-                
-                if best_measurement:
-                    latencies.append(best_latency)
-                    offsets.append(best_offset)
-                    self.measurement_history.append(best_measurement)
-                    
-                    # 적응형 지연 예측 시스템에 측정값 추가
-                    self.update_adaptive_latency_prediction(best_latency)
-                    
-                    # 로그 파일에 상세 측정 결과 기록
-                    self.logger.info(f"측정 {i+1:2d}/{num_samples} | "
-                                   f"지연: {best_latency*1000:6.1f}ms | "
-                                   f"오프셋: {best_offset*1000:+7.1f}ms | "
-                                   f"응답시간: {best_measurement['response_time']:6.1f}ms | "
-                                   f"시도: {best_measurement['attempt']}/5")
-                    
-                    # JSON 형태로 상세 데이터도 기록
-                    self.logger.debug(f"측정 {i+1} 상세: {json.dumps(best_measurement, default=str, indent=None)}")
-                    
-                    # 상세 로그 (매 5회마다)
-                    if (i + 1) % 5 == 0 or i == 0:
-                        local_time_str = datetime.fromtimestamp(best_measurement['local_timestamp_at_server']).strftime('%H:%M:%S.%f')[:-3]
-                        server_time_display = datetime.fromtimestamp(best_measurement['server_time']).strftime('%H:%M:%S.%f')[:-3]
-                        
-                        self.log(f"측정 {i+1}/{num_samples}: 지연 {best_latency*1000:.1f}ms, 시간차 {best_offset*1000:+.1f}ms (시도 {best_measurement['attempt']}/3)")
-                        if i == 0:  # 첫 번째 측정만 상세 표시
-                            self.log(f"  로컬: {local_time_str}, 서버: {server_time_display}")
-                else:
-                    self.logger.warning(f"측정 {i+1} 완전 실패: 모든 시도에서 측정 불가")
-                
-                # 측정 간격 (더 정밀하게)
-                self.precise_sleep(0.02)  # 20ms 간격
-                
-            except Exception as e:
-                self.log(f"측정 {i+1} 실패: {e}")
-                self.logger.error(f"측정 {i+1} 실패: {e}")
-                continue
-        
-        if offsets and latencies:
-            # 고급 이상값 제거 - 표준편차 기반
-            def remove_outliers_advanced(data):
-                if len(data) < 3:
-                    return data
-                
-                import statistics
-                mean_val = statistics.mean(data)
-                stdev_val = statistics.stdev(data) if len(data) > 1 else 0
-                
-                # 2 표준편차 이내의 값만 유지
-                filtered = [x for x in data if abs(x - mean_val) <= 2 * stdev_val]
-                return filtered if len(filtered) >= 2 else data
+        # 샘플당 5번씩 5ms 간격으로 예약 발사 (응답을 기다리지 않고 동시에 진행)
+        try:
+            self.probe_engine.prepare(url)
+            probe_method = self.detect_probe_method(url)
+            strategy = MultiSampleStrategy(num_samples, attempts=5, spacing=0.005, method=probe_method)
+            best_measurements, failures = self.probe_engine.run(
+                strategy.run(self.probe_engine, url))
+        except Exception as e:
+            self.log(f"측정 실패: {e}")
+            self.logger.error(f"측정 실패: {e}")
+            best_measurements, failures = [], []
+        
+        for sample, attempt, error in failures:
+            self.logger.warning(f"측정 {sample} 시도 {attempt} 실패: {error}")
+        
+        measured_samples = {m['sample'] for m in best_measurements}
+        for sample in range(1, num_samples + 1):
+            if sample not in measured_samples:
+                self.logger.warning(f"측정 {sample} 완전 실패: 모든 시도에서 측정 불가")
+        
+        # 서버 시각 해상도가 가장 높은 측정만 사용 (Date 헤더 측정은 최대 1초 오차)
+        if best_measurements:
+            finest = min(m['resolution'] for m in best_measurements)
+            coarse_count = sum(1 for m in best_measurements if m['resolution'] > finest)
+            best_measurements = [m for m in best_measurements if m['resolution'] == finest]
+            extractor_name = best_measurements[0]['extractor']
+            self.log(f"🕒 서버 시각 추출: {extractor_name} (해상도 {finest*1000:g}ms)")
+            if coarse_count:
+                self.log(f"  저해상도 측정 {coarse_count}개 제외")
+        
+        # RTT 하한 필터: 하한에 가까운(큐잉이 적은) 측정의 오프셋일수록 큰 비중
+        envelope = self.rtt_envelope_for(url)
+        for m in best_measurements:
+            envelope.add(m['latency'] * 2, m['local_before'])
+        envelope_estimate = envelope.combine([(m['offset'], m['latency'] * 2, m['resolution'])
+                                              for m in best_measurements])
+        
+        for best_measurement in best_measurements:
+            i = best_measurement['sample'] - 1
+            best_latency = best_measurement['latency']
+            best_offset = best_measurement['offset']
+            
+            latencies.append(best_latency)
+            offsets.append(best_offset)
+            self.measurement_history.append(best_measurement)
             
-            # 지연시간 기준으로 이상값 제거 (네트워크 상태 고려)
-            clean_indices = []
-            latency_threshold = statistics.median(latencies) * 1.5  # 중앙값의 1.5배 이하만 사용
+            # 로그 파일에 상세 측정 결과 기록
+            self.logger.info(f"측정 {i+1:2d}/{num_samples} | "
+                           f"지연: {best_latency*1000:6.1f}ms | "
+                           f"오프셋: {best_offset*1000:+7.1f}ms | "
+                           f"응답시간: {best_measurement['response_time']:6.1f}ms | "
+                           f"시도: {best_measurement['attempt']}/5")
             
-            for i, lat in enumerate(latencies):
-                if lat <= latency_threshold:
-                    clean_indices.append(i)
+            # JSON 형태로 상세 데이터도 기록
+            self.logger.debug(f"측정 {i+1} 상세: {json.dumps(best_measurement, default=str, indent=None)}")
+            if best_measurement.get('phases_ns'):
+                self.logger.debug(f"측정 {i+1} 단계별: {self.format_probe_phases(best_measurement['phases_ns'])}")
             
-            if clean_indices:
-                clean_offsets = [offsets[i] for i in clean_indices]
-                clean_latencies = [latencies[i] for i in clean_indices]
+            # 상세 로그 (매 5회마다)
+            if (i + 1) % 5 == 0 or i == 0:
+                local_time_str = datetime.fromtimestamp(best_measurement['local_timestamp_at_server']).strftime('%H:%M:%S.%f')[:-3]
+                server_time_display = datetime.fromtimestamp(best_measurement['server_time']).strftime('%H:%M:%S.%f')[:-3]
                 
-                # 추가 정제
-                clean_offsets = remove_outliers_advanced(clean_offsets)
-                clean_latencies = remove_outliers_advanced(clean_latencies)
+                self.log(f"측정 {i+1}/{num_samples}: 지연 {best_latency*1000:.1f}ms, 시간차 {best_offset*1000:+.1f}ms (시도 {best_measurement['attempt']}/5)")
+                if i == 0:  # 첫 번째 측정만 상세 표시
+                    self.log(f"  로컬: {local_time_str}, 서버: {server_time_display}")
+                    if best_measurement.get('phases_ns'):
+                        self.log(f"  단계별: {self.format_probe_phases(best_measurement['phases_ns'])}")
+        
+        if best_measurements:
+            # 지연시간 기준으로 이상값 제거 (네트워크 상태 고려, 중앙값의 1.5배 이하만 사용)
+            # 오프셋/지연/백엔드 짝이 어긋나지 않도록 측정 dict 자체를 걸러냄
+            clean_measurements = [m for m, keep in zip(best_measurements, latency_mask(latencies)) if keep]
+            
+            if clean_measurements:
+                # 추가 정제 (2 표준편차 이내): 오프셋이나 지연 중 하나라도 벗어나면 그 측정 제외
+                offset_keep = sigma_mask([m['offset'] for m in clean_measurements])
+                latency_keep = sigma_mask([m['latency'] for m in clean_measurements])
+                keep = [a and b for a, b in zip(offset_keep, latency_keep)]
+                if sum(keep) >= min(2, len(keep)):
+                    clean_measurements = [m for m, k in zip(clean_measurements, keep) if k]
+                clean_offsets = [m['offset'] for m in clean_measurements]
+                clean_latencies = [m['latency'] for m in clean_measurements]
                 
-                if clean_offsets and clean_latencies:
-                    # 최종 값 계산 - 중앙값 사용 (더 안정적)
-                    self.server_time_offset = statistics.median(clean_offsets)
+                if clean_measurements:
+                    # 최종 값 계산 - 오프셋은 RTT 하한 가중 평균, 지연은 중앙값
+                    self.server_time_offset = envelope_estimate.offset
                     self.network_latency = statistics.median(clean_latencies)
+                    self.logger.info(f"RTT 하한 필터: 하한 {envelope_estimate.floor*1000:.3f}ms, "
+                                   f"유효 표본 {envelope_estimate.effective_samples:.1f}/{envelope_estimate.samples}개, "
+                                   f"오프셋 {envelope_estimate.offset*1000:+.3f}ms ± {envelope_estimate.sigma*1000:.3f}ms "
+                                   f"(중앙값 {statistics.median(clean_offsets)*1000:+.3f}ms)")
                     
                     # 정확도 분석
                     offset_std = statistics.stdev(clean_offsets) if len(clean_offsets) > 1 else 0
                     latency_std = statistics.stdev(clean_latencies) if len(clean_latencies) > 1 else 0
+                    self.fit_sync_bootstrap(clean_offsets, clean_latencies,
+                                            self.server_time_offset, self.network_latency)
                     
                     # 동기화 결과를 로그 파일에 상세 기록
                     sync_result = {
@@ -1629,7 +2482,7 @@ class TimeSyncMacroGUI:
                         'final_network_latency_ms': self.network_latency * 1000,
                         'offset_std_dev_ms': offset_std * 1000,
                         'latency_std_dev_ms': latency_std * 1000,
-                        'estimated_accuracy_ms': (offset_std + latency_std) * 1000,
+                        'bootstrap': self.sync_bootstrap.to_dict(),
                         'raw_offsets_ms': [o * 1000 for o in offsets],
                         'raw_latencies_ms': [l * 1000 for l in latencies],
                         'clean_offsets_ms': [o * 1000 for o in clean_offsets],
@@ -1641,7 +2494,6 @@ class TimeSyncMacroGUI:
                     self.logger.info(f"  전체 측정: {num_samples}회 → 유효: {len(clean_offsets)}회 (필터링: {len(offsets) - len(clean_offsets)}회)")
                     self.logger.info(f"  서버 시간차: {self.server_time_offset*1000:+.3f}ms ± {offset_std*1000:.3f}ms")
                     self.logger.info(f"  네트워크 지연: {self.network_latency*1000:.3f}ms ± {latency_std*1000:.3f}ms")
-                    self.logger.info(f"  예상 정확도: ±{(offset_std + latency_std)*1000:.3f}ms")
                     self.logger.info(f"  오프셋 범위: {min(clean_offsets)*1000:+.1f} ~ {max(clean_offsets)*1000:+.1f}ms")
                     self.logger.info(f"  지연 범위: {min(clean_latencies)*1000:.1f} ~ {max(clean_latencies)*1000:.1f}ms")
                     
@@ -1654,22 +2506,34 @@ class TimeSyncMacroGUI:
                     self.log("=" * 50)
                     self.log("🎯 정밀 동기화 완료!")
                     self.log(f"📊 사용된 측정값: {len(clean_offsets)}/{num_samples}개")
+                    self.log(f"📉 RTT 하한 {envelope_estimate.floor*1000:.1f}ms 기준 가중 "
+                            f"(유효 표본 {envelope_estimate.effective_samples:.1f}개)")
                     self.log(f"🌐 서버 시간차: {self.server_time_offset*1000:+.1f}ms (±{offset_std*1000:.1f}ms)")
                     self.log(f"⚡ 네트워크 지연: {self.network_latency*1000:.1f}ms (±{latency_std*1000:.1f}ms)")
-                    self.log(f"🔬 예상 정확도: ±{(offset_std + latency_std)*1000:.1f}ms")
+                    self.log_sync_bootstrap()
                     self.log(f"📄 로그 저장됨: {self.log_file_path}")
                     self.log("=" * 50)
                     
                     # 누적 데이터에 측정값 추가
                     session_measurements = []
-                    for i, offset in enumerate(clean_offsets):
+                    for m in clean_measurements:
                         session_measurements.append({
-                            'offset': offset,
-                            'latency': clean_latencies[i] if i < len(clean_latencies) else 0,
-                            'method': 'traditional_multi_sample'
+                            'offset': m['offset'],
+                            'latency': m['latency'],
+                            'method': 'traditional_multi_sample',
+                            'extractor': extractor_name,
+                            'resolution': finest,
+                            'backend': m.get('backend')
                         })
                     self.update_cumulative_sync_data(session_measurements)
                     
+                    # 정답 구간: 하한 측정의 단방향 지연 + 서버 시각 해상도(잘림)
+                    self.source_combiner.submit(
+                        'http:multi_sample', extractor_name,
+                        envelope_estimate.offset - envelope_estimate.floor / 2,
+                        envelope_estimate.offset + envelope_estimate.floor / 2 + finest,
+                        authoritative=True, host=urlparse(url).netloc)
+                    
                     return True
                 
         self.logger.error("동기화 실패: 유효한 측정값이 없음")
@@ -1693,6 +2557,8 @@ class TimeSyncMacroGUI:
                 self.sync_time()
                 return
         
+        self.set_active_host(urlparse(url if url.startswith(('http://', 'https://')) else 'https://' + url).netloc)
+        
         def macro_thread():
             try:
                 self.is_running = True
@@ -1721,8 +2587,9 @@ class TimeSyncMacroGUI:
                 
                 # 목표 시간까지의 대략적인 대기
                 while self.is_running:
-                    # 현재 실제 시간 사용 (서버 오프셋 적용)
-                    current_time = time.time() + self.server_time_offset
+                    # 현재 실제 시간 사용 (추적기 스냅샷의 서버 오프셋 적용)
+                    offset, _, _, _ = self.current_clock()
+                    current_time = time.time() + offset
                     time_until_target = target_timestamp - current_time
                     
                     if time_until_target <= 0:
@@ -1737,7 +2604,47 @@ class TimeSyncMacroGUI:
                     
                     # 정밀 타이밍 진입 (클릭 실행시간 + 네트워크 지연보다 일찍)
                     if time_until_target <= (self.network_latency + 0.70 + 0.1):  # 500ms + 네트워크지연 + 100ms 여유
-                        self.log(f"정밀 타이밍 모드 진입! (네트워크지연: {self.network_latency*1000:.1f}ms, 클릭실행시간: 500ms)")
+                        # 발사 직전에는 추적 측정을 멈추고 마지막 스냅샷으로 고정
+                        self.clock_tracker.pause()
+                        snapshot = self.clock_tracker.snapshot()
+                        if snapshot is not None:
+                            self.server_time_offset = snapshot.offset
+                            self.network_latency = snapshot.latency
+                            self.offset_uncertainty = snapshot.uncertainty
+                            self.log(f"🛰️ 추적 스냅샷 사용: 오프셋 {snapshot.offset*1000:+.1f}ms "
+                                    f"±{snapshot.uncertainty*1000:.1f}ms ({snapshot.age():.1f}초 전 갱신)")
+                        
+                        # 시간대별 지연 모델: 지연 추정 시각과 목표 시각의 시간대 차이만큼 보정한 발사용 지연
+                        # (공유 추정값은 그대로 두고 이번 발사에서만 사용)
+                        fire_latency, fire_predicted_latency, latency_spread = self.forecast_latency(
+                            target_timestamp, snapshot.updated_at if snapshot is not None else None)
+                        
+                        # 발사 연결이 향하는 백엔드 클러스터 기준으로 오프셋 보정
+                        cluster = self.select_backend_cluster(url)
+                        self.backend_shift = cluster.offset - self.backend_blend_offset if cluster else 0
+                        if cluster is not None:
+                            self.log(f"🧩 백엔드 클러스터 {cluster.label}: 혼합 추정 대비 {self.backend_shift*1000:+.2f}ms "
+                                    f"(±{cluster.stability*1000:.1f}ms, {cluster.samples}개, "
+                                    f"클러스터 {len(self.backend_clusters)}개 중)")
+                        
+                        # 목표 시각의 오프셋 예측 (칼만 필터 예측과 NTP/HTTP 소스 구간의 결합)
+                        target_offset, target_uncertainty = self.predict_offset_at(target_timestamp)
+                        self.log(f"📉 목표 시각 오프셋: {target_offset*1000:+.2f}ms ±{target_uncertainty*1000:.2f}ms "
+                                f"(현재 추정 대비 {(target_offset - self.server_time_offset)*1000:+.2f}ms)")
+                        if self.last_combined is not None:
+                            self.log_combined_sources(self.last_combined)
+                        # 발사용 오프셋은 지역 변수로만 사용 (공유 추정값을 덮어쓰면 다음 실행에서
+                        # 목표 시각 외삽과 백엔드 보정이 이미 반영된 값에 다시 더해짐)
+                        fire_offset, fire_uncertainty = target_offset, target_uncertainty
+                        
+                        # 경로 비대칭: 오프셋은 RTT/2 가정(HTTP) 기준이므로 실제 오프셋과 전방 단방향 지연으로 환산
+                        forward_delay = self.path_asymmetry.forward_delay(self.active_host, 2 * fire_latency)
+                        path_bias = forward_delay - fire_latency
+                        true_offset = fire_offset - path_bias
+                        if path_bias != 0:
+                            self.log(f"🔀 경로 비대칭 반영: 전방 지연 {forward_delay*1000:.1f}ms "
+                                    f"(RTT/2 대비 {path_bias*1000:+.1f}ms)")
+                        self.log(f"정밀 타이밍 모드 진입! (네트워크지연: {fire_latency*1000:.1f}ms, 클릭실행시간: 500ms)")
                         self.log(f"⏰ 진입 기준: {(self.network_latency + 0.70 + 0.1)*1000:.0f}ms 전")
                         
                         # 이전 실행 결과를 바탕으로 동적 조정 (더 강력하게)
@@ -1752,6 +2659,15 @@ class TimeSyncMacroGUI:
                         # 목표: 서버에 10ms 늦게 도착하도록 설정
                         target_arrival_delay_ms = 10 + adjustment
                         target_arrival_delay_ms = max(5, min(20, target_arrival_delay_ms))  # 5~20ms 범위
+                        
+                        # 오프셋 불확실성 반영: 도착 범위 [지연-u, 지연+u]가 0~20ms 안에 들도록 조정
+                        if fire_uncertainty > 0:
+                            uncertainty_ms = fire_uncertainty * 1000
+                            if uncertainty_ms <= 10:
+                                target_arrival_delay_ms = max(uncertainty_ms, min(20 - uncertainty_ms, target_arrival_delay_ms))
+                            else:
+                                target_arrival_delay_ms = 10
+                            self.log(f"📏 오프셋 불확실성 ±{uncertainty_ms:.1f}ms 반영 → 목표 도착 지연 {target_arrival_delay_ms:.1f}ms")
                         target_arrival_delay = target_arrival_delay_ms / 1000.0
                         
                         # 실제 측정된 클릭 실행 시간 반영 및 동적 조정
@@ -1784,10 +2700,11 @@ class TimeSyncMacroGUI:
                         target_arrival_time = target_timestamp + target_arrival_delay
                         
                         # 적응형 최적화된 클릭 타이밍 계산
-                        optimal_click_time, time_until_click = self.get_optimized_click_timing(target_arrival_time)
+                        optimal_click_time, time_until_click = self.get_optimized_click_timing(
+                            target_arrival_time, fire_predicted_latency or fire_latency)
                         
                         # 기존 방식과 비교를 위한 로그
-                        traditional_click_time = target_arrival_time - self.network_latency - click_execution_time - self.server_time_offset
+                        traditional_click_time = target_arrival_time - forward_delay - click_execution_time - true_offset
                         
                         self.log(f"🎯 적응형 타이밍 시스템:")
                         self.log(f"   기존 방식: {datetime.fromtimestamp(traditional_click_time).strftime('%H:%M:%S.%f')[:-3]}")
@@ -1795,6 +2712,21 @@ class TimeSyncMacroGUI:
                         self.log(f"   개선 시간: {(optimal_click_time - traditional_click_time)*1000:+.1f}ms")
                         
                         precise_target_time = optimal_click_time
+                        required_server_click_time = precise_target_time + true_offset
+                        
+                        # 지연/실행시간/깨어남 오차/오프셋 오차 분포로 P(0≤도착-목표≤20ms) 최대 발사 시각 계산
+                        fire_plan = self.plan_fire_time(forward_delay, click_execution_time, fire_uncertainty,
+                                                        latency_spread, fire_latency)
+                        if fire_plan is not None:
+                            current_probability = self.fire_optimizer.probability(target_timestamp - required_server_click_time)
+                            self.log(f"🎯 발사 시각 최적화: 도착 확률 {current_probability*100:.1f}% → "
+                                    f"{fire_plan.probability*100:.1f}% (목표 {fire_plan.lead*1000:.1f}ms 전 발사, "
+                                    f"예상 도착 +{fire_plan.expected_delay*1000:.1f}ms, "
+                                    f"계산 {fire_plan.elapsed*1e6:.0f}μs)")
+                            if fire_plan.probability > current_probability:
+                                precise_target_time = target_timestamp - fire_plan.lead - true_offset
+                                required_server_click_time = precise_target_time + true_offset
+                                target_arrival_delay_ms = fire_plan.expected_delay * 1000
                         
                         # 안전 검증
                         current_local_time = time.time()
@@ -1802,17 +2734,37 @@ class TimeSyncMacroGUI:
                             self.log("⚠️ 경고: 계산된 클릭 시간이 이미 지났습니다!")
                             # 최소 지연으로 즉시 실행
                             precise_target_time = current_local_time + 0.001
-                            required_server_click_time = precise_target_time + self.server_time_offset
-                            target_arrival_time = required_server_click_time + self.network_latency + click_execution_time
+                            required_server_click_time = precise_target_time + true_offset
+                            target_arrival_time = required_server_click_time + forward_delay + click_execution_time
                         
                         # 예상 도착 시간 계산 검증
-                        predicted_arrival = required_server_click_time + click_execution_time + self.network_latency
+                        predicted_arrival = required_server_click_time + click_execution_time + forward_delay
                         
                         self.log(f"🎯 클릭 목표 시간 (서버): {datetime.fromtimestamp(required_server_click_time).strftime('%H:%M:%S.%f')[:-3]}")
                         self.log(f"📡 예상 도착 시간 (서버): {datetime.fromtimestamp(predicted_arrival).strftime('%H:%M:%S.%f')[:-3]}")
                         self.log(f"⏱️ 목표 도착 지연: +{target_arrival_delay_ms:.1f}ms")
                         
+                        # 부트스트랩 도착 분포로 condition1/condition2 (0~20ms) 안에 들 확률 추정
+                        recent_times = self.execution_time_history[-10:]
+                        execution_errors = ([t - click_execution_time for t in recent_times]
+                                            if len(recent_times) >= 3 else ())
+                        window_probability, arrival_interval = self.sync_bootstrap.window_probability(
+                            predicted_arrival - target_timestamp, 0.0, 0.020,
+                            offset_bound=fire_uncertainty or None, execution_errors=execution_errors)
+                        if window_probability is not None:
+                            self.log(f"🎲 0~20ms 도착 확률: {window_probability*100:.1f}% "
+                                    f"({int(arrival_interval.level*100)}% 도착 구간 "
+                                    f"{arrival_interval.lo*1000:+.1f}~{arrival_interval.hi*1000:+.1f}ms)")
+                            self.logger.info(f"도착 확률 P(0≤도착-목표≤20ms) = {window_probability:.4f}, "
+                                           f"계획 {(predicted_arrival - target_timestamp)*1000:+.3f}ms, "
+                                           f"구간 [{arrival_interval.lo*1000:+.3f}, {arrival_interval.hi*1000:+.3f}]ms "
+                                           f"(오프셋 ±{fire_uncertainty*1000:.3f}ms, "
+                                           f"실행시간 편차 {len(execution_errors)}개)")
+                        
                         # 정밀한 busy wait (로컬 시간 기준)
+                        # 대기 중 발사 계획 입력(동기화 부트스트랩, 실행시간/깨어남 오차 기록)이 바뀌면
+                        # 마지막 10ms 전까지 다시 계획 (입력이 그대로면 같은 결과라 다시 계산하지 않음)
+                        plan_inputs = self.fire_plan_inputs()
                         while True:
                             current_local_time = time.time()
                             remaining = precise_target_time - current_local_time
@@ -1820,6 +2772,26 @@ class TimeSyncMacroGUI:
                             if remaining <= 0:
                                 break
                             
+                            current_inputs = self.fire_plan_inputs() if remaining > 0.01 else plan_inputs
+                            if self.fire_plan_changed(plan_inputs, current_inputs):
+                                plan_inputs = current_inputs
+                                replanned = self.plan_fire_time(forward_delay, click_execution_time, fire_uncertainty,
+                                                                latency_spread, fire_latency)
+                                if replanned is not None:
+                                    candidate_time = target_timestamp - replanned.lead - true_offset
+                                    current_probability = self.fire_optimizer.probability(
+                                        target_timestamp - required_server_click_time)
+                                    if (replanned.probability > current_probability
+                                            and candidate_time - time.time() > 0.002):
+                                        self.log(f"🎯 발사 시각 재계획: 도착 확률 {current_probability*100:.1f}% → "
+                                                f"{replanned.probability*100:.1f}% "
+                                                f"({(candidate_time - precise_target_time)*1000:+.1f}ms 이동)")
+                                        fire_plan = replanned
+                                        precise_target_time = candidate_time
+                                        required_server_click_time = precise_target_time + true_offset
+                                        target_arrival_delay_ms = replanned.expected_delay * 1000
+                                continue
+                            
                             # 매우 정밀한 대기 전략
                             if remaining <= 0.0005:  # 0.5ms 이하 - 순수 busy wait
                                 continue
@@ -1828,12 +2800,15 @@ class TimeSyncMacroGUI:
                             elif remaining <= 0.01:  # 10ms 이하 - 짧은 슬립
                                 time.sleep(remaining * 0.3)  # 남은 시간의 30%만 슬립
                             else:
-                                sleep_time = remaining - 0.003  # 3ms 여유
+                                # 3ms 여유, 재계획 확인을 위해 최대 50ms씩 나눠 대기
+                                sleep_time = min(remaining - 0.003, 0.05)
                                 if sleep_time > 0:
                                     self.precise_sleep(sleep_time)
                         
                         # 정확한 실행 시간 기록
                         execution_start_time = time.time()
+                        self.wake_error_history.append(execution_start_time - precise_target_time)
+                        del self.wake_error_history[:-20]
                         
                         self.log("� 정밀 클릭 실행!")
                         
@@ -1845,8 +2820,8 @@ class TimeSyncMacroGUI:
                         actual_execution_time = execution_end_time - execution_start_time
                         
                         # 정확한 서버 시간 계산
-                        actual_server_click_time = execution_start_time + self.server_time_offset
-                        actual_arrival_time = actual_server_click_time + actual_execution_time + self.network_latency
+                        actual_server_click_time = execution_start_time + true_offset
+                        actual_arrival_time = actual_server_click_time + actual_execution_time + forward_delay
                         
                         # 시간 차이 계산 (ms 단위)
                         click_delay_ms = (actual_server_click_time - target_timestamp) * 1000
@@ -1858,7 +2833,7 @@ class TimeSyncMacroGUI:
                         self.log(f"  실제 클릭(서버): {actual_server_click_time:.3f}")  
                         self.log(f"  실제 도착(예상): {actual_arrival_time:.3f}")
                         self.log(f"  클릭 실행시간: {actual_execution_time:.3f}s")
-                        self.log(f"  네트워크 지연: {self.network_latency:.3f}s")
+                        self.log(f"  네트워크 지연: {fire_latency:.3f}s (전방 {forward_delay:.3f}s)")
                         
                         # 결과 검증
                         timing_status = "🔴 타이밍 오류"
@@ -1891,7 +2866,7 @@ class TimeSyncMacroGUI:
                         condition2 = arrival_delay_ms <= 20
                         
                         # 상세 조건 분석
-                        expected_click_time = target_timestamp - 0.500 - self.network_latency - 0.010  # 500ms + 네트워크지연 + 10ms 여유
+                        expected_click_time = target_timestamp - 0.500 - fire_latency - 0.010  # 500ms + 네트워크지연 + 10ms 여유
                         actual_click_difference = actual_server_click_time - expected_click_time
                         
                         self.log(f"📊 타이밍 분석:")
@@ -1923,8 +2898,8 @@ class TimeSyncMacroGUI:
                             'actual_execution_time': actual_execution_time,
                             'click_delay_ms': click_delay_ms,
                             'arrival_delay_ms': arrival_delay_ms,
-                            'network_latency_used': self.network_latency,
-                            'predicted_latency_used': self.predicted_latency,
+                            'network_latency_used': fire_latency,
+                            'predicted_latency_used': fire_predicted_latency,
                             'success': condition1 and condition2,
                             'timestamp': time.time()
                         }
@@ -1977,14 +2952,16 @@ class TimeSyncMacroGUI:
                             'click_delay_ms': click_delay_ms,
                             'arrival_delay_ms': arrival_delay_ms,
                             'network_latency_ms': self.network_latency * 1000,
-                            'server_time_offset_ms': self.server_time_offset * 1000,
+                            'server_time_offset_ms': fire_offset * 1000,
                             'timing_status': timing_status,
                             'condition1_pass': condition1,
                             'condition2_pass': condition2,
                             'adjustment_used_ms': adjustment,
                             'target_arrival_delay_ms': target_arrival_delay_ms,
                             'predicted_execution_time_ms': click_execution_time * 1000,
-                            'actual_vs_predicted_execution_diff_ms': (actual_execution_time - click_execution_time) * 1000
+                            'actual_vs_predicted_execution_diff_ms': (actual_execution_time - click_execution_time) * 1000,
+                            'predicted_window_probability': window_probability,
+                            'fire_plan': fire_plan._asdict() if fire_plan is not None else None
                         }
                         
                         self.logger.info("="*60)
@@ -2039,6 +3016,8 @@ class TimeSyncMacroGUI:
                 
             finally:
                 self.is_running = False
+                self.backend_shift = 0
+                self.clock_tracker.resume()
                 self.start_button.config(state=tk.NORMAL)
                 self.stop_button.config(state=tk.DISABLED)
         
@@ -2286,6 +3265,11 @@ class TimeSyncMacroGUI:
                 self.save_cumulative_data()
                 self.log("💾 누적 동기화 데이터 저장 완료")
             
+            # 시계 추적, 측정 엔진 및 keep-alive 연결 정리
+            self.clock_tracker.stop()
+            self.probe_engine.close()
+            self.probe_transport.close()
+            
             # 키보드 리스너 정리
             if hasattr(self, 'position_listener') and self.position_listener:
                 try:
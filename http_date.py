@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP Date 헤더 고속 파서 (RFC 7231 7.1.1.1)
+- IMF-fixdate:  Sun, 06 Nov 1994 08:49:37 GMT
+- RFC 850:      Sunday, 06-Nov-94 08:49:37 GMT
+- asctime:      Sun Nov  6 08:49:37 1994
+- 기존 코드 호환: 요일 없는 형식(06 Nov 1994 08:49:37 GMT), 소수 초(08:49:37.123 GMT)
+
+정규식을 미리 컴파일하고 datetime 객체를 만들지 않고 바로 epoch 초(int)를 계산함
+Date 헤더는 1초에 한 번만 바뀌므로 헤더 문자열별 결과를 캐시함
+"""
+
+import re
+import time
+from functools import lru_cache
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+# IMF-fixdate (요일 생략, 소수 초 허용)
+_IMF_FIXDATE = re.compile(
+    r'(?:[A-Za-z]{3}, )?(\d{1,2}) ([A-Za-z]{3}) (\d{4}) (\d{2}):(\d{2}):(\d{2})(\.\d+)? (?:GMT|UTC)$')
+# RFC 850 (2자리 연도)
+_RFC850 = re.compile(
+    r'[A-Za-z]+, (\d{2})-([A-Za-z]{3})-(\d{2}) (\d{2}):(\d{2}):(\d{2}) GMT$')
+# ANSI C asctime()
+_ASCTIME = re.compile(
+    r'[A-Za-z]{3} ([A-Za-z]{3}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2}) (\d{4})$')
+
+
+def _days_from_civil(year, month, day):
+    """1970-01-01 기준 일수 (proleptic 그레고리력)"""
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _epoch(year, month, day, hour, minute, second):
+    return ((_days_from_civil(year, month, day) * 24 + hour) * 60 + minute) * 60 + second
+
+
+@lru_cache(maxsize=64)
+def parse_http_date(value):
+    """HTTP Date 헤더를 UTC epoch 초로 변환
+
+    Returns:
+        int: epoch 초 (소수 초가 포함된 비표준 헤더는 float), 파싱 실패 시 None
+    """
+    value = value.strip()
+
+    match = _IMF_FIXDATE.match(value)
+    if match:
+        day, month_name, year, hour, minute, second, fraction = match.groups()
+        month = _MONTHS.get(month_name.title())
+        if month is None:
+            return None
+        epoch = _epoch(int(year), month, int(day), int(hour), int(minute), int(second))
+        return epoch + float(fraction) if fraction else epoch
+
+    match = _RFC850.match(value)
+    if match:
+        day, month_name, year, hour, minute, second = match.groups()
+        month = _MONTHS.get(month_name.title())
+        if month is None:
+            return None
+        # RFC 7231: 50년 넘게 미래로 보이는 2자리 연도는 지난 세기로 해석
+        current_year = time.gmtime().tm_year
+        year = current_year - current_year % 100 + int(year)
+        if year > current_year + 50:
+            year -= 100
+        return _epoch(year, month, int(day), int(hour), int(minute), int(second))
+
+    match = _ASCTIME.match(value)
+    if match:
+        month_name, day, hour, minute, second, year = match.groups()
+        month = _MONTHS.get(month_name.title())
+        if month is None:
+            return None
+        return _epoch(int(year), month, int(day), int(hour), int(minute), int(second))
+
+    return None
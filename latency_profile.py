@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간대별 지연 모델 (대상 호스트 x 하루 중 시간대 구간)
+- 인기 판매 시각에는 대상 사이트 지연이 크게 늘어나는데, 발사에 쓰는 지연은 그보다 앞선 동기화나
+  전체 누적 중앙값에서 오므로 목표 시각의 혼잡을 반영하지 못함
+- 누적 측정의 로컬 시각을 bucket_minutes 단위 시간대로 나눠 호스트별로 P² 사분위수를 유지하고
+  목표 시각이 속한 시간대의 지연 분포(중앙값, Q1, Q3)를 예측
+- 시간대 표본이 모자라면 이웃 시간대(±1)를 합치고, 그래도 모자라면 호스트 전체 분포로 대체
+- 측정 하나당 O(1) 갱신, 예측은 (호스트, 시간대)별로 캐시하고 그 호스트에 측정이 들어오면 무효화
+"""
+
+from collections import namedtuple
+from datetime import datetime
+
+from streaming_quantiles import Quartiles
+
+LatencyForecast = namedtuple('LatencyForecast', [
+    'median', 'q1', 'q3',
+    'samples',  # 예측에 쓴 측정 수
+    'bucket',   # 목표 시각의 시간대 번호 (0 = 자정부터 bucket_minutes분)
+    'source',   # 'bucket' 해당 시간대, 'neighbors' 이웃 시간대 포함, 'host' 호스트 전체
+])
+
+
+class TimeOfDayLatencyModel:
+    """호스트별 하루 중 시간대 지연 분포"""
+
+    def __init__(self, bucket_minutes=30, min_samples=8):
+        if 1440 % bucket_minutes:
+            raise ValueError("시간대 길이는 하루(1440분)를 나누어떨어지게 해야 합니다")
+        self.bucket_minutes = bucket_minutes
+        self.min_samples = min_samples  # 이보다 적으면 이웃 시간대/호스트 전체로 대체
+        self._buckets = {}   # {host: {bucket: Quartiles}}
+        self._overall = {}   # {host: Quartiles}
+        self._versions = {}  # {host: 측정 반영 횟수} (캐시 무효화용)
+        self._cache = {}     # {(host, bucket): (version, LatencyForecast)}
+
+    @property
+    def bucket_count(self):
+        return 1440 // self.bucket_minutes
+
+    def bucket_of(self, timestamp):
+        """로컬 시각 기준 시간대 번호"""
+        moment = datetime.fromtimestamp(timestamp)
+        return (moment.hour * 60 + moment.minute) // self.bucket_minutes
+
+    def bucket_label(self, bucket):
+        start = bucket * self.bucket_minutes
+        return f"{start // 60:02d}:{start % 60:02d}"
+
+    def add(self, host, latency, timestamp):
+        """측정 하나 반영 (지연이 없는 측정은 무시)"""
+        if latency <= 0:
+            return
+        bucket = self.bucket_of(timestamp)
+        self._buckets.setdefault(host, {}).setdefault(bucket, Quartiles()).add(latency)
+        self._overall.setdefault(host, Quartiles()).add(latency)
+        self._versions[host] = self._versions.get(host, 0) + 1
+
+    def rebuild(self, records):
+        """누적 측정 기록 전체로 다시 구성 (저장된 모델이 없던 이전 형식 데이터)"""
+        self._buckets.clear()
+        self._overall.clear()
+        self._versions.clear()
+        self._cache.clear()
+        for m in sorted(records, key=lambda m: m.get('timestamp', 0)):
+            if 'timestamp' in m:
+                self.add(m.get('host', ''), m.get('latency', 0), m['timestamp'])
+
+    def predict(self, host, timestamp):
+        """timestamp 시각의 지연 분포 예측
+
+        Returns:
+            LatencyForecast 또는 호스트 측정이 없으면 None
+        """
+        if host not in self._overall:
+            return None
+        bucket = self.bucket_of(timestamp)
+        version = self._versions.get(host, 0)
+        cached = self._cache.get((host, bucket))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        forecast = self._forecast(host, bucket)
+        self._cache[(host, bucket)] = (version, forecast)
+        return forecast
+
+    def _forecast(self, host, bucket):
+        buckets = self._buckets.get(host, {})
+        own = buckets.get(bucket)
+        if own is not None and own.count >= self.min_samples:
+            return self._summarize([own], bucket, 'bucket')
+        n = self.bucket_count
+        nearby = [buckets[b] for b in ((bucket - 1) % n, bucket, (bucket + 1) % n) if b in buckets]
+        if sum(q.count for q in nearby) >= self.min_samples:
+            return self._summarize(nearby, bucket, 'neighbors')
+        return self._summarize([self._overall[host]], bucket, 'host')
+
+    @staticmethod
+    def _summarize(parts, bucket, source):
+        """여러 시간대는 측정 수 가중 평균으로 합침 (P² 마커는 정확히 병합할 수 없으므로 근사)"""
+        total = sum(q.count for q in parts)
+        median = sum(q.median.value * q.count for q in parts) / total
+        q1 = sum(q.q1.value * q.count for q in parts) / total
+        q3 = sum(q.q3.value * q.count for q in parts) / total
+        return LatencyForecast(median, q1, q3, total, bucket, source)
+
+    def profile(self, host):
+        """호스트의 시간대별 (시간대 번호, 측정 수, 중앙값) 목록 (로그용)"""
+        return [(bucket, q.count, q.median.value)
+                for bucket, q in sorted(self._buckets.get(host, {}).items())]
+
+    def to_dict(self):
+        """누적 데이터 저장용"""
+        return {
+            'bucket_minutes': self.bucket_minutes,
+            'min_samples': self.min_samples,
+            'hosts': {host: {str(bucket): q.to_dict() for bucket, q in buckets.items()}
+                      for host, buckets in self._buckets.items()},
+            'overall': {host: q.to_dict() for host, q in self._overall.items()},
+            'versions': dict(self._versions),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        model = cls(data.get('bucket_minutes', 30), data.get('min_samples', 8))
+        for host, buckets in data.get('hosts', {}).items():
+            model._buckets[host] = {int(bucket): Quartiles.from_dict(q) for bucket, q in buckets.items()}
+        for host, q in data.get('overall', {}).items():
+            model._overall[host] = Quartiles.from_dict(q)
+        # 반영 횟수가 없는 이전 저장 데이터는 호스트 전체 표본 수로 대신함
+        versions = data.get('versions') or {host: q.count for host, q in model._overall.items()}
+        model._versions = {host: int(version) for host, version in versions.items()}
+        return model
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+경로 비대칭 보정
+- HTTP 오프셋 공식은 단방향 지연 = RTT/2를 가정하므로, 상향/하향 경로가 비대칭이면
+  표본을 아무리 모아도 없어지지 않는 편향 b = (전방 지연 - RTT/2)가 남음
+- 대상 서버 시계가 NTP로 맞춰져 있다고 보면 HTTP 오프셋 - NTP 오프셋 = b 이므로,
+  두 측정을 비교해 호스트별 전방/복귀 지연 비율을 추정
+- 비율은 RTT가 바뀌어도 쓸 수 있도록 전방 지연 / RTT 로 저장 (0~1)
+"""
+
+import time
+
+
+class PathAsymmetryCalibrator:
+    """호스트별 전방/복귀 지연 비율 저장소"""
+
+    def __init__(self, history=10):
+        self.history = history  # 호스트별로 유지하는 최근 보정 결과 수
+        self._hosts = {}
+
+    def add(self, host, http_offset, ntp_offset, rtt, uncertainty, at=None):
+        """보정 측정 하나 반영
+
+        Args:
+            http_offset: 대상 서버 HTTP 오프셋 (RTT/2 가정)
+            ntp_offset: 같은 시점의 NTP 오프셋
+            rtt: HTTP 왕복 지연
+            uncertainty: 두 오프셋의 오차 한계 합
+
+        Returns:
+            dict: 반영한 보정 결과, 편향이 물리적으로 불가능하면(서버 시계가 NTP와 다름) None
+        """
+        bias = http_offset - ntp_offset
+        if rtt <= 0 or abs(bias) > rtt / 2 + uncertainty:
+            return None
+        forward = min(max(rtt / 2 + bias, 0.0), rtt)
+        entry = {
+            'forward_fraction': forward / rtt,
+            'bias': bias,
+            'rtt': rtt,
+            'uncertainty': uncertainty,
+            'at': time.time() if at is None else at,
+        }
+        entries = self._hosts.setdefault(host, [])
+        entries.append(entry)
+        del entries[:-self.history]
+        return entry
+
+    def get(self, host):
+        """호스트 보정값 (오차 한계 역제곱 가중 평균), 보정 기록이 없으면 None
+
+        Returns:
+            dict: forward_fraction, uncertainty(비율 단위), samples, updated_at
+        """
+        entries = self._hosts.get(host)
+        if not entries:
+            return None
+        weights = [1.0 / max(e['uncertainty'] / e['rtt'], 1e-3) ** 2 for e in entries]
+        total = sum(weights)
+        fraction = sum(w * e['forward_fraction'] for w, e in zip(weights, entries)) / total
+        return {
+            'forward_fraction': fraction,
+            'uncertainty': total ** -0.5,
+            'samples': len(entries),
+            'updated_at': entries[-1]['at'],
+        }
+
+    def forward_delay(self, host, rtt):
+        """RTT에 대한 전방(로컬 -> 서버) 단방향 지연, 보정 전이면 RTT/2"""
+        calibration = self.get(host)
+        if calibration is None:
+            return rtt / 2
+        return calibration['forward_fraction'] * rtt
+
+    def bias(self, host, rtt):
+        """RTT/2 가정 대비 전방 지연 편향 (HTTP 오프셋 - 실제 오프셋)"""
+        return self.forward_delay(host, rtt) - rtt / 2
+
+    def to_dict(self):
+        """누적 데이터 저장용"""
+        return {host: list(entries) for host, entries in self._hosts.items()}
+
+    @classmethod
+    def from_dict(cls, data, history=10):
+        calibrator = cls(history)
+        for host, entries in data.items():
+            calibrator._hosts[host] = list(entries)[-history:]
+        return calibrator
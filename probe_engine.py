@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio 기반 시간 측정 엔진
+- 여러 측정 요청을 동시에 진행 (in-flight)
+- 각 요청을 지정한 로컬 시각(perf_counter 기준)에 정확히 발사
+- 결과가 도착하는 순서대로 추정기에 전달
+- 관찰자(observer)를 등록하면 어떤 전략이 발사했든 모든 측정 결과를 받아볼 수 있음
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from probe_transport import get_shared_transport
+
+
+class ProbeEngine:
+    """예약된 시각에 측정 요청을 발사하는 asyncio 엔진
+
+    이벤트 루프는 별도 데몬 스레드에서 돌고, 실제 송수신은 keep-alive
+    전송 계층을 사용하는 작업 스레드에서 수행됨
+    """
+
+    SPIN_MARGIN = 0.002  # 발사 2ms 전부터는 작업 스레드에서 busy wait
+
+    def __init__(self, transport=None, max_in_flight=8):
+        self.transport = transport or get_shared_transport()
+        self.max_in_flight = max_in_flight
+        self._observers = []
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight,
+                                            thread_name_prefix='probe')
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout=None):
+        """다른 스레드(GUI, 매크로 스레드)에서 코루틴을 실행하고 결과 대기"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def prepare(self, url, connections=None):
+        """동시 측정에 필요한 만큼 keep-alive 연결을 미리 확보"""
+        return self.transport.warm_up(url, connections or self.max_in_flight)
+
+    def add_observer(self, callback):
+        """모든 성공한 측정 결과를 callback(url, result)로 전달 (작업 스레드에서 호출됨)"""
+        self._observers.append(callback)
+
+    def _probe_blocking(self, url, fire_at, address=None, method='HEAD'):
+        """작업 스레드: 발사 시각까지 busy wait 후 측정"""
+        if fire_at is not None:
+            while time.perf_counter() < fire_at:
+                time.sleep(0)
+        result = self.transport.probe(url, address, method)
+        result['fire_at'] = fire_at
+        if fire_at is not None:
+            result['fire_error'] = result['phases_ns']['request_start'] / 1e9 - fire_at
+        else:
+            result['fire_error'] = 0
+        for callback in self._observers:
+            try:
+                callback(url, result)
+            except Exception:
+                pass  # 관찰자 오류가 측정을 실패시키지 않도록
+        return result
+
+    async def probe_at(self, url, fire_at=None, address=None, method='HEAD'):
+        """지정한 perf_counter 시각에 측정 요청 발사 (None이면 즉시, address 지정 시 해당 엣지로)"""
+        if fire_at is not None:
+            coarse = fire_at - self.SPIN_MARGIN - time.perf_counter()
+            if coarse > 0:
+                await asyncio.sleep(coarse)
+        return await self._loop.run_in_executor(self._executor, self._probe_blocking,
+                                                url, fire_at, address, method)
+
+    def schedule(self, url, fire_times, method='HEAD'):
+        """여러 발사 시각을 한 번에 예약하고 Task 목록 반환 (발사 순서 유지)"""
+        return [asyncio.ensure_future(self.probe_at(url, fire_at, method=method))
+                for fire_at in fire_times]
+
+    async def stream(self, url, fire_times, method='HEAD'):
+        """예약한 측정 결과를 도착 순서대로 전달
+
+        Yields:
+            (index, result): index는 fire_times 내 순서, 실패한 측정은 result가 예외 객체
+        """
+        tasks = self.schedule(url, fire_times, method)
+        index_of = {task: i for i, task in enumerate(tasks)}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=index_of.get):
+                    error = task.exception()
+                    yield index_of[task], (error if error else task.result())
+        finally:
+            # 소비자가 중간에 멈추면 아직 발사되지 않은 측정은 취소
+            for task in pending:
+                task.cancel()
+
+    def close(self):
+        """이벤트 루프와 작업 스레드 정리"""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._executor.shutdown(wait=False)
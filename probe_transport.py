@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간 측정용 HTTP 전송 계층
+- 호스트별 keep-alive 연결을 미리 맺어두고 모든 샘플러가 재사용
+- 측정되는 왕복시간(RTT)은 요청 전송 시작 ~ 응답 첫 바이트 구간 (DNS, TCP, TLS, 헤더 수신 제외)
+  전송 완료 시각은 send 후 GIL 재획득이 늦어지면 밀려 RTT를 과소 측정하므로 기준으로 쓰지 않음
+- 측정마다 단계별 나노초 타임스탬프 기록 (DNS/TCP/TLS/요청 전송/첫 바이트/헤더 완료)
+- DNS 조회 결과를 TTL 동안 캐시하고, TLS 세션을 저장해 재연결 시 핸드셰이크 단축
+- 호스트를 특정 엣지 주소(IP)에 고정해 모든 측정이 같은 서버로 가도록 할 수 있음
+- RawProbeTransport: 미리 직렬화한 HEAD 요청을 소켓에 직접 쓰고 상태줄/Date만 파싱
+  (send/recv 시스템 콜 바로 앞뒤에서 시각 기록, 기본 공유 전송 계층)
+"""
+
+import os
+import re
+import ssl
+import time
+import itertools
+import select
+import socket
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+
+# 단계별 타임스탬프 키 (perf_counter_ns 기준, 순서대로)
+PHASES = ('connect_start', 'dns_resolved', 'tcp_connected', 'tls_done',
+          'request_start', 'request_written', 'first_byte', 'headers_complete')
+
+# 연결 식별자: 실행마다 다른 접두어 + 일련번호 (누적 데이터에서 세션 간 충돌 방지)
+_RUN_TAG = os.urandom(3).hex()
+_connection_ids = itertools.count(1)
+
+
+def phase_durations_ms(phases_ns):
+    """단계별 타임스탬프를 구간별 소요시간(ms)으로 변환 (TLS 없는 연결은 tls 생략)"""
+    def span(start, end):
+        if phases_ns.get(start) is None or phases_ns.get(end) is None:
+            return None
+        return (phases_ns[end] - phases_ns[start]) / 1e6
+
+    return {
+        'dns': span('connect_start', 'dns_resolved'),
+        'tcp': span('dns_resolved', 'tcp_connected'),
+        'tls': span('tcp_connected', 'tls_done'),
+        'send': span('request_start', 'request_written'),
+        'wait': span('request_written', 'first_byte'),
+        'headers': span('first_byte', 'headers_complete'),
+    }
+
+
+class ResolverCache:
+    """getaddrinfo 결과를 TTL 동안 보관하는 DNS 캐시
+
+    getaddrinfo는 레코드의 실제 TTL을 알려주지 않으므로 고정 TTL을 사용
+    """
+
+    def __init__(self, ttl=60.0):
+        self.ttl = ttl
+        self._entries = {}  # (host, port) -> (만료 시각(monotonic), 주소 목록)
+        self._lock = threading.Lock()
+
+    def lookup(self, host, port):
+        """캐시된 주소 목록 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def resolve(self, host, port):
+        """주소 목록과 캐시 적중 여부 반환 (미스이면 조회 후 저장)"""
+        addresses = self.lookup(host, port)
+        if addresses is not None:
+            return addresses, True
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        with self._lock:
+            self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses, False
+
+    def prefetch(self, host, port):
+        """백그라운드 스레드에서 미리 조회 (URL 입력 직후 호출)"""
+        def worker():
+            try:
+                self.resolve(host, port)
+            except OSError:
+                pass
+        threading.Thread(target=worker, daemon=True).start()
+
+    def invalidate(self, host=None, port=None):
+        """캐시 항목 삭제 (인자가 없으면 전체)"""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                self._entries.pop((host, port), None)
+
+
+class ProbeConnection(http.client.HTTPConnection):
+    """연결 단계별 시각을 기록하는 HTTP(S) 연결"""
+
+    def __init__(self, host, port, timeout, ssl_context=None, resolver=None, tls_session=None,
+                 address=None):
+        super().__init__(host, port, timeout=timeout)
+        self.ssl_context = ssl_context
+        self.resolver = resolver
+        self.address = address  # 고정 연결할 IP (None이면 DNS 조회 결과 순서대로 시도)
+        self.tls_session = tls_session  # 재개할 TLS 세션 (세션 티켓)
+        self.connect_phases = {}
+        self.dns_cached = False
+        self.tls_resumed = False
+        self.remote_address = None
+        self.connection_id = f"{_RUN_TAG}:{next(_connection_ids)}"  # 같은 연결 = 같은 백엔드 힌트
+
+    def connect(self):
+        """DNS 조회 → TCP 연결 → TLS 핸드셰이크를 직접 수행하며 각 완료 시각 기록"""
+        phases = {'connect_start': time.perf_counter_ns()}
+        if self.address is not None:
+            # 숫자 주소는 DNS 조회 없이 sockaddr로 변환됨
+            addresses = socket.getaddrinfo(self.address, self.port, 0, socket.SOCK_STREAM,
+                                           0, socket.AI_NUMERICHOST)
+        elif self.resolver is not None:
+            addresses, self.dns_cached = self.resolver.resolve(self.host, self.port)
+        else:
+            addresses = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)
+        phases['dns_resolved'] = time.perf_counter_ns()
+
+        sock = None
+        last_error = None
+        for family, socktype, proto, _, sockaddr in addresses:
+            try:
+                sock = socket.socket(family, socktype, proto)
+                sock.settimeout(self.timeout)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.connect(sockaddr)
+                self.remote_address = sockaddr[0]
+                break
+            except OSError as e:
+                last_error = e
+                if sock is not None:
+                    sock.close()
+                    sock = None
+        if sock is None:
+            raise last_error or OSError(f"연결 실패: {self.host}:{self.port}")
+        phases['tcp_connected'] = time.perf_counter_ns()
+
+        if self.ssl_context is not None:
+            sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host,
+                                                session=self.tls_session)
+            phases['tls_done'] = time.perf_counter_ns()
+            self.tls_resumed = sock.session_reused
+        else:
+            phases['tls_done'] = None
+
+        self.sock = sock
+        self.connect_phases = phases
+
+
+class ProbeTransport:
+    """호스트별 keep-alive 연결 풀을 가진 시간 측정용 전송 계층"""
+
+    def __init__(self, timeout=3, max_idle_per_host=8, dns_ttl=60.0):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.ssl_context = ssl.create_default_context()
+        self.resolver = ResolverCache(dns_ttl)
+        self._idle = {}  # (scheme, host, port) -> 대기 중인 연결 목록
+        self._tls_sessions = {}  # (scheme, host, port, address) -> 마지막 TLS 세션
+        self._pinned = {}  # (scheme, host, port) -> 고정된 엣지 IP
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split_url(url):
+        """URL을 (연결 키, 요청 경로)로 분리"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'https'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        return (scheme, parts.hostname, port), path
+
+    def _pool_key(self, url, address=None):
+        """연결 풀 키 (scheme, host, port, address)와 요청 경로 반환
+
+        address를 지정하지 않으면 호스트에 고정된 엣지 주소 사용
+        """
+        key, path = self.split_url(url)
+        if address is None:
+            with self._lock:
+                address = self._pinned.get(key)
+        return key + (address,), path
+
+    def _new_connection(self, key, reuse_cache=True):
+        """새 연결 생성 및 즉시 연결 (DNS/TCP/TLS 비용은 여기서 지불)
+
+        reuse_cache가 False면 DNS 캐시와 저장된 TLS 세션을 쓰지 않음 (콜드 연결)
+        """
+        scheme, host, port, address = key
+        context = self.ssl_context if scheme == 'https' else None
+        with self._lock:
+            session = self._tls_sessions.get(key) if reuse_cache else None
+        conn = ProbeConnection(host, port, self.timeout, ssl_context=context,
+                               resolver=self.resolver if reuse_cache else None,
+                               tls_session=session, address=address)
+        conn.connect()
+        return conn
+
+    def resolve_all(self, url):
+        """호스트의 모든 A/AAAA 주소를 중복 없이 반환 (DNS 캐시 사용)"""
+        (_, host, port), _ = self.split_url(url)
+        addresses, _ = self.resolver.resolve(host, port)
+        unique = []
+        for _, _, _, _, sockaddr in addresses:
+            if sockaddr[0] not in unique:
+                unique.append(sockaddr[0])
+        return unique
+
+    def pin_address(self, url, address):
+        """호스트를 지정한 엣지 IP에 고정 (None이면 고정 해제)
+
+        다른 주소로 맺어둔 유휴 연결은 더 이상 쓰이지 않으므로 닫음
+        """
+        key, _ = self.split_url(url)
+        with self._lock:
+            if address is None:
+                self._pinned.pop(key, None)
+            else:
+                self._pinned[key] = address
+            stale = [pool_key for pool_key in self._idle
+                     if pool_key[:3] == key and pool_key[3] != address]
+            stale_conns = [conn for pool_key in stale for conn in self._idle.pop(pool_key)]
+        for conn in stale_conns:
+            conn.close()
+
+    def pinned_address(self, url):
+        """호스트에 고정된 엣지 IP (없으면 None)"""
+        key, _ = self.split_url(url)
+        with self._lock:
+            return self._pinned.get(key)
+
+    def _remember_session(self, key, conn):
+        """TLS 세션 저장 (TLS 1.3 세션 티켓은 첫 응답 이후 도착하므로 교환 후 호출)"""
+        session = getattr(conn.sock, 'session', None)
+        if session is not None:
+            with self._lock:
+                self._tls_sessions[key] = session
+
+    def prefetch(self, url):
+        """URL 호스트의 DNS 조회를 백그라운드에서 미리 수행"""
+        (_, host, port), _ = self.split_url(url)
+        if host:
+            self.resolver.prefetch(host, port)
+
+    def measure_reconnect(self, url):
+        """콜드(DNS 조회 + 전체 TLS 핸드셰이크) / 웜(DNS 캐시 + TLS 세션 재개) 재연결 비용 측정
+
+        Returns:
+            dict: cold/warm 각각 단계별 소요시간(ms)과 total, dns_cached, tls_resumed
+        """
+        key, path = self._pool_key(url)
+        timings = {}
+        for label, reuse_cache in (('cold', False), ('warm', True)):
+            conn = self._new_connection(key, reuse_cache=reuse_cache)
+            try:
+                # 세션 티켓 수신 및 연결 검증을 위해 한 번 교환
+                result = self._exchange(conn, path)
+                self._remember_session(key, conn)
+            except Exception:
+                conn.close()
+                raise
+            phases = conn.connect_phases
+            end = phases['tls_done'] if phases['tls_done'] is not None else phases['tcp_connected']
+            durations = phase_durations_ms(phases)
+            timings[label] = {
+                'dns': durations['dns'],
+                'tcp': durations['tcp'],
+                'tls': durations['tls'],
+                'total': (end - phases['connect_start']) / 1e6,
+                'dns_cached': conn.dns_cached,
+                'tls_resumed': conn.tls_resumed,
+            }
+            if result['will_close']:
+                conn.close()
+            else:
+                self._release(key, conn)
+        return timings
+
+    def _acquire(self, key):
+        """대기 중인 연결을 꺼내거나 새로 생성 (재사용 여부 함께 반환)"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key, conn):
+        """사용한 연결을 풀에 반환"""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def warm_up(self, url, connections=1, address=None):
+        """측정 전에 지정한 개수만큼 연결을 미리 맺어둠"""
+        key, _ = self._pool_key(url, address)
+        warmed = 0
+        for _ in range(connections):
+            try:
+                self._release(key, self._new_connection(key))
+                warmed += 1
+            except Exception:
+                break
+        return warmed
+
+    def _wait_first_byte(self, sock):
+        """응답 첫 바이트가 도착할 때까지 대기"""
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return
+        readable, _, _ = select.select([sock], [], [], self.timeout)
+        if not readable:
+            raise socket.timeout("응답 대기 시간 초과")
+
+    def _exchange(self, conn, path, method='HEAD'):
+        """요청/응답 교환을 단계별로 정밀 측정
+
+        RTT는 요청 전송 시작 ~ 응답 첫 바이트 구간만 사용 (헤더 수신/파싱 제외)
+        """
+        local_anchor = time.time()
+        request_start = time.perf_counter_ns()
+        conn.request(method, path, headers={'Cache-Control': 'no-cache'})
+        request_written = time.perf_counter_ns()
+        self._wait_first_byte(conn.sock)
+        first_byte = time.perf_counter_ns()
+        response = conn.getresponse()
+        headers_complete = time.perf_counter_ns()
+        body = response.read()  # HEAD 응답은 본문 없음, 연결 재사용을 위해 비움
+
+        phases_ns = dict(conn.connect_phases)
+        phases_ns.update({
+            'request_start': request_start,
+            'request_written': request_written,
+            'first_byte': first_byte,
+            'headers_complete': headers_complete,
+        })
+
+        def to_wall(t_ns):
+            return local_anchor + (t_ns - request_start) / 1e9
+
+        return {
+            'status': response.status,
+            'headers': response.headers,
+            'date': response.getheader('Date'),
+            'local_before': to_wall(request_start),
+            'local_after': to_wall(first_byte),
+            'perf_before': request_start / 1e9,
+            'perf_after': first_byte / 1e9,
+            'rtt': (first_byte - request_start) / 1e9,
+            'transaction_time': (headers_complete - request_start) / 1e9,
+            'phases_ns': phases_ns,
+            'body': body if method != 'HEAD' else None,
+            'will_close': response.will_close,
+        }
+
+    def probe(self, url, address=None, method='HEAD'):
+        """HEAD 요청 한 번으로 서버 시간 헤더와 RTT 측정 (address 지정 시 해당 엣지로)
+
+        본문에서 서버 시각을 읽어야 하는 경우(JSON 시간 API 등)에만 method='GET' 사용
+
+        Returns:
+            dict: status, headers, date, local_before/after(요청 전송 시작/첫 바이트 시각),
+                  perf_before/after, rtt, transaction_time, phases_ns, reused,
+                  dns_cached, tls_resumed, remote_address, connection_id, body(GET일 때)
+        """
+        key, path = self._pool_key(url, address)
+        conn, reused = self._acquire(key)
+
+        try:
+            result = self._exchange(conn, path, method)
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # 서버가 유휴 연결을 끊은 경우 새 연결로 한 번만 재시도
+            conn, reused = self._new_connection(key), False
+            try:
+                result = self._exchange(conn, path, method)
+            except Exception:
+                conn.close()
+                raise
+
+        if not reused:
+            self._remember_session(key, conn)
+        if result.pop('will_close'):
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        result['reused'] = reused
+        result['dns_cached'] = conn.dns_cached
+        result['tls_resumed'] = conn.tls_resumed
+        result['remote_address'] = conn.remote_address
+        result['connection_id'] = conn.connection_id
+        return result
+
+    def idle_connection_ids(self, url):
+        """호스트의 대기 연결 식별자 (마지막 항목이 다음 측정/발사에 쓰일 연결)"""
+        key, _ = self._pool_key(url)
+        with self._lock:
+            return [conn.connection_id for conn in self._idle.get(key, [])]
+
+    def close(self):
+        """모든 대기 연결 종료"""
+        with self._lock:
+            idle_lists = list(self._idle.values())
+            self._idle.clear()
+        for idle in idle_lists:
+            for conn in idle:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+_STATUS_LINE = re.compile(rb'HTTP/1\.([01]) (\d{3})')
+
+
+class RawHeaders:
+    """응답 헤더 블록에서 필요한 헤더만 그때그때 찾아 주는 최소 헤더 객체"""
+
+    def __init__(self, block):
+        self.block = block
+
+    def get(self, name, default=None):
+        match = re.search(rb'\r\n' + re.escape(name.encode('latin-1')) + rb':[ \t]*([^\r\n]*)',
+                          self.block, re.IGNORECASE)
+        return match.group(1).decode('latin-1').strip() if match else default
+
+    getheader = get
+
+
+class RawProbeTransport(ProbeTransport):
+    """http.client 대신 소켓에 직접 HEAD 요청을 쓰는 전송 계층
+
+    연결 관리(keep-alive 풀, DNS 캐시, TLS 세션, 엣지 고정)는 ProbeTransport와 같고
+    요청/응답 교환만 다름. 요청 바이트는 (host, port, path)별로 한 번만 만들어 두고,
+    시각은 sendall()/recv() 직전·직후에만 기록해 클라이언트 측 오버헤드를 측정에서 제외함
+    """
+
+    RECV_SIZE = 4096
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requests = {}  # (host, port, path, method) -> 직렬화된 요청 바이트
+
+    def _request_bytes(self, conn, path, method):
+        key = (conn.host, conn.port, path, method)
+        request = self._requests.get(key)
+        if request is None:
+            default_port = 443 if conn.ssl_context is not None else 80
+            host = conn.host if conn.port == default_port else f"{conn.host}:{conn.port}"
+            if ':' in conn.host:
+                host = f"[{conn.host}]" + (f":{conn.port}" if conn.port != default_port else "")
+            request = (f"{method} {path} HTTP/1.1\r\n"
+                       f"Host: {host}\r\n"
+                       f"Cache-Control: no-cache\r\n"
+                       f"Connection: keep-alive\r\n"
+                       f"\r\n").encode('latin-1')
+            self._requests[key] = request
+        return request
+
+    def _recv_more(self, sock, message):
+        """소켓에서 다음 바이트를 받음 (연결이 닫혔으면 message로 ConnectionError)"""
+        chunk = sock.recv(self.RECV_SIZE)
+        if not chunk:
+            raise ConnectionError(message)
+        return chunk
+
+    def _read_body(self, sock, headers, data):
+        """GET 응답 본문 수신 (Content-Length 또는 chunked)"""
+        length = headers.get('Content-Length')
+        if length is not None:
+            length = int(length)
+            while len(data) < length:
+                data += self._recv_more(sock, "응답 본문 수신 중 연결 종료")
+            return data[:length]
+
+        if 'chunked' not in (headers.get('Transfer-Encoding') or '').lower():
+            raise http.client.HTTPException("본문 길이를 알 수 없는 응답")
+
+        def read_line():
+            nonlocal data
+            while b'\r\n' not in data:
+                data += self._recv_more(sock, "응답 본문 수신 중 연결 종료")
+            line, _, data = data.partition(b'\r\n')
+            return line
+
+        # 청크: 크기 줄(16진수, ;확장 허용) + 데이터 + CRLF, 크기 0 청크 뒤에 트레일러와 빈 줄
+        body = []
+        while True:
+            size_line = read_line().split(b';')[0].strip()
+            try:
+                size = int(size_line, 16)
+            except ValueError:
+                raise http.client.HTTPException(f"잘못된 청크 크기: {size_line[:16]!r}") from None
+            if size == 0:
+                break
+            while len(data) < size + 2:
+                data += self._recv_more(sock, "응답 본문 수신 중 연결 종료")
+            body.append(data[:size])
+            data = data[size + 2:]
+        while read_line():
+            pass  # 트레일러 헤더는 사용하지 않음
+        return b''.join(body)
+
+    def _exchange(self, conn, path, method='HEAD'):
+        request = self._request_bytes(conn, path, method)
+        sock = conn.sock
+        if sock is None:
+            raise ConnectionError("연결이 닫혀 있음")
+
+        local_anchor = time.time()
+        request_start = time.perf_counter_ns()
+        sock.sendall(request)
+        request_written = time.perf_counter_ns()
+        data = self._recv_more(sock, "서버가 연결을 닫음")
+        first_byte = time.perf_counter_ns()
+        while True:
+            while b'\r\n\r\n' not in data:
+                data += self._recv_more(sock, "응답 헤더 수신 중 연결 종료")
+            status = _STATUS_LINE.match(data)
+            if status is None:
+                raise http.client.BadStatusLine(data[:32].decode('latin-1', 'replace'))
+            if not status.group(2).startswith(b'1'):
+                break
+            # 1xx 중간 응답(100 Continue, 103 Early Hints)은 건너뜀
+            # 서버 시각은 최종 응답 기준이므로 최종 응답을 따로 받았다면 그 도착 시각을 첫 바이트로 사용
+            data = data[data.index(b'\r\n\r\n') + 4:]
+            if not data:
+                data = self._recv_more(sock, "중간 응답 후 연결 종료")
+                first_byte = time.perf_counter_ns()
+        headers_complete = time.perf_counter_ns()
+
+        header_end = data.index(b'\r\n\r\n')
+        headers = RawHeaders(data[:header_end + 2])
+        body = None
+        if method != 'HEAD':
+            body = self._read_body(sock, headers, data[header_end + 4:])
+        connection = (headers.get('Connection') or '').lower()
+        will_close = 'close' in connection or (status.group(1) == b'0' and 'keep-alive' not in connection)
+
+        phases_ns = dict(conn.connect_phases)
+        phases_ns.update({
+            'request_start': request_start,
+            'request_written': request_written,
+            'first_byte': first_byte,
+            'headers_complete': headers_complete,
+        })
+
+        def to_wall(t_ns):
+            return local_anchor + (t_ns - request_start) / 1e9
+
+        return {
+            'status': int(status.group(2)),
+            'headers': headers,
+            'date': headers.get('Date'),
+            'local_before': to_wall(request_start),
+            'local_after': to_wall(first_byte),
+            'perf_before': request_start / 1e9,
+            'perf_after': first_byte / 1e9,
+            'rtt': (first_byte - request_start) / 1e9,
+            'transaction_time': (headers_complete - request_start) / 1e9,
+            'phases_ns': phases_ns,
+            'body': body,
+            'will_close': will_close,
+        }
+
+
+_shared_transport = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport():
+    """모든 샘플러가 공유하는 전송 계층 인스턴스 반환"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = RawProbeTransport()
+        return _shared_transport
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+최소 RTT 하한(envelope) 클럭 필터
+- NTP 클럭 필터처럼 큐잉 지연이 가장 적은 측정의 오프셋이 가장 정확하다는 점을 이용
+- 슬라이딩 윈도(시간 + 개수) 안에서 RTT 하한을 단조 deque로 O(1) 분할상환 추적
+- 각 오프셋은 하한과의 거리로 가중: 가중치 = 1 / (하한 초과분 + 정밀도)^2
+  (하한 +2ms 측정은 +40ms 측정보다 약 200배 큰 비중)
+"""
+
+import math
+import time
+from collections import deque, namedtuple
+
+EnvelopeEstimate = namedtuple('EnvelopeEstimate', [
+    'offset',             # 가중 평균 오프셋
+    'sigma',              # 가중 평균의 표준오차 추정 (1 / sqrt(가중치 합))
+    'floor',              # 사용한 RTT 하한
+    'effective_samples',  # 유효 표본 수 (가중치 합^2 / 가중치 제곱합)
+    'samples',
+])
+
+
+class RttEnvelopeFilter:
+    """RTT 하한을 추적하고 하한과의 거리로 오프셋을 가중 결합"""
+
+    def __init__(self, window=600.0, max_samples=256, precision=0.0005):
+        self.window = window            # 하한 추적 기간 (초), 경로가 바뀌면 이 시간 뒤 새 하한으로 교체
+        self.max_samples = max_samples  # 하한 추적 최대 측정 수
+        self.precision = precision      # 하한에 딱 붙은 측정도 이 정도 오차는 있다고 봄 (초)
+        self._minima = deque()  # (순번, 측정 시각, rtt), rtt 오름차순 유지
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, rtt, at=None):
+        """RTT 측정 하나를 윈도에 추가하고 현재 하한 반환"""
+        at = time.time() if at is None else at
+        while self._minima and self._minima[-1][2] >= rtt:
+            self._minima.pop()
+        self._minima.append((self._count, at, rtt))
+        self._count += 1
+        self._expire(at)
+        return self.floor()
+
+    def _expire(self, now):
+        oldest = self._count - self.max_samples
+        while self._minima and (self._minima[0][0] < oldest or self._minima[0][1] < now - self.window):
+            self._minima.popleft()
+
+    def floor(self):
+        """윈도 안의 RTT 하한 (측정이 없으면 None)"""
+        return self._minima[0][2] if self._minima else None
+
+    def weight(self, rtt, resolution=0.0):
+        """하한과의 거리에 따른 가중치 (서버 시각 해상도의 절반도 오차로 더함)"""
+        floor = self.floor()
+        excess = max(0.0, rtt - floor) if floor is not None else 0.0
+        distance = excess + self.precision + resolution / 2
+        return 1.0 / (distance * distance)
+
+    def combine(self, samples):
+        """[(오프셋, rtt, 해상도)] 측정을 하한 거리 가중으로 결합
+
+        측정은 미리 add()로 윈도에 넣어 둬야 하한에 반영됨
+
+        Returns:
+            EnvelopeEstimate 또는 측정이 없으면 None
+        """
+        if not samples:
+            return None
+        total = 0.0
+        total_sq = 0.0
+        weighted = 0.0
+        for offset, rtt, resolution in samples:
+            w = self.weight(rtt, resolution)
+            total += w
+            total_sq += w * w
+            weighted += w * offset
+        return EnvelopeEstimate(
+            offset=weighted / total,
+            sigma=1.0 / math.sqrt(total),
+            floor=self.floor(),
+            effective_samples=total * total / total_sq,
+            samples=len(samples),
+        )
@@ -8,12 +8,14 @@
 import time
 import threading
 import webbrowser
-from datetime import datetime, timezone
+from datetime import datetime
 from urllib.request import urlopen
 from urllib.parse import urljoin, urlparse
 import re
 import json
 
+from http_date import parse_http_date
+
 
 class SimpleTimeSyncMacro:
     def __init__(self):
@@ -46,13 +48,11 @@ class SimpleTimeSyncMacro:
                     # 서버 시간 추출
                     server_time_str = response.headers.get('Date')
                     if server_time_str:
-                        # RFC 2822 형식 파싱
-                        server_time = datetime.strptime(
-                            server_time_str, 
-                            '%a, %d %b %Y %H:%M:%S %Z'
-                        ).replace(tzinfo=timezone.utc)
+                        # RFC 7231 Date 헤더 파싱 (공용 고속 파서)
+                        server_timestamp = parse_http_date(server_time_str)
+                        if server_timestamp is None:
+                            raise ValueError(f"Date 헤더 형식 오류: {server_time_str}")
                         
-                        server_timestamp = server_time.timestamp()
                         local_timestamp = local_before + latency  # 네트워크 지연 보정
                         
                         offset = server_timestamp - local_timestamp
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간 소스 결합 (Marzullo 교집합 알고리즘)
+- 각 측정 방법(NTP 서버별, HTTP 초 전환, HTTP 다중 측정, 고해상도 추출기, 추적기)이
+  오프셋의 정답 구간 [lo, hi]를 제출
+- 가장 많은 소스가 겹치는 구간을 찾고, 그 구간과 겹치지 않는 소스는 falseticker로 표시
+- 대상 서버(HTTP) 소스는 authoritative: 발사 기준은 대상 서버 시계이므로 NTP 다수결보다 우선
+  (authoritative 소스 하나가 다른 소스 전체보다 큰 가중치를 가짐)
+- 제출 후 지난 시간만큼 로컬 시계 드리프트 허용치로 구간을 넓히고, 오래된 소스는 제외
+- 대상 서버 소스는 호스트(netloc)별로 보관하고 결합 시 대상 호스트 소스만 사용 (NTP 등은 호스트 무관)
+- 측정 스레드/추적 스레드가 제출하고 GUI/발사 스레드가 결합하므로 소스 목록은 잠금으로 보호
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+TimeSource = namedtuple('TimeSource', ['name', 'kind', 'lo', 'hi', 'authoritative', 'measured_at',
+                                       'host'],  # 대상 호스트 (None이면 호스트 무관 소스)
+                        defaults=(None,))
+
+CombinedInterval = namedtuple('CombinedInterval', [
+    'lo', 'hi',
+    'offset',        # 구간 중앙
+    'uncertainty',   # 구간 반폭
+    'truechimers',   # 결합 구간과 겹치는 소스 이름
+    'falsetickers',  # 겹치지 않는 소스 이름
+])
+
+
+def marzullo(intervals):
+    """가중치가 가장 큰 겹침 구간 찾기
+
+    Args:
+        intervals: [(lo, hi, weight)] 목록 (닫힌 구간)
+
+    Returns:
+        tuple: (lo, hi, 가중치 합) 또는 구간이 없으면 None
+    """
+    events = []
+    for lo, hi, weight in intervals:
+        events.append((lo, 0, weight))   # 같은 좌표에서는 시작을 끝보다 먼저 (닫힌 구간)
+        events.append((hi, 1, -weight))
+    events.sort()
+
+    best = None
+    current = 0
+    for i, (point, kind, delta) in enumerate(events):
+        current += delta
+        if kind == 0 and (best is None or current > best[2]):
+            # 다음 끝점까지가 현재 겹침 구간
+            end = next(p for p, k, _ in events[i + 1:] if k == 1)
+            best = (point, end, current)
+    return best
+
+
+class SourceCombiner:
+    """시간 소스 구간을 모아 결합 구간 계산"""
+
+    DRIFT_ALLOWANCE = 50e-6  # 제출 후 경과 시간당 구간 확장 (로컬 시계 드리프트 허용)
+
+    def __init__(self, max_age=1800.0):
+        self.max_age = max_age  # 이보다 오래된 소스는 결합에서 제외 (초)
+        self._sources = {}  # (호스트, 이름) -> TimeSource
+        self._lock = threading.Lock()
+
+    def submit(self, name, kind, lo, hi, authoritative=False, measured_at=None, host=None):
+        """소스 구간 제출 (같은 호스트, 같은 이름의 이전 구간은 교체)"""
+        if hi < lo:
+            lo, hi = hi, lo
+        measured_at = time.time() if measured_at is None else measured_at
+        with self._lock:
+            self._sources[(host, name)] = TimeSource(name, kind, lo, hi, authoritative, measured_at, host)
+
+    def submit_offset(self, name, kind, offset, error, authoritative=False, measured_at=None, host=None):
+        """오프셋 ± 오차 한계로 소스 제출"""
+        self.submit(name, kind, offset - error, offset + error, authoritative, measured_at, host)
+
+    def remove(self, name, host=None):
+        with self._lock:
+            self._sources.pop((host, name), None)
+
+    def clear_host(self, host):
+        """호스트의 소스를 모두 삭제 (대상 호스트가 바뀔 때 이전 실행의 측정 정리)"""
+        with self._lock:
+            for key in [key for key in self._sources if key[0] == host]:
+                del self._sources[key]
+
+    def sources(self, now=None, shifts=None, host=None):
+        """유효한 소스를 드리프트 허용치만큼 넓힌 구간으로 반환
+
+        Args:
+            shifts: {kind: 이동량} 종류별로 구간을 옮길 양 (예: 경로 비대칭 편향을 NTP 구간에 반영)
+            host: 지정하면 호스트 무관 소스와 그 호스트의 소스만 반환 (None이면 전체)
+        """
+        now = time.time() if now is None else now
+        shifts = shifts or {}
+        with self._lock:
+            snapshot = list(self._sources.values())
+        active = []
+        for source in snapshot:
+            if host is not None and source.host not in (None, host):
+                continue
+            age = max(0.0, now - source.measured_at)
+            if age > self.max_age:
+                continue
+            widen = age * self.DRIFT_ALLOWANCE
+            shift = shifts.get(source.kind, 0.0)
+            active.append(source._replace(lo=source.lo - widen + shift, hi=source.hi + widen + shift))
+        return active
+
+    def combine(self, now=None, extra=(), shifts=None, host=None):
+        """최선의 교집합 구간 계산
+
+        Args:
+            extra: 저장하지 않고 이번 계산에만 포함할 TimeSource 목록 (예: 필터 예측)
+            shifts: 종류별 구간 이동량 (sources() 참고)
+            host: 대상 호스트 (다른 호스트의 소스는 결합에서 제외, sources() 참고)
+
+        Returns:
+            CombinedInterval 또는 유효한 소스가 없으면 None
+        """
+        active = self.sources(now, shifts, host) + list(extra)
+        if not active:
+            return None
+        heavy = len(active) + 1  # authoritative 소스 하나 > 일반 소스 전체
+        lo, hi, _ = marzullo([(s.lo, s.hi, heavy if s.authoritative else 1) for s in active])
+
+        truechimers = [s.name for s in active if s.lo <= hi and s.hi >= lo]
+        falsetickers = [s.name for s in active if s.name not in truechimers]
+        return CombinedInterval(lo, hi, (lo + hi) / 2, (hi - lo) / 2, truechimers, falsetickers)
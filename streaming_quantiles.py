@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스트리밍 분위수 추정 (P² 알고리즘, Jain & Chlamtac 1985)
+- 측정값을 저장하지 않고 마커 5개(높이, 위치)만 유지하며 분위수를 추정
+- 측정 하나당 O(1), 상태 크기 고정이라 누적 기록이 길어져도 갱신 비용이 늘지 않음
+- 사분위수(Q1, 중앙값, Q3)와 IQR 이상값 경계를 누적 통계 옆에 함께 보관하는 데 사용
+  (전체 기록으로 statistics.quantiles를 다시 계산하던 방식 대체)
+"""
+
+import math
+
+
+class P2Quantile:
+    """단일 분위수 p의 P² 추정기"""
+
+    __slots__ = ('p', 'count', 'heights', 'positions', 'desired', 'increments')
+
+    def __init__(self, p):
+        if not 0 < p < 1:
+            raise ValueError("분위수 p는 0과 1 사이여야 합니다")
+        self.p = p
+        self.count = 0
+        self.heights = []    # 마커 높이 (처음 5개는 정렬된 원래 측정값)
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(value)
+            q.sort()
+            return
+
+        # 측정이 들어갈 칸 찾기 (양 끝 마커는 최소/최대로 갱신)
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= q[k + 1]:
+                k += 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # 가운데 마커를 원하는 위치 쪽으로 한 칸씩 이동 (포물선 보간, 단조성이 깨지면 선형 보간)
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = candidate
+                n[i] += step
+
+    def _parabolic(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    @property
+    def value(self):
+        """현재 분위수 추정값 (측정 5개 이하는 정확한 선형 보간값, 없으면 NaN)"""
+        if not self.heights:
+            return math.nan
+        if self.count > 5:
+            return self.heights[2]
+        q = self.heights
+        rank = self.p * (len(q) - 1)
+        lower = int(rank)
+        upper = min(lower + 1, len(q) - 1)
+        return q[lower] + (q[upper] - q[lower]) * (rank - lower)
+
+    def to_dict(self):
+        return {'p': self.p, 'count': self.count, 'heights': list(self.heights),
+                'positions': list(self.positions), 'desired': list(self.desired)}
+
+    @classmethod
+    def from_dict(cls, data):
+        estimator = cls(data['p'])
+        estimator.count = data.get('count', 0)
+        estimator.heights = list(data.get('heights', []))
+        estimator.positions = list(data.get('positions', estimator.positions))
+        estimator.desired = list(data.get('desired', estimator.desired))
+        return estimator
+
+
+class Quartiles:
+    """Q1 / 중앙값 / Q3 스트리밍 추정과 IQR 이상값 경계"""
+
+    __slots__ = ('q1', 'median', 'q3')
+
+    def __init__(self):
+        self.q1 = P2Quantile(0.25)
+        self.median = P2Quantile(0.5)
+        self.q3 = P2Quantile(0.75)
+
+    def add(self, value):
+        self.q1.add(value)
+        self.median.add(value)
+        self.q3.add(value)
+
+    @property
+    def count(self):
+        return self.median.count
+
+    @property
+    def iqr(self):
+        return self.q3.value - self.q1.value
+
+    def fences(self, factor=1.5):
+        """(하한, 상한) = (Q1 - factor*IQR, Q3 + factor*IQR)"""
+        iqr = self.iqr
+        return self.q1.value - factor * iqr, self.q3.value + factor * iqr
+
+    def to_dict(self):
+        return {'q1': self.q1.to_dict(), 'median': self.median.to_dict(), 'q3': self.q3.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        quartiles = cls()
+        for name in ('q1', 'median', 'q3'):
+            if name in data:
+                setattr(quartiles, name, P2Quantile.from_dict(data[name]))
+        return quartiles
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간 동기화 전략 모음 (ProbeEngine 기반)
+- MultiSampleStrategy: 다중 측정 (샘플당 여러 번 발사, 최저 지연 응답 선택)
+- SecondChangeStrategy: 서버 초 전환 순간 캐치
+- MonitoringStrategy: 일정 간격 연속 모니터링
+- BisectionStrategy: 서버 초 경계 이분 탐색 (구간 폭으로 불확실성 보고)
+- EdgeSelectionStrategy: 호스트의 모든 엣지 주소를 동시에 측정해 가장 빠르고 안정적인 주소 선택
+
+각 전략은 측정값 dict 목록을 반환하고, 통계/로그/누적 데이터 처리는 호출 측에서 담당
+"""
+
+import math
+import time
+import asyncio
+import statistics
+
+from http_date import parse_http_date
+from time_extractors import extract_server_time
+from backend_clusters import backend_hints
+
+
+def build_offset_measurement(result, parse_date=parse_http_date, extractors=None):
+    """측정 결과 하나를 오프셋 측정값 dict로 변환 (서버 시각을 얻지 못하면 None)
+
+    서버 시각은 등록된 추출기를 정밀도 순서로 시도해 얻고, 모두 실패하면 Date 헤더 사용
+    parse_date는 Date 헤더 문자열을 epoch 초로 변환하는 함수
+    """
+    extracted = extract_server_time(result, parse_date, extractors)
+    if extracted is None:
+        return None
+    server_timestamp, extractor, resolution = extracted
+
+    # rtt는 요청 전송 시작 ~ 응답 첫 바이트 구간, local_before는 요청 전송 시작 시각
+    latency = result['rtt'] / 2
+    local_timestamp_at_server = result['local_before'] + latency
+
+    return {
+        'latency': latency,
+        'offset': server_timestamp - local_timestamp_at_server,
+        # 낮은 지연시간, 높은 서버 시각 해상도가 높은 점수
+        'quality_score': 1.0 / (latency + resolution / 2 + 0.001),
+        'local_before': result['local_before'],
+        'local_after': result['local_after'],
+        'server_time': server_timestamp,
+        'server_time_str': result.get('date'),
+        'extractor': extractor,
+        'resolution': resolution,  # 서버 시각 해상도 (초)
+        'local_timestamp_at_server': local_timestamp_at_server,
+        'response_time': result['rtt'] * 1000,  # ms
+        'phases_ns': result.get('phases_ns'),
+        'connection_reused': result.get('reused'),
+        'backend': backend_hints(result),  # 백엔드 식별 힌트 (연결, 원격 주소, Server/Via 등)
+    }
+
+
+class MultiSampleStrategy:
+    """다중 측정 전략: 모든 측정을 짧은 간격으로 예약 발사하고 샘플별 최고 품질 응답 선택"""
+
+    def __init__(self, num_samples, attempts=5, spacing=0.005, method='HEAD'):
+        self.num_samples = num_samples
+        self.attempts = attempts
+        self.spacing = spacing  # 발사 간격 (응답을 기다리지 않음)
+        self.method = method    # 본문에서 서버 시각을 읽는 경우 GET
+
+    async def run(self, engine, url, parse_date=parse_http_date):
+        """
+        Returns:
+            tuple: (샘플 순서대로 정렬된 최고 품질 측정값 목록, [(sample, attempt, 예외)] 실패 목록)
+        """
+        start = time.perf_counter() + self.spacing
+        total = self.num_samples * self.attempts
+        fire_times = [start + k * self.spacing for k in range(total)]
+
+        best = {}
+        failures = []
+        async for index, result in engine.stream(url, fire_times, self.method):
+            sample, attempt = divmod(index, self.attempts)
+            if isinstance(result, Exception):
+                failures.append((sample + 1, attempt + 1, result))
+                continue
+
+            measurement = build_offset_measurement(result, parse_date)
+            if measurement is None:
+                continue
+            measurement['sample'] = sample + 1
+            measurement['attempt'] = attempt + 1
+
+            current = best.get(sample)
+            if current is None or measurement['quality_score'] > current['quality_score']:
+                best[sample] = measurement
+
+        return [best[sample] for sample in sorted(best)], failures
+
+
+class SecondChangeStrategy:
+    """초 전환 캐치 전략: 촘촘하게 예약 발사한 측정 중 새 초를 처음 본 응답으로 오프셋 계산"""
+
+    def __init__(self, interval=0.02, window=2.0):
+        self.interval = interval  # 발사 간격 (기존 순차 방식 50ms)
+        self.window = window      # 초 전환을 기다리는 최대 시간
+
+    async def current_second(self, engine, url, parse_date=parse_http_date, tries=20):
+        """1단계: 현재 서버 초 확인 (epoch 초)"""
+        for _ in range(tries):
+            try:
+                result = await engine.probe_at(url)
+                server_second = parse_date(result['date']) if result.get('date') else None
+                if server_second is not None:
+                    return int(server_second)
+            except Exception:
+                continue
+        return None
+
+    async def run_attempt(self, engine, url, parse_date=parse_http_date):
+        """한 번의 초 전환 캐치 시도
+
+        Returns:
+            tuple: (기준 초(0~59), 측정값 dict 또는 None)
+        """
+        previous_second = await self.current_second(engine, url, parse_date)
+        if previous_second is None:
+            return None, None
+
+        # 2단계: 초 전환이 포함되도록 window 전체에 걸쳐 발사 예약
+        start = time.perf_counter() + self.interval
+        count = int(self.window / self.interval)
+        fire_times = [start + k * self.interval for k in range(count)]
+
+        completed = set()
+        change = None  # (index, result, server_time) - 발사 순서상 가장 이른 초 전환
+        async for index, result in engine.stream(url, fire_times):
+            completed.add(index)
+            if not isinstance(result, Exception) and result.get('date'):
+                server_second = parse_date(result['date'])
+                if server_second is not None and int(server_second) != previous_second:
+                    if change is None or index < change[0]:
+                        change = (index, result, int(server_second))
+
+            # 먼저 발사된 측정이 모두 도착해야 가장 이른 전환임을 확정할 수 있음
+            if change is not None and all(i in completed for i in range(change[0])):
+                break
+
+        if change is None:
+            return previous_second % 60, None
+
+        _, result, server_exact_timestamp = change
+        latency = result['rtt'] / 2
+        # 서버 시간은 정확히 초 단위 (밀리초=0), 즉 새 초의 .000 시점
+        local_at_server_time = result['local_before'] + latency
+
+        return previous_second % 60, {
+            'server_second_change': server_exact_timestamp % 60,
+            'previous_second': previous_second % 60,
+            'latency': latency,
+            'offset': server_exact_timestamp - local_at_server_time,
+            'local_before': result['local_before'],
+            'local_after': result['local_after'],
+            'server_exact_time': server_exact_timestamp,
+            'local_at_server_time': local_at_server_time,
+            'response_time': result['rtt'] * 1000,
+            'phases_ns': result.get('phases_ns'),
+        }
+
+
+class MonitoringStrategy:
+    """연속 모니터링 전략: 일정 간격으로 예약 발사하고 결과를 도착 즉시 전달"""
+
+    def __init__(self, duration, interval=1.0):
+        self.duration = duration
+        self.interval = interval
+
+    async def run(self, engine, url, parse_date=parse_http_date, on_measurement=None,
+                  on_error=None, should_continue=None):
+        start = time.perf_counter()
+        fire_times = [start + k * self.interval
+                      for k in range(max(1, int(self.duration / self.interval)))]
+
+        measurements = []
+        async for _, result in engine.stream(url, fire_times):
+            if should_continue is not None and not should_continue():
+                break
+            if isinstance(result, Exception):
+                if on_error:
+                    on_error(result)
+                continue
+
+            measurement = build_offset_measurement(result, parse_date)
+            if measurement is None:
+                continue
+            measurement['timestamp'] = measurement['local_before']
+            measurements.append(measurement)
+            if on_measurement:
+                on_measurement(measurement)
+
+        return measurements
+
+
+class BisectionStrategy:
+    """초 경계 이분 탐색 전략
+
+    Date 헤더 D를 받은 측정의 서버 도착 시각을 A(로컬)라 하면 D <= A + offset < D + 1 이므로
+    오프셋은 [D - A, D + 1 - A) 구간 안에 있음. 다음 측정은 서버 도착 시각이 현재 구간의
+    중앙값에 해당하는 초 경계와 겹치도록 예약해, 응답의 초로 구간을 절반씩 좁힘
+    """
+
+    def __init__(self, max_probes=10, target_width=0.002, lead=0.02):
+        self.max_probes = max_probes
+        self.target_width = target_width  # 이 폭 이하로 좁혀지면 종료
+        self.lead = lead                  # 예약 발사에 필요한 최소 여유 시간
+
+    @staticmethod
+    def constraint(result, parse_date):
+        """측정 하나로부터 오프셋 구간 [lo, hi) 계산"""
+        server_second = parse_date(result['date']) if result.get('date') else None
+        if server_second is None:
+            return None
+        server_second = int(server_second)
+        arrival = result['local_before'] + result['rtt'] / 2
+        return server_second - arrival, server_second + 1 - arrival
+
+    @staticmethod
+    def intersect(lo, hi, bounds):
+        """현재 구간과 새 측정 구간의 교집합
+
+        어긋나면 최신 측정 구간으로 재시작 (DateConstraintSolver.add와 같은 규칙).
+        충돌한 두 경계 사이 틈은 지터/비대칭 측정 하나가 만든 값이라 구간으로 쓰면 거짓 정밀도가 됨
+
+        Returns:
+            tuple: (lo, hi, 충돌 여부)
+        """
+        new_lo, new_hi = max(lo, bounds[0]), min(hi, bounds[1])
+        if new_lo < new_hi:
+            return new_lo, new_hi, False
+        return bounds[0], bounds[1], True
+
+    @staticmethod
+    def uncertainty(width, conflicts, latency):
+        """보고할 오프셋 불확실성 (초)
+
+        구간은 서버 도착을 RTT 중앙으로 가정해 계산하므로 충돌은 그 가정이 어긋났다는 증거.
+        충돌마다 단방향 지연의 절반씩 넓히되, 가정 오차의 상한인 단방향 지연 하나까지만 넓힘
+        """
+        return width / 2 + min(conflicts * latency / 2, latency)
+
+    async def probe_edge(self, engine, url, lo, hi, one_way, parse_date=parse_http_date):
+        """서버 도착 시각이 구간 중앙에 해당하는 초 경계와 겹치도록 예약 발사
+
+        Returns:
+            tuple: (측정 결과, 오프셋 구간 또는 None)
+        """
+        # 서버 도착 시각 A' 가 A' + mid = 정수(초 경계)가 되도록 예약
+        mid = (lo + hi) / 2
+        wall_now = time.time()
+        perf_now = time.perf_counter()
+        earliest_arrival = wall_now + one_way + self.lead
+        edge = math.ceil(earliest_arrival + mid)
+        send_wall = edge - mid - one_way
+        fire_at = perf_now + (send_wall - wall_now)
+
+        result = await engine.probe_at(url, fire_at)
+        return result, self.constraint(result, parse_date)
+
+    async def run(self, engine, url, parse_date=parse_http_date, on_probe=None):
+        """
+        Returns:
+            dict: offset(구간 중앙), lo, hi, width, uncertainty, probes, conflicts, latency, history
+                  또는 측정 실패 시 None
+        """
+        first = await engine.probe_at(url)
+        bounds = self.constraint(first, parse_date)
+        if bounds is None:
+            return None
+
+        lo, hi = bounds
+        rtts = [first['rtt']]
+        conflicts = 0
+        history = [{'lo': lo, 'hi': hi, 'rtt': first['rtt']}]
+        if on_probe:
+            on_probe(1, lo, hi, first['rtt'])
+
+        for probe_index in range(2, self.max_probes + 1):
+            if hi - lo <= self.target_width:
+                break
+
+            try:
+                result, bounds = await self.probe_edge(engine, url, lo, hi, min(rtts) / 2, parse_date)
+            except Exception:
+                continue
+            if bounds is None:
+                continue
+            rtts.append(result['rtt'])
+
+            # 지연 변동으로 구간이 어긋난 경우 최신 측정 구간으로 재시작됨
+            lo, hi, conflict = self.intersect(lo, hi, bounds)
+            conflicts += conflict
+
+            history.append({'lo': lo, 'hi': hi, 'rtt': result['rtt']})
+            if on_probe:
+                on_probe(probe_index, lo, hi, result['rtt'])
+
+        return {
+            'offset': (lo + hi) / 2,
+            'lo': lo,
+            'hi': hi,
+            'width': hi - lo,
+            'uncertainty': self.uncertainty(hi - lo, conflicts, min(rtts) / 2),
+            'probes': len(history),
+            'conflicts': conflicts,
+            'latency': min(rtts) / 2,
+            'history': history,
+        }
+
+
+class BurstEdgeStrategy:
+    """초 경계 버스트 전략: 이미 연결된 keep-alive 연결로 측정 여러 개를 간격을 두고 한꺼번에 발사
+
+    k번째 측정은 후보 오프셋 c_k에 대해 서버 도착 시각 + c_k가 같은 초 경계 E가 되도록 예약.
+    응답의 초가 E 이상이면 오프셋 >= c_k, 미만이면 < c_k 이므로 버스트 한 번으로 구간이
+    (fan + 1)분의 1로 줄어듦. 이전 구간(추적기/Date 제약)이 있으면 첫 측정 없이 바로 버스트
+    """
+
+    def __init__(self, fan=8, spacing=None, max_bursts=4, target_width=0.002, lead=0.02):
+        self.fan = fan                    # 버스트당 측정 수 (동시 연결 수 이하)
+        self.spacing = spacing            # 후보 오프셋 최대 간격(초), None이면 구간 폭에 맞춰 자동
+        self.max_bursts = max_bursts
+        self.target_width = target_width  # 이 폭 이하로 좁혀지면 종료
+        self.lead = lead                  # 예약 발사에 필요한 최소 여유 시간
+
+    def candidates(self, lo, hi):
+        """구간 [lo, hi) 안에서 시험할 후보 오프셋 목록 (오름차순, 구간 중앙 기준 등간격)
+
+        간격을 지정해도 구간을 fan + 1 등분한 간격보다 넓게 잡지는 않음
+        """
+        step = (hi - lo) / (self.fan + 1)
+        if self.spacing is not None:
+            step = min(step, self.spacing)
+        mid = (lo + hi) / 2
+        return [mid + (k - (self.fan - 1) / 2) * step for k in range(self.fan)]
+
+    async def burst(self, engine, url, lo, hi, one_way, parse_date=parse_http_date):
+        """버스트 한 번 발사
+
+        Returns:
+            list: [(후보 오프셋, 측정 결과 또는 예외, 오프셋 구간 또는 None)]
+        """
+        candidates = self.candidates(lo, hi)
+        wall_now = time.time()
+        perf_now = time.perf_counter()
+        # 가장 먼저 보내야 하는 측정(가장 큰 후보)도 여유 시간을 확보하도록 경계 선택
+        edge = math.ceil(wall_now + self.lead + one_way + candidates[-1])
+        fire_times = [perf_now + (edge - c - one_way - wall_now) for c in candidates]
+
+        results = await asyncio.gather(*engine.schedule(url, fire_times), return_exceptions=True)
+        burst = []
+        for candidate, result in zip(candidates, results):
+            bounds = None if isinstance(result, Exception) else BisectionStrategy.constraint(result, parse_date)
+            burst.append((candidate, result, bounds))
+        return burst
+
+    async def run(self, engine, url, parse_date=parse_http_date, prior=None, one_way=None, on_burst=None):
+        """
+        Args:
+            prior: 이미 알고 있는 오프셋 구간 (lo, hi), 없으면 측정 하나로 시작
+            one_way: 알고 있는 단방향 지연 (초), prior로 시작하면 첫 버스트 예약에 사용
+                     (없으면 0으로 예약돼 구간이 좁을 때 초 경계를 놓칠 수 있음)
+
+        Returns:
+            dict: offset(구간 중앙), lo, hi, width, uncertainty, probes, bursts, conflicts, latency, history
+                  또는 측정 실패 시 None
+        """
+        rtts = []
+        probes = 0
+        if prior is None:
+            first = await engine.probe_at(url)
+            prior = BisectionStrategy.constraint(first, parse_date)
+            if prior is None:
+                return None
+            rtts.append(first['rtt'])
+            probes += 1
+        lo, hi = prior
+        if rtts:
+            one_way = min(rtts) / 2
+        elif one_way is None:
+            one_way = 0.0
+
+        conflicts = 0
+        history = []
+        for burst_index in range(1, self.max_bursts + 1):
+            if hi - lo <= self.target_width:
+                break
+            burst = await self.burst(engine, url, lo, hi, one_way, parse_date)
+            for _, result, bounds in burst:
+                if bounds is None:
+                    continue
+                probes += 1
+                rtts.append(result['rtt'])
+                lo, hi, conflict = BisectionStrategy.intersect(lo, hi, bounds)
+                conflicts += conflict
+            if not rtts:
+                return None
+            one_way = min(rtts) / 2
+            history.append({'lo': lo, 'hi': hi, 'probes': len(burst)})
+            if on_burst:
+                on_burst(burst_index, lo, hi, len([b for b in burst if b[2] is not None]))
+
+        if not rtts:
+            return None
+        return {
+            'offset': (lo + hi) / 2,
+            'lo': lo,
+            'hi': hi,
+            'width': hi - lo,
+            'uncertainty': BisectionStrategy.uncertainty(hi - lo, conflicts, min(rtts) / 2),
+            'probes': probes,
+            'bursts': len(history),
+            'conflicts': conflicts,
+            'latency': min(rtts) / 2,
+            'history': history,
+        }
+
+
+class EdgeSelectionStrategy:
+    """엣지 선택 전략: 모든 A/AAAA 주소에 같은 시각 측정을 예약 발사해 주소별 RTT/지터 비교
+
+    점수 = RTT 중앙값 + 2 x 지터(연속 RTT 차이 평균), 낮을수록 좋음
+    """
+
+    def __init__(self, rounds=5, spacing=0.05):
+        self.rounds = rounds
+        self.spacing = spacing  # 라운드 간격 (모든 주소가 같은 시각에 측정됨)
+
+    @staticmethod
+    def summarize(address, rtts, failures):
+        """주소 하나의 측정 결과를 통계 dict로 정리 (RTT/지터 단위: ms)"""
+        if not rtts:
+            return {'address': address, 'samples': 0, 'failures': failures,
+                    'min_rtt': None, 'median_rtt': None, 'jitter': None, 'score': float('inf')}
+
+        rtts_ms = [rtt * 1000 for rtt in rtts]
+        diffs = [abs(b - a) for a, b in zip(rtts_ms, rtts_ms[1:])]
+        jitter = statistics.mean(diffs) if diffs else 0.0
+        median_rtt = statistics.median(rtts_ms)
+        # 실패가 있는 주소는 실패 비율만큼 불리하게
+        penalty = 1 + failures / (len(rtts) + failures)
+        return {
+            'address': address,
+            'samples': len(rtts),
+            'failures': failures,
+            'min_rtt': min(rtts_ms),
+            'median_rtt': median_rtt,
+            'jitter': jitter,
+            'score': (median_rtt + 2 * jitter) * penalty,
+        }
+
+    async def run(self, engine, url):
+        """
+        Returns:
+            list: 주소별 통계 dict (점수 오름차순, 첫 항목이 최적 엣지)
+        """
+        addresses = engine.transport.resolve_all(url)
+        if not addresses:
+            return []
+
+        # 주소별 연결을 먼저 맺어 연결 비용이 RTT에 섞이지 않게 함
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(None, engine.transport.warm_up, url, 1, address)
+                               for address in addresses])
+
+        start = time.perf_counter() + self.spacing
+        tasks = []
+        for k in range(self.rounds):
+            for address in addresses:
+                tasks.append((address, engine.probe_at(url, start + k * self.spacing, address)))
+        results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
+
+        rtts = {address: [] for address in addresses}
+        failures = {address: 0 for address in addresses}
+        for (address, _), result in zip(tasks, results):
+            if isinstance(result, Exception):
+                failures[address] += 1
+            else:
+                rtts[address].append(result['rtt'])
+
+        stats = [self.summarize(address, rtts[address], failures[address]) for address in addresses]
+        return sorted(stats, key=lambda entry: entry['score'])
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+backend_clusters 단위 테스트 (백엔드 힌트 추출, 헤더/연결 그룹화, 오프셋 병합, 발사 클러스터 선택)
+python -m pytest test_backend_clusters.py
+"""
+
+from backend_clusters import BackendClusterer, backend_hints
+
+
+def sample(offset, uncertainty=0.0005, **hints):
+    return {'offset': offset, 'uncertainty': uncertainty, 'hints': hints}
+
+
+def test_backend_hints_from_result():
+    result = {'connection_id': 7, 'remote_address': '10.0.0.1',
+              'headers': {'X-Served-By': 'cache-a', 'Server': 'nginx'}}
+    assert backend_hints(result) == {'connection': 7, 'address': '10.0.0.1',
+                                     'x-served-by': 'cache-a', 'server': 'nginx'}
+    assert backend_hints({'headers': None}) == {}
+
+
+def test_two_backends_are_separated():
+    samples = ([sample(0.100 + i * 0.0001, **{'x-served-by': 'a', 'server': 'nginx'}) for i in range(6)]
+               + [sample(0.150 + i * 0.0001, **{'x-served-by': 'b', 'server': 'nginx'}) for i in range(4)])
+    clusters = BackendClusterer().cluster(samples)
+    assert [(c.label, c.samples) for c in clusters] == [('a', 6), ('b', 4)]
+    assert abs(clusters[0].offset - 0.10025) < 1e-9
+
+
+def test_close_offsets_merge_without_identifying_headers():
+    # 헤더 값이 모두 같으면(nginx) 식별력이 없어 오프셋만으로 병합
+    samples = [sample(0.100 + i * 0.0003, connection=f'run:{i}', server='nginx') for i in range(5)]
+    clusters = BackendClusterer(tolerance=0.002).cluster(samples)
+    assert len(clusters) == 1 and clusters[0].samples == 5
+    assert clusters[0].connections == {f'run:{i}' for i in range(5)}
+    assert clusters[0].label == '+100.6ms'
+
+
+def test_different_header_values_never_merge():
+    samples = [sample(0.100, **{'x-served-by': 'a'}), sample(0.1005, **{'x-served-by': 'b'})]
+    clusters = BackendClusterer(tolerance=0.010).cluster(samples)
+    assert sorted(c.label for c in clusters) == ['a', 'b']
+
+
+def test_same_address_clusters_get_numbered_labels():
+    samples = [sample(0.100, address='10.0.0.1'), sample(0.100, address='10.0.0.1'),
+               sample(0.200, address='10.0.0.1')]
+    clusters = BackendClusterer().cluster(samples)
+    assert [c.label for c in clusters] == ['10.0.0.1#1', '10.0.0.1#2']
+
+
+def test_select_prefers_next_connection_then_address():
+    samples = ([sample(0.100, connection='run:1', address='10.0.0.1') for _ in range(3)]
+               + [sample(0.200, connection='run:2', address='10.0.0.2')])
+    clusters = BackendClusterer().cluster(samples)
+    assert BackendClusterer.select(clusters, connection_ids=['run:1', 'run:2']).offset == 0.200
+    assert BackendClusterer.select(clusters, address='10.0.0.2').offset == 0.200
+    assert BackendClusterer.select(clusters, address='10.0.0.9').offset == 0.100
+    assert BackendClusterer.select([]) is None
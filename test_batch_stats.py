@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+batch_stats 단위 테스트 (이상값 규칙, 순수 파이썬/NumPy 경로 일치, 감쇠 일괄 요약)
+python -m pytest test_batch_stats.py
+NumPy 경로 비교는 numpy가 설치된 경우에만 수행
+"""
+
+import random
+import statistics
+
+from batch_stats import (NUMPY_AVAILABLE, MeasurementColumns, decayed_summary, iqr_bounds, latency_mask,
+                         remove_outliers_advanced, remove_outliers_iqr, sigma_mask, summarize)
+from decayed_stats import DecayedStats
+
+
+def sample_values(count=400, seed=7):
+    rng = random.Random(seed)
+    values = [rng.gauss(0.100, 0.002) for _ in range(count)]
+    values[::50] = [0.300] * len(values[::50])  # 큐잉 지연 스파이크
+    return values
+
+
+def test_iqr_rules_match_statistics_quantiles():
+    values = [0.10, 0.11, 0.12, 0.13, 0.14, 0.15, 0.90]
+    q1, _, q3 = statistics.quantiles(values, n=4)
+    assert iqr_bounds(values, use_numpy=False) == (q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    assert remove_outliers_iqr(values, use_numpy=False) == values[:-1]
+    assert iqr_bounds(values[:3]) is None
+    assert remove_outliers_iqr(values[:3]) == values[:3]
+
+
+def test_two_sigma_filter_keeps_at_least_two_values():
+    values = [0.100] * 20 + [0.500]
+    assert remove_outliers_advanced(values, use_numpy=False) == [0.100] * 20
+    assert remove_outliers_advanced([0.1, 0.2], use_numpy=False) == [0.1, 0.2]
+    # 마스크는 같은 판정을 측정 단위로 돌려줘 오프셋/지연 짝을 유지한 채 거를 수 있음
+    assert sigma_mask(values, use_numpy=False) == [True] * 20 + [False]
+    assert sigma_mask([0.1, 0.2], use_numpy=False) == [True, True]
+
+
+def test_latency_mask_uses_median_factor():
+    assert latency_mask([0.010, 0.012, 0.011, 0.030], use_numpy=False) == [True, True, True, False]
+    assert latency_mask([]) == []
+
+
+def test_numpy_path_matches_pure_python():
+    if not NUMPY_AVAILABLE:
+        return
+    values = sample_values()
+    assert iqr_bounds(values, use_numpy=True) == iqr_bounds(values, use_numpy=False)
+    assert remove_outliers_iqr(values, use_numpy=True) == remove_outliers_iqr(values, use_numpy=False)
+    assert remove_outliers_advanced(values, use_numpy=True) == remove_outliers_advanced(values, use_numpy=False)
+    assert list(sigma_mask(values, use_numpy=True)) == sigma_mask(values, use_numpy=False)
+    assert list(latency_mask(values, use_numpy=True)) == latency_mask(values, use_numpy=False)
+    fast, exact = summarize(values, use_numpy=True), summarize(values, use_numpy=False)
+    assert fast['count'] == exact['count'] and fast['median'] == exact['median']
+    assert abs(fast['mean'] - exact['mean']) < 1e-12 and abs(fast['stdev'] - exact['stdev']) < 1e-12
+
+
+def test_decayed_summary_matches_incremental_stats():
+    values = sample_values(50)
+    timestamps = [i * 3600.0 for i in range(len(values))]
+    now, half_life = timestamps[-1], 86400.0
+    stats = DecayedStats(half_life)
+    for value, at in zip(values, timestamps):
+        stats.add(value, at)
+    for use_numpy in (False, True) if NUMPY_AVAILABLE else (False,):
+        summary = decayed_summary(values, timestamps, now, half_life, use_numpy=use_numpy)
+        assert abs(summary['mean'] - stats.mean) < 1e-12
+        assert abs(summary['stdev'] - stats.stdev) < 1e-12
+        assert abs(summary['effective_samples'] - stats.effective_samples) < 1e-9
+    assert decayed_summary([], [], now, half_life)['weight'] == 0.0
+
+
+def test_columns_group_by_host_in_record_order():
+    records = [{'offset': 0.1, 'latency': 0.01, 'host': 'a'}, {'offset': 0.2, 'latency': 0.02, 'host': 'b'},
+               {'offset': 0.3, 'latency': 0.03, 'host': 'a'}]
+    columns = MeasurementColumns.from_records(records, use_numpy=False)
+    assert len(columns) == 3
+    assert columns.groups('host') == {'a': [0, 2], 'b': [1]}
+    assert columns.take('offset', [0, 2]) == [0.1, 0.3]
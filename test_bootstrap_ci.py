@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bootstrap_ci 단위 테스트 (중앙값 신뢰구간, 추정값 위치 이동, 도착 창 확률, 입력 검증)
+python -m pytest test_bootstrap_ci.py
+"""
+
+import random
+
+from bootstrap_ci import ArrivalBootstrap
+
+
+def measurements(count=60, seed=3):
+    rng = random.Random(seed)
+    offsets = [0.100 + rng.gauss(0, 0.002) for _ in range(count)]
+    latencies = [0.010 + rng.expovariate(1 / 0.002) for _ in range(count)]
+    return offsets, latencies
+
+
+def test_too_few_samples_leave_bootstrap_unfitted():
+    bootstrap = ArrivalBootstrap(seed=1).fit([0.1], [0.01])
+    assert not bootstrap.fitted
+    assert bootstrap.to_dict() is None
+    assert bootstrap.window_probability(0.005) == (None, None)
+
+
+def test_refit_with_too_few_samples_clears_previous_intervals():
+    offsets, latencies = measurements()
+    bootstrap = ArrivalBootstrap(replicates=500, fallback_replicates=200, seed=1).fit(offsets, latencies)
+    assert bootstrap.fitted
+    bootstrap.fit(offsets[:1], latencies[:1])
+    assert not bootstrap.fitted and bootstrap.samples == 1
+    assert bootstrap.offset_ci is None and bootstrap.latency_ci is None and bootstrap.arrival_ci is None
+    assert bootstrap.latency_errors is None
+
+
+def test_unpaired_input_is_rejected():
+    offsets, latencies = measurements()
+    try:
+        ArrivalBootstrap(seed=1).fit(offsets, latencies[:-1])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("길이가 다른 오프셋/지연 허용됨")
+
+
+def test_intervals_contain_estimates_and_are_seeded():
+    offsets, latencies = measurements()
+    bootstrap = ArrivalBootstrap(replicates=2000, fallback_replicates=500, seed=1).fit(offsets, latencies)
+    assert bootstrap.fitted and bootstrap.samples == 60
+    assert bootstrap.offset_ci.lo <= bootstrap.offset_ci.estimate <= bootstrap.offset_ci.hi
+    assert bootstrap.latency_ci.lo <= bootstrap.latency_ci.estimate <= bootstrap.latency_ci.hi
+    # 중앙값의 표준오차는 측정 표준편차(2ms)/sqrt(60)의 약 1.25배 -> 95% 구간 폭 약 1.3ms
+    assert 0.0005 < bootstrap.offset_ci.hi - bootstrap.offset_ci.lo < 0.0025
+    # 도착 오차에는 요청 하나의 지연 편차가 들어가 오프셋 구간보다 넓음
+    assert bootstrap.arrival_ci.hi - bootstrap.arrival_ci.lo > bootstrap.offset_ci.hi - bootstrap.offset_ci.lo
+    again = ArrivalBootstrap(replicates=2000, fallback_replicates=500, seed=1).fit(offsets, latencies)
+    assert again.offset_ci == bootstrap.offset_ci and again.arrival_ci == bootstrap.arrival_ci
+
+
+def test_interval_is_moved_to_given_estimate():
+    offsets, latencies = measurements()
+    base = ArrivalBootstrap(replicates=2000, seed=5).fit(offsets, latencies)
+    moved = ArrivalBootstrap(replicates=2000, seed=5).fit(offsets, latencies, offset_estimate=0.2)
+    assert moved.offset_ci.estimate == 0.2
+    shift = 0.2 - base.offset_ci.estimate
+    assert abs(moved.offset_ci.lo - (base.offset_ci.lo + shift)) < 1e-12
+    assert abs(moved.offset_ci.hi - (base.offset_ci.hi + shift)) < 1e-12
+
+
+def test_window_probability_bounds():
+    offsets, latencies = measurements()
+    bootstrap = ArrivalBootstrap(replicates=2000, seed=2).fit(offsets, latencies)
+    probability, interval = bootstrap.window_probability(0.010, lo=-1.0, hi=1.0)
+    assert probability == 1.0
+    assert interval.lo <= 0.010 + 0.001 and interval.hi >= 0.010
+    probability, _ = bootstrap.window_probability(0.500, lo=0.0, hi=0.020)
+    assert probability == 0.0
+    # 오프셋 불확실성이 크면 같은 창에 들 확률이 줄어듦
+    narrow, _ = bootstrap.window_probability(0.010, offset_bound=0.001)
+    wide, _ = bootstrap.window_probability(0.010, offset_bound=0.050)
+    assert narrow > wide
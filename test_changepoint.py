@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+changepoint 단위 테스트 (계단 변화 탐지, 변화 시작점 추정, 스파이크/완만한 드리프트 무시)
+python -m pytest test_changepoint.py
+"""
+
+from changepoint import CusumDetector
+
+# 결정적인 ±1ms 잡음
+NOISE = [0.001, -0.001, 0.0005, -0.0005, 0.0, 0.0008, -0.0008, 0.0003]
+
+
+def noisy(base, count, start=0):
+    return [base + NOISE[(start + i) % len(NOISE)] for i in range(count)]
+
+
+def feed(detector, values):
+    return [change for change in map(detector.update, values) if change is not None]
+
+
+def test_baseline_after_warmup():
+    detector = CusumDetector(warmup=12)
+    assert feed(detector, noisy(0.100, 11)) == []
+    assert not detector.ready
+    detector.update(0.100)
+    assert detector.ready and abs(detector.mean - 0.100) < 0.001
+
+
+def test_step_change_is_detected_with_start_index():
+    detector = CusumDetector()
+    values = noisy(0.100, 40) + noisy(0.120, 30, start=40)
+    changes = feed(detector, values)
+    assert len(changes) == 1
+    change = changes[0]
+    assert change.direction == 1
+    assert 40 <= change.change_index <= change.index < 45
+    # 경보 전까지 기준선이 adapt 비율로 조금 따라감
+    assert abs(change.before - 0.100) < 0.002 and abs(change.after - 0.120) < 0.001
+    # 새 구간 측정으로 기준선을 다시 잡음
+    assert detector.changes == 1 and detector.ready and abs(detector.mean - 0.120) < 0.002
+
+
+def test_downward_step_direction():
+    changes = feed(CusumDetector(), noisy(0.100, 30) + noisy(0.080, 20, start=30))
+    assert [c.direction for c in changes] == [-1]
+
+
+def test_isolated_spikes_do_not_alarm():
+    values = noisy(0.100, 60)
+    values[20] = values[40] = 0.500  # 큐잉 지연 스파이크
+    assert feed(CusumDetector(), values) == []
+
+
+def test_slow_drift_is_absorbed():
+    # 측정당 0.05ms씩 (표준편차의 1/10 미만) 완만하게 증가
+    values = [v + 0.00005 * i for i, v in enumerate(noisy(0.100, 200))]
+    detector = CusumDetector()
+    assert feed(detector, values) == []
+    assert abs(detector.mean - values[-1]) < 0.003
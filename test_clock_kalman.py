@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+clock_kalman 단위 테스트 (초기화, 드리프트 추적, 이상값 게이트와 재수렴, 지연 잡음 추정, 예측)
+python -m pytest test_clock_kalman.py
+"""
+
+import random
+
+from clock_kalman import ClockKalmanFilter
+
+START = 1700000000.0
+
+
+def test_first_measurements_initialize_state():
+    kalman = ClockKalmanFilter()
+    assert not kalman.initialized
+    assert kalman.update_offset(0.120, 1e-6, START)
+    assert kalman.update_latency(0.015, START, variance=1e-6)
+    state = kalman.state()
+    assert kalman.initialized
+    assert state.offset == 0.120 and state.offset_var == 1e-6
+    assert state.latency == 0.015 and state.updates == 2 and state.updated_at == START
+
+
+def test_tracks_offset_drift():
+    rng = random.Random(3)
+    kalman = ClockKalmanFilter()
+    for i in range(120):
+        t = START + i * 10
+        kalman.update_offset(0.100 + 30e-6 * (t - START) + rng.gauss(0, 0.0005), 0.0005 ** 2, t)
+    state = kalman.state()
+    assert abs(state.drift - 30e-6) < 5e-6
+    assert abs(state.offset - (0.100 + 30e-6 * 1190)) < 0.0005
+    assert state.offset_var < 0.0005 ** 2
+
+
+def test_outliers_are_gated_until_a_persistent_change():
+    kalman = ClockKalmanFilter(max_rejects=3)
+    for i in range(20):
+        kalman.update_offset(0.100, 1e-6, START + i)
+    # 한두 번 튀는 측정은 버림
+    assert not kalman.update_offset(0.300, 1e-6, START + 20)
+    assert not kalman.update_offset(0.300, 1e-6, START + 21)
+    assert abs(kalman.state().offset - 0.100) < 1e-4
+    # 연속 이상값은 실제 변화로 보고 그 값으로 재초기화
+    assert kalman.update_offset(0.300, 1e-6, START + 22)
+    assert kalman.state().offset == 0.300
+    assert kalman.update_offset(0.3001, 1e-6, START + 23)
+
+
+def test_latency_noise_is_learned_from_innovations():
+    rng = random.Random(5)
+    kalman = ClockKalmanFilter()
+    initial_noise = kalman.state().latency_noise
+    for i in range(300):
+        kalman.update_latency(0.020 + rng.gauss(0, 0.0002), START + i)
+    state = kalman.state()
+    assert abs(state.latency - 0.020) < 0.0002
+    # 실제 잡음(0.2ms)은 초기 가정(2ms)보다 훨씬 작음
+    assert state.latency_noise < initial_noise / 10
+
+
+def test_prediction_extrapolates_drift_without_changing_state():
+    kalman = ClockKalmanFilter()
+    kalman.reset(drift=50e-6, drift_var=1e-12)
+    kalman.update_offset(0.100, 1e-6, START)
+    before = kalman.state()
+    offset, variance = kalman.predict_offset(START + 100)
+    assert abs(offset - (0.100 + 50e-6 * 100)) < 1e-12
+    assert variance > before.offset_var
+    assert kalman.predict_offset(START - 10) == (0.100, before.offset_var)  # 과거 시각은 현재 상태
+    assert kalman.state() == before
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+clock_tracker 단위 테스트 (Date 구간 추적의 충돌 처리, 스냅샷 철회 알림, 구간 변화 재동기화)
+python -m pytest test_clock_tracker.py
+"""
+
+import random
+from email.utils import formatdate
+
+from clock_tracker import ClockTracker
+
+LOCAL = 1700000000.25  # 요청 전송 시작 로컬 시각
+RTT = 0.020
+
+
+def date_result(server_second):
+    return {'date': formatdate(server_second, usegmt=True), 'local_before': LOCAL,
+            'local_after': LOCAL + RTT, 'rtt': RTT}
+
+
+def absorb_date(tracker, server_second):
+    tracker._absorb(date_result(server_second), (server_second, 'date', 1.0))
+
+
+def test_consistent_date_keeps_narrow_snapshot():
+    tracker = ClockTracker(engine=object())
+    tracker.seed(0.745, uncertainty=0.004, latency=RTT / 2)
+    # 오프셋 0.745면 서버 도착 시각(LOCAL + 10ms + 오프셋)은 1700000001.005
+    absorb_date(tracker, 1700000001)
+    snapshot = tracker.snapshot()
+    assert tracker.conflicts == 0
+    assert snapshot is not None and snapshot.extractor == 'date'
+    assert snapshot.uncertainty <= 0.01
+
+
+def test_conflicting_date_withdraws_snapshot_until_narrowed():
+    published = []
+    tracker = ClockTracker(engine=object(), on_update=published.append)
+    tracker.seed(0.745, uncertainty=0.004, latency=RTT / 2)
+    # 1초 앞선 Date: 기존 [0.735, 0.755) 구간과 겹치지 않음
+    absorb_date(tracker, 1700000002)
+    assert tracker.conflicts == 1
+    assert tracker.snapshot() is None
+    # seed 다음에는 철회 알림(None)만 내보내고, 넓은 재시작 구간은 내보내지 않음
+    assert len(published) == 2 and published[0].extractor == 'seed' and published[1] is None
+    lo, hi, _ = tracker._bounds
+    assert hi - lo == 1.0  # 충돌한 두 경계 사이 틈이 아니라 최신 측정 구간으로 재시작
+    # 이미 철회된 상태에서 다시 충돌해도 중복 알림 없음
+    absorb_date(tracker, 1700000004)
+    assert tracker.conflicts == 2 and len(published) == 2
+
+
+def absorb_precise(tracker, offset, rtt, local=LOCAL):
+    result = {'local_before': local, 'local_after': local + rtt, 'rtt': rtt}
+    tracker._absorb(result, (local + rtt / 2 + offset, 'x_timer', 1e-6))
+
+
+def test_level_shift_triggers_resync():
+    rng = random.Random(7)
+    changes = []
+    tracker = ClockTracker(engine=object(), on_change=lambda stream, change: changes.append((stream, change)))
+    for i in range(30):
+        absorb_precise(tracker, 0.100 + rng.gauss(0, 0.0003), RTT + abs(rng.gauss(0, 0.0003)), LOCAL + i)
+    assert changes == [] and tracker.resyncs == 0
+    assert abs(tracker.snapshot().offset - 0.100) < 0.001
+
+    # 경로 변경: 오프셋이 30ms 계단 변화 (지연은 그대로)
+    for i in range(30, 40):
+        absorb_precise(tracker, 0.130 + rng.gauss(0, 0.0003), RTT + abs(rng.gauss(0, 0.0003)), LOCAL + i)
+        if changes:
+            break
+    assert [stream for stream, _ in changes] == ['offset']
+    stream, change = changes[0]
+    assert abs(change.before - 0.100) < 0.002 and abs(change.after - 0.130) < 0.002
+    assert tracker.resyncs == 1 and tracker._fast_ticks == ClockTracker.RESYNC_PROBES
+
+    # 이전 경로의 표본을 버렸으므로 다음 스냅샷은 새 구간 값만 반영
+    absorb_precise(tracker, 0.130, RTT, LOCAL + 41)
+    assert abs(tracker.snapshot().offset - 0.130) < 0.001
+
+
+def test_latency_shift_on_date_tracking_triggers_resync():
+    changes = []
+    tracker = ClockTracker(engine=object(), on_change=lambda stream, change: changes.append(stream))
+    tracker.seed(0.745, uncertainty=0.004, latency=RTT / 2)
+    for rtt in [RTT] * 15 + [RTT + 0.040] * 10:
+        result = date_result(1700000001)
+        result['rtt'] = rtt
+        tracker._absorb(result, (1700000001, 'date', 1.0))
+    assert changes == ['latency'] and tracker.resyncs == 1
+    # Date 구간 제약은 경로와 무관하므로 유지
+    assert tracker._bounds is not None
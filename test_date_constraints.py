@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+date_constraints 단위 테스트 (송수신 구간 제약 교집합, 충돌 재시작, 드리프트 확장)
+python -m pytest test_date_constraints.py
+"""
+
+from email.utils import formatdate
+
+from date_constraints import DateConstraintSolver
+
+T = 1700000000
+
+
+def close(bounds, expected, tolerance=1e-6):
+    """epoch 초 규모의 로컬 시각을 빼므로 부동소수점 오차(약 0.2μs)를 허용"""
+    return all(abs(a - b) < tolerance for a, b in zip(bounds, expected))
+
+
+def test_single_observation_bounds():
+    solver = DateConstraintSolver()
+    assert solver.bounds() is None
+    # 로컬 [T+0.2, T+0.25]에 서버 시계가 [T+1, T+2) 안에 있었음
+    assert solver.add(T + 1, T + 0.2, T + 0.25) is True
+    assert close(solver.bounds(), (0.75, 1.8))
+
+
+def test_overlapping_observations_intersect():
+    solver = DateConstraintSolver(drift_allowance=0.0)
+    solver.add(T + 1, T + 0.2, T + 0.25)   # 오프셋 (0.75, 1.8)
+    solver.add(T + 2, T + 0.95, T + 1.0)   # 오프셋 (1.0, 2.05)
+    assert close(solver.bounds(), (1.0, 1.8))
+    assert solver.observations == 2 and solver.conflicts == 0
+
+
+def test_conflicting_observation_restarts_from_newest():
+    solver = DateConstraintSolver(drift_allowance=0.0)
+    solver.add(T + 1, T + 0.2, T + 0.25)   # 오프셋 (0.75, 1.8)
+    assert solver.add(T + 5, T + 0.2, T + 0.25) is False  # 오프셋 (4.75, 5.8): 겹치지 않음
+    assert close(solver.bounds(), (4.75, 5.8))
+    assert solver.conflicts == 1
+
+
+def test_bounds_widen_with_elapsed_time():
+    solver = DateConstraintSolver(drift_allowance=50e-6)
+    solver.add(T + 1, T + 0.2, T + 0.25)
+    assert close(solver.bounds(at=T + 0.25 + 1000), (0.75 - 0.05, 1.8 + 0.05))
+
+
+def test_add_result_and_round_trip():
+    solver = DateConstraintSolver()
+    assert solver.add_result({'date': None, 'local_before': T, 'rtt': 0.01}) is None
+    result = {'date': formatdate(T + 1, usegmt=True), 'local_before': T + 0.2, 'rtt': 0.05}
+    assert solver.add_result(result) is True
+    restored = DateConstraintSolver.from_dict(solver.to_dict())
+    assert restored.bounds() == solver.bounds()
+    assert restored.observations == 1
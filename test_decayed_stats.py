@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+decayed_stats 단위 테스트 (반감기 감쇠 가중 평균/분산, 호스트별 분리, 이상값 제외와 재시작)
+python -m pytest test_decayed_stats.py
+"""
+
+import statistics
+
+from decayed_stats import DecayedStats, HostStatistics
+
+DAY = 86400.0
+
+
+def test_without_decay_matches_sample_statistics():
+    values = [0.100, 0.102, 0.098, 0.101, 0.099]
+    stats = DecayedStats(half_life=DAY)
+    for value in values:
+        stats.add(value, at=0.0)
+    assert abs(stats.mean - statistics.mean(values)) < 1e-12
+    assert abs(stats.variance - statistics.variance(values)) < 1e-12
+    assert stats.effective_samples == 5 and stats.count == 5
+
+
+def test_old_weight_halves_per_half_life():
+    stats = DecayedStats(half_life=DAY)
+    stats.add(0.200, at=0.0)
+    assert stats.weight_at(DAY) == 0.5
+    stats.add(0.100, at=DAY)
+    # 가중치 0.5 : 1 -> 평균은 새 측정 쪽으로
+    assert abs(stats.mean - (0.5 * 0.200 + 0.100) / 1.5) < 1e-12
+    assert abs(stats.effective_samples - 1.5 ** 2 / 1.25) < 1e-12
+    assert stats.count == 2
+
+
+def test_late_measurement_is_added_with_decayed_weight():
+    stats = DecayedStats(half_life=DAY)
+    stats.add(0.100, at=DAY)
+    stats.add(0.200, at=0.0)  # 마지막 갱신보다 반감기만큼 과거
+    assert abs(stats.mean - (0.100 + 0.5 * 0.200) / 1.5) < 1e-12
+    assert stats.updated_at == DAY
+
+
+def test_round_trip():
+    stats = DecayedStats(half_life=DAY)
+    for i, value in enumerate((0.1, 0.2, 0.15)):
+        stats.add(value, at=i * 3600.0)
+    restored = DecayedStats.from_dict(stats.to_dict(), DAY)
+    assert restored.to_dict() == stats.to_dict()
+
+
+def test_hosts_are_kept_apart():
+    store = HostStatistics(half_life=DAY)
+    for i in range(5):
+        store.add('a.example', 0.100, 0.010, at=float(i))
+        store.add('b.example', -0.500, 0.030, at=float(i))
+    assert sorted(store.hosts()) == ['a.example', 'b.example']
+    assert abs(store.stats('a.example')['offset'].mean - 0.100) < 1e-12
+    assert abs(store.stats('b.example')['latency'].mean - 0.030) < 1e-12
+    assert store.stats('c.example') is None
+
+
+def test_outliers_are_rejected_until_repeated():
+    store = HostStatistics(half_life=DAY, min_samples=8, max_rejects=3)
+    for i in range(10):
+        assert store.add('a.example', 0.100 + 0.0005 * (i % 5), 0.010, at=float(i))
+    assert store.add('a.example', 0.500, 0.010, at=10.0) is False
+    assert store.add('a.example', 0.500, 0.010, at=11.0) is False
+    # 세 번 연속 이탈: 실제 변화로 보고 이 측정부터 다시 누적
+    assert store.add('a.example', 0.500, 0.010, at=12.0) is True
+    assert store.stats('a.example')['offset'].count == 1
+    assert store.stats('a.example')['offset'].mean == 0.500
+
+
+def test_quartiles_restart_each_half_life():
+    store = HostStatistics(half_life=DAY, min_samples=8)
+    for i in range(20):
+        store.add('a.example', 0.100 + 0.0005 * (i % 5), 0.010, at=float(i))
+    # 한 반감기 뒤 새 세대: 측정이 모자라는 동안은 직전 세대로 판정
+    assert store.add('a.example', 0.150, 0.010, at=DAY) is False
+    assert store.quartiles('a.example')['offset'].count == 20
+    # 분포가 조금 옮겨감 (이전 경계 안): 새 세대가 쌓이면 그 분포로 판정
+    for i in range(10):
+        assert store.add('a.example', 0.1020 + 0.0002 * (i % 5), 0.010, at=DAY + i)
+    assert store.quartiles('a.example')['offset'].count == 10
+    assert store.add('a.example', 0.1000, 0.010, at=DAY + 20) is False  # 이전 세대 중앙값
+    # 두 반감기가 지나면 처음 세대는 완전히 버려짐
+    assert store.add('a.example', 0.1024, 0.010, at=2 * DAY + 30)
+    restored = HostStatistics.from_dict(store.to_dict())
+    assert restored.quartiles('a.example')['offset'].count == 10
+    assert restored.quartiles('a.example')['offset'].q1.value > 0.1015
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+drift_estimator 단위 테스트 (Theil-Sen 기울기, 이상값 강건성, 표본/구간 부족, 외삽 불확실성)
+python -m pytest test_drift_estimator.py
+"""
+
+import random
+
+from drift_estimator import DriftEstimator, theil_sen
+
+START = 1700000000.0
+
+
+def drifting(estimator, drift_ppm, count=40, step=30.0, noise=0.0005, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        t = START + i * step
+        estimator.add(t, 0.100 + drift_ppm * 1e-6 * (t - START) + rng.gauss(0, noise))
+
+
+def test_theil_sen_skips_close_pairs():
+    slope, slopes = theil_sen([(0.0, 0.0), (0.5, 10.0), (2.0, 2.0), (4.0, 4.0)])
+    # 0.5초 간격 쌍은 제외: (0,2),(0,4),(0.5,2),(0.5,4),(2,4) 다섯 쌍
+    assert len(slopes) == 5 and slope == 1.0
+    assert theil_sen([(0.0, 0.0), (0.2, 1.0)]) == (None, [])
+
+
+def test_recovers_drift_despite_outliers():
+    estimator = DriftEstimator()
+    drifting(estimator, drift_ppm=15)
+    for i in range(0, 40, 8):  # 일부 측정이 큐잉 지연으로 크게 튐
+        estimator.add(START + i * 30 + 1, 0.400)
+    fit = estimator.fit()
+    assert fit is not None and fit.samples == 45
+    assert abs(fit.slope - 15e-6) < 3e-6
+    assert fit.residual_sigma < 0.002
+    assert fit.span >= 39 * 30
+
+
+def test_no_model_without_enough_samples_span_or_plausible_slope():
+    estimator = DriftEstimator(min_span=60.0)
+    for i in range(4):
+        estimator.add(START + i * 100, 0.1)
+    assert estimator.fit() is None  # 표본 4개
+    estimator.clear()
+    for i in range(10):
+        estimator.add(START + i * 5, 0.1)
+    assert estimator.fit() is None  # 45초 구간
+    estimator.clear()
+    drifting(estimator, drift_ppm=2000, noise=0.0)
+    assert estimator.fit() is None  # 500ppm 초과
+
+
+def test_fit_is_cached_until_new_samples():
+    estimator = DriftEstimator()
+    drifting(estimator, drift_ppm=10)
+    fit = estimator.fit()
+    assert estimator.fit() is fit
+    estimator.add(START + 40 * 30, 0.1 + 10e-6 * 40 * 30)
+    assert estimator.fit() is not fit and estimator.fit().samples == 41
+
+
+def test_prediction_extrapolates_with_growing_uncertainty():
+    estimator = DriftEstimator()
+    assert estimator.predict(0.1, START, START + 100) == (0.1, DriftEstimator.PRIOR_DRIFT_SIGMA * 100)
+    drifting(estimator, drift_ppm=20)
+    now = START + 1200
+    near_offset, near_sigma = estimator.predict(0.1, now, now + 60)
+    far_offset, far_sigma = estimator.predict(0.1, now, now + 600)
+    slope = estimator.fit().slope
+    assert abs(near_offset - (0.1 + slope * 60)) < 1e-12
+    assert abs(far_offset - (0.1 + slope * 600)) < 1e-12
+    # 불확실성은 외삽 거리에 비례
+    assert near_sigma > 0 and abs(far_sigma - near_sigma * 10) < 1e-12
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+fire_optimizer 단위 테스트 (총 지연 합성, 도착 창 확률, 최적 선행 시간)
+python -m pytest test_fire_optimizer.py
+"""
+
+import random
+
+from fire_optimizer import FireTimeOptimizer
+
+
+def test_not_ready_without_distributions():
+    optimizer = FireTimeOptimizer()
+    assert not optimizer.ready
+    assert optimizer.optimize() is None and optimizer.probability(0.0) is None
+    try:
+        optimizer.set_distributions([0.010], [])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("빈 성분 허용됨")
+
+
+def test_constant_delay_is_centered_in_window():
+    # 총 지연이 항상 15ms면 도착이 창(0~20ms) 가운데에 오도록 lead = 15ms - 10ms
+    optimizer = FireTimeOptimizer(window=0.020).set_distributions([0.010], [0.005])
+    plan = optimizer.optimize()
+    assert abs(plan.lead - 0.005) < 1e-12
+    assert plan.probability == 1.0
+    assert abs(plan.expected_delay - 0.010) < 1e-12
+    assert optimizer.probability(plan.lead) == 1.0
+    assert optimizer.probability(0.020) == 0.0
+
+
+def test_bimodal_delay_covers_larger_mode():
+    # 지연 70%는 10ms 근처, 30%는 60ms 근처: 창 20ms로는 한 모드만 덮을 수 있음
+    rng = random.Random(4)
+    latencies = ([0.010 + rng.uniform(0, 0.004) for _ in range(70)]
+                 + [0.060 + rng.uniform(0, 0.004) for _ in range(30)])
+    optimizer = FireTimeOptimizer(window=0.020).set_distributions(latencies, [0.002], wake_errors=[0.0, 0.0005])
+    plan = optimizer.optimize()
+    assert 0.65 < plan.probability < 0.75
+    assert 0.002 < plan.lead < 0.012
+    assert abs(optimizer.probability(plan.lead) - plan.probability) < 1e-12
+    # 다른 선행 시간은 확률이 더 높지 않음
+    for lead in (plan.lead - 0.005, plan.lead + 0.005, 0.052):
+        assert optimizer.probability(lead) <= plan.probability
+
+
+def test_same_seed_gives_same_plan():
+    rng = random.Random(9)
+    latencies = [rng.gauss(0.020, 0.003) for _ in range(50)]
+    executions = [rng.uniform(0.001, 0.003) for _ in range(20)]
+    a = FireTimeOptimizer(seed=1).set_distributions(latencies, executions).optimize()
+    b = FireTimeOptimizer(seed=1).set_distributions(latencies, executions).optimize()
+    assert a._replace(elapsed=0) == b._replace(elapsed=0)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+http_date 단위 테스트 (RFC 7231 세 형식, 비표준 호환 형식, 파싱 실패)
+python -m pytest test_http_date.py
+"""
+
+import calendar
+from email.utils import formatdate
+
+from http_date import parse_http_date
+
+EPOCH_1994 = 784111777  # Sun, 06 Nov 1994 08:49:37 GMT
+
+
+def test_rfc7231_formats():
+    assert parse_http_date('Sun, 06 Nov 1994 08:49:37 GMT') == EPOCH_1994
+    assert parse_http_date('Sunday, 06-Nov-94 08:49:37 GMT') == EPOCH_1994
+    assert parse_http_date('Sun Nov  6 08:49:37 1994') == EPOCH_1994
+
+
+def test_legacy_forms():
+    assert parse_http_date('06 Nov 1994 08:49:37 GMT') == EPOCH_1994
+    assert parse_http_date('Sun, 06 Nov 1994 08:49:37.250 GMT') == EPOCH_1994 + 0.25
+    assert parse_http_date('  Sun, 06 Nov 1994 08:49:37 UTC ') == EPOCH_1994
+
+
+def test_matches_calendar_across_leap_years_and_month_ends():
+    for epoch in (0, 951782399, 951782400, 1709164800, 4107542399, 1234567890):
+        assert parse_http_date(formatdate(epoch, usegmt=True)) == epoch
+    assert parse_http_date('Tue, 29 Feb 2000 00:00:00 GMT') == calendar.timegm((2000, 2, 29, 0, 0, 0))
+
+
+def test_invalid_values():
+    for value in ('', 'not a date', 'Sun, 06 Foo 1994 08:49:37 GMT', 'Sun, 06 Nov 1994 08:49:37 PST'):
+        assert parse_http_date(value) is None
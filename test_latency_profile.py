@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+latency_profile 단위 테스트 (시간대 구분, 이웃/호스트 전체 대체, 예측 캐시 무효화, 저장 복원과 설정/버전 유지)
+python -m pytest test_latency_profile.py
+"""
+
+from datetime import datetime
+
+from latency_profile import TimeOfDayLatencyModel
+
+
+def at(hour, minute=0, day=5):
+    """로컬 시각 timestamp (시간대는 로컬 시각 기준이므로 실행 환경 시간대와 무관하게 같은 구간)"""
+    return datetime(2026, 1, day, hour, minute).timestamp()
+
+
+def busy_model():
+    # 20:00 판매 시각은 지연 약 80ms, 그 외 시간은 약 20ms
+    model = TimeOfDayLatencyModel(bucket_minutes=30, min_samples=8)
+    for day in range(1, 11):
+        model.add('shop.example', 0.080 + 0.001 * (day % 3), at(20, 5, day))
+        model.add('shop.example', 0.020 + 0.001 * (day % 3), at(10, 5, day))
+    return model
+
+
+def test_bucket_boundaries_and_labels():
+    model = TimeOfDayLatencyModel(bucket_minutes=30)
+    assert model.bucket_count == 48
+    assert model.bucket_of(at(0, 0)) == 0 and model.bucket_of(at(0, 29)) == 0
+    assert model.bucket_of(at(20, 30)) == 41
+    assert model.bucket_label(41) == '20:30'
+    try:
+        TimeOfDayLatencyModel(bucket_minutes=7)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("하루를 나누어떨어지지 않는 시간대 허용됨")
+
+
+def test_busy_bucket_is_predicted_separately():
+    model = busy_model()
+    busy = model.predict('shop.example', at(20, 15))
+    quiet = model.predict('shop.example', at(10, 20))
+    assert busy.source == 'bucket' and busy.samples == 10
+    assert abs(busy.median - 0.081) < 0.0015 and abs(quiet.median - 0.021) < 0.0015
+    assert busy.q1 <= busy.median <= busy.q3
+    assert model.predict('other.example', at(20)) is None
+
+
+def test_sparse_buckets_fall_back_to_neighbors_then_host():
+    model = busy_model()
+    # 20:30 구간은 측정이 없지만 이웃 20:00 구간이 충분
+    assert model.predict('shop.example', at(20, 40)).source == 'neighbors'
+    # 15:00 근처에는 측정이 없어 호스트 전체 분포
+    overall = model.predict('shop.example', at(15))
+    assert overall.source == 'host' and overall.samples == 20
+    model.add('shop.example', 0.0, at(15))  # 지연 없는 측정은 무시
+    assert model.predict('shop.example', at(15)).samples == 20
+
+
+def test_cache_is_invalidated_by_new_measurements():
+    model = busy_model()
+    first = model.predict('shop.example', at(20, 10))
+    assert model.predict('shop.example', at(20, 20)) is first
+    model.add('shop.example', 0.300, at(20, 10, 11))
+    assert model.predict('shop.example', at(20, 10)).samples == 11
+
+
+def test_round_trip_and_rebuild():
+    model = busy_model()
+    restored = TimeOfDayLatencyModel.from_dict(model.to_dict())
+    assert restored.min_samples == 8 and restored._versions == model._versions
+    assert restored.predict('shop.example', at(20)) == model.predict('shop.example', at(20))
+    assert restored.profile('shop.example') == model.profile('shop.example')
+    records = [{'host': 'shop.example', 'latency': 0.030, 'timestamp': at(9, 0, day)} for day in range(1, 4)]
+    model.rebuild(records)
+    assert model.profile('shop.example') == [(18, 3, 0.030)]
+
+
+def test_round_trip_keeps_min_samples_and_cache_versions():
+    model = busy_model()
+    strict = TimeOfDayLatencyModel.from_dict({**model.to_dict(), 'min_samples': 20})
+    # 저장한 최소 표본 수로 판단: 시간대 표본 10개로는 부족해 호스트 전체 분포 사용
+    assert strict.min_samples == 20
+    assert strict.predict('shop.example', at(20, 15)).source == 'host'
+    # 반영 횟수가 없는 이전 저장 데이터도 캐시 버전이 0이 아닌 값으로 시작하고 새 측정으로 무효화됨
+    legacy = model.to_dict()
+    del legacy['min_samples'], legacy['versions']
+    restored = TimeOfDayLatencyModel.from_dict(legacy)
+    assert restored.min_samples == 8 and restored._versions == {'shop.example': 20}
+    first = restored.predict('shop.example', at(20, 10))
+    restored.add('shop.example', 0.300, at(20, 10, 11))
+    assert restored.predict('shop.example', at(20, 10)) is not first
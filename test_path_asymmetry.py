@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+path_asymmetry 단위 테스트 (전방 지연 비율 추정, 불가능한 편향 거부, 가중 평균)
+python -m pytest test_path_asymmetry.py
+"""
+
+from path_asymmetry import PathAsymmetryCalibrator
+
+
+def close(a, b, tolerance=1e-9):
+    return abs(a - b) < tolerance
+
+
+def test_uncalibrated_host_assumes_half_rtt():
+    calibrator = PathAsymmetryCalibrator()
+    assert calibrator.get('a.example') is None
+    assert calibrator.forward_delay('a.example', 0.040) == 0.020
+    assert calibrator.bias('a.example', 0.040) == 0.0
+
+
+def test_bias_gives_forward_fraction():
+    calibrator = PathAsymmetryCalibrator()
+    # 전방 30ms / 복귀 10ms: HTTP 오프셋이 NTP보다 10ms 큼
+    entry = calibrator.add('a.example', 0.110, 0.100, 0.040, 0.002, at=0.0)
+    assert close(entry['forward_fraction'], 0.75)
+    assert close(calibrator.forward_delay('a.example', 0.040), 0.030)
+    # 비율로 저장하므로 RTT가 바뀌어도 같은 비율로 편향 계산
+    assert close(calibrator.bias('a.example', 0.080), 0.020)
+
+
+def test_impossible_bias_is_rejected():
+    calibrator = PathAsymmetryCalibrator()
+    # 편향이 RTT/2 + 오차를 넘으면 서버 시계가 NTP와 다른 것
+    assert calibrator.add('a.example', 0.200, 0.100, 0.040, 0.002) is None
+    assert calibrator.add('a.example', 0.110, 0.100, 0.0, 0.002) is None
+    assert calibrator.get('a.example') is None
+
+
+def test_precise_calibrations_dominate_and_history_is_bounded():
+    calibrator = PathAsymmetryCalibrator(history=3)
+    calibrator.add('a.example', 0.100, 0.100, 0.040, 0.001, at=0.0)   # 0.5, 정밀
+    calibrator.add('a.example', 0.115, 0.100, 0.040, 0.010, at=1.0)   # 0.875, 10배 부정확
+    calibration = calibrator.get('a.example')
+    assert 0.5 < calibration['forward_fraction'] < 0.51
+    assert calibration['samples'] == 2 and calibration['updated_at'] == 1.0
+    for i in range(5):
+        calibrator.add('a.example', 0.100, 0.100, 0.040, 0.001, at=2.0 + i)
+    assert calibrator.get('a.example')['samples'] == 3
+
+
+def test_round_trip():
+    calibrator = PathAsymmetryCalibrator()
+    calibrator.add('a.example', 0.110, 0.100, 0.040, 0.002, at=0.0)
+    restored = PathAsymmetryCalibrator.from_dict(calibrator.to_dict())
+    assert restored.get('a.example') == calibrator.get('a.example')
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+probe_engine 단위 테스트 (예약 발사 시각, 동시 진행, 도착 순서 전달, 관찰자)
+python -m pytest test_probe_engine.py
+"""
+
+import asyncio
+import time
+
+from probe_engine import ProbeEngine
+
+
+class FakeTransport:
+    """요청마다 delays[URL]만큼 걸리는 가상 전송 계층 (목록이면 호출 순서대로, '/fail'은 예외)"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+
+    def probe(self, url, address=None, method='HEAD'):
+        start = time.perf_counter_ns()
+        if url.endswith('/fail'):
+            raise ConnectionError("연결 실패")
+        delay = self.delays.get(url, 0.0)
+        time.sleep(delay.pop(0) if isinstance(delay, list) else delay)
+        return {'url': url, 'address': address, 'method': method, 'phases_ns': {'request_start': start}}
+
+    def warm_up(self, url, connections=1):
+        return connections
+
+
+async def _gather(engine, url, fire_times):
+    return await asyncio.gather(*engine.schedule(url, fire_times))
+
+
+async def _collect(engine, url, fire_times):
+    return [(index, result) async for index, result in engine.stream(url, fire_times)]
+
+
+def test_probe_fires_at_the_scheduled_time():
+    engine = ProbeEngine(FakeTransport())
+    try:
+        fire_at = time.perf_counter() + 0.05
+        result = engine.run(engine.probe_at('http://a/', fire_at))
+    finally:
+        engine.close()
+    assert result['fire_at'] == fire_at
+    # 발사 2ms 전부터 busy wait하므로 늦어도 수 ms 이내 (부하가 큰 CI 여유 포함)
+    assert 0 <= result['fire_error'] < 0.01
+
+
+def test_scheduled_probes_run_concurrently():
+    engine = ProbeEngine(FakeTransport({'http://a/': 0.1}), max_in_flight=4)
+    try:
+        start = time.perf_counter()
+        tasks = engine.run(_gather(engine, 'http://a/', [start + 0.01] * 4))
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.close()
+    assert len(tasks) == 4
+    assert elapsed < 0.3  # 순차라면 0.4초 이상
+
+
+def test_stream_yields_in_arrival_order_with_indices():
+    engine = ProbeEngine(FakeTransport({'http://a/': [0.15, 0.0]}))
+    try:
+        now = time.perf_counter()
+        # 먼저 발사한 측정이 더 늦게 끝나면 나중 측정이 먼저 전달됨
+        arrivals = engine.run(_collect(engine, 'http://a/', [now + 0.01, now + 0.05]))
+        failed = engine.run(_collect(engine, 'http://x/fail', [None]))
+    finally:
+        engine.close()
+    assert [index for index, _ in arrivals] == [1, 0]
+    assert arrivals[1][1]['fire_at'] == now + 0.01
+    assert isinstance(failed[0][1], ConnectionError)
+
+
+def test_observers_see_every_result_and_cannot_break_probes():
+    seen = []
+
+    def broken(url, result):
+        raise RuntimeError("관찰자 오류")
+
+    engine = ProbeEngine(FakeTransport())
+    engine.add_observer(broken)
+    engine.add_observer(lambda url, result: seen.append(url))
+    try:
+        result = engine.run(engine.probe_at('http://a/', address='10.0.0.1', method='GET'))
+    finally:
+        engine.close()
+    assert seen == ['http://a/']
+    assert result['address'] == '10.0.0.1' and result['method'] == 'GET' and result['fire_error'] == 0
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+probe_transport 단위 테스트 (로컬 스크립트 서버 상대로 keep-alive 재사용, 끊긴 연결 재시도,
+단계별 타임스탬프, DNS 캐시 TTL, TLS 세션 재개, 엣지 고정,
+chunked 본문/트레일러, 1xx 중간 응답)
+python -m pytest test_probe_transport.py
+"""
+
+import http.client
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import formatdate
+
+import pytest
+
+from probe_transport import PHASES, ProbeTransport, RawProbeTransport, ResolverCache, phase_durations_ms
+
+TRANSPORTS = (ProbeTransport, RawProbeTransport)
+
+
+def ok_response(head):
+    return f"HTTP/1.1 200 OK\r\nDate: {formatdate(usegmt=True)}\r\nContent-Length: 0\r\n\r\n".encode()
+
+
+class ScriptedServer:
+    """요청 헤더를 받을 때마다 respond(요청 헤더 바이트)로 응답하는 로컬 서버
+
+    close_after_each: 응답 후 알리지 않고 연결을 끊음 (유휴 연결 타임아웃 흉내)
+    """
+
+    def __init__(self, respond=ok_response, close_after_each=False, tls_context=None):
+        self.respond = respond
+        self.close_after_each = close_after_each
+        self.tls_context = tls_context
+        self.connections = 0
+        self.requests = []
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(('127.0.0.1', 0))
+        self._listener.listen(16)
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def url(self, path='/', host='127.0.0.1'):
+        scheme = 'https' if self.tls_context is not None else 'http'
+        return f"{scheme}://{host}:{self.port}{path}"
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        try:
+            if self.tls_context is not None:
+                conn = self.tls_context.wrap_socket(conn, server_side=True)
+            data = b''
+            while True:
+                while b'\r\n\r\n' not in data:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        return
+                    data += chunk
+                head, _, data = data.partition(b'\r\n\r\n')
+                self.requests.append(head)
+                response = self.respond(head)
+                conn.sendall(response)
+                if self.close_after_each or b'Connection: close' in response:
+                    return
+        except OSError:
+            return
+        finally:
+            conn.close()
+
+    def close(self):
+        self._listener.close()
+
+
+@contextmanager
+def serve(**kwargs):
+    server = ScriptedServer(**kwargs)
+    try:
+        yield server
+    finally:
+        server.close()
+
+
+def test_probes_reuse_one_keep_alive_connection():
+    for transport_class in TRANSPORTS:
+        with serve() as server:
+            transport = transport_class(timeout=2)
+            first = transport.probe(server.url())
+            second = transport.probe(server.url())
+            transport.close()
+        assert first['status'] == 200 and first['date']
+        assert not first['reused'] and second['reused']
+        assert first['connection_id'] == second['connection_id']
+        assert server.connections == 1 and len(server.requests) == 2
+        assert 0 < second['rtt'] < 2 and second['local_before'] <= second['local_after']
+
+
+def test_warm_up_fills_the_pool_before_measuring():
+    for transport_class in TRANSPORTS:
+        with serve() as server:
+            transport = transport_class(timeout=2)
+            assert transport.warm_up(server.url(), connections=3) == 3
+            assert len(transport.idle_connection_ids(server.url())) == 3
+            result = transport.probe(server.url())
+            transport.close()
+        assert result['reused'] and server.connections == 3
+
+
+def test_connection_close_is_not_returned_to_the_pool():
+    def closing(head):
+        return b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"
+
+    for transport_class in TRANSPORTS:
+        with serve(respond=closing) as server:
+            transport = transport_class(timeout=2)
+            results = [transport.probe(server.url()) for _ in range(2)]
+            assert transport.idle_connection_ids(server.url()) == []
+            transport.close()
+        assert [r['reused'] for r in results] == [False, False]
+        assert server.connections == 2
+
+
+def test_dropped_idle_connection_is_retried_once_on_a_new_one():
+    for transport_class in TRANSPORTS:
+        with serve(close_after_each=True) as server:
+            transport = transport_class(timeout=2)
+            transport.probe(server.url())
+            result = transport.probe(server.url())  # 풀의 연결은 서버가 이미 끊음
+            transport.close()
+        assert result['status'] == 200 and not result['reused']
+        assert server.connections == 2
+
+
+def test_phase_timestamps_are_recorded_in_order():
+    for transport_class in TRANSPORTS:
+        with serve() as server:
+            transport = transport_class(timeout=2)
+            first = transport.probe(server.url())
+            second = transport.probe(server.url())
+            transport.close()
+        phases = first['phases_ns']
+        # 평문 HTTP는 TLS 단계가 없음
+        assert phases['tls_done'] is None
+        recorded = [phases[name] for name in PHASES if phases[name] is not None]
+        assert len(recorded) == len(PHASES) - 1 and recorded == sorted(recorded)
+        # RTT 구간은 요청 전송 시작 ~ 첫 바이트, 헤더 수신은 포함하지 않음
+        assert first['perf_before'] == phases['request_start'] / 1e9
+        assert first['perf_after'] == phases['first_byte'] / 1e9
+        assert first['rtt'] <= first['transaction_time']
+        # 재사용 연결은 연결 단계 시각을 그대로 가지고 있고 요청 단계만 새로 기록
+        assert second['phases_ns']['tcp_connected'] == phases['tcp_connected']
+        assert second['phases_ns']['request_start'] > phases['headers_complete']
+
+
+def test_phase_durations_skip_missing_phases():
+    phases = {'connect_start': 0, 'dns_resolved': 1_000_000, 'tcp_connected': 3_000_000,
+              'tls_done': None, 'request_start': 4_000_000, 'request_written': 4_500_000,
+              'first_byte': 14_500_000, 'headers_complete': 15_000_000}
+    durations = phase_durations_ms(phases)
+    assert durations == {'dns': 1.0, 'tcp': 2.0, 'tls': None, 'send': 0.5, 'wait': 10.0, 'headers': 0.5}
+    assert phase_durations_ms({})['wait'] is None
+
+
+def test_resolver_cache_expires_after_ttl():
+    resolver = ResolverCache(ttl=0.05)
+    assert resolver.lookup('localhost', 80) is None
+    addresses, cached = resolver.resolve('localhost', 80)
+    assert addresses and not cached
+    assert resolver.resolve('localhost', 80) == (addresses, True)
+    time.sleep(0.1)
+    assert resolver.lookup('localhost', 80) is None
+    _, cached = resolver.resolve('localhost', 80)
+    assert not cached
+    resolver.invalidate('localhost', 80)
+    assert resolver.lookup('localhost', 80) is None
+
+
+def test_reconnect_uses_dns_cache_within_ttl():
+    for transport_class in TRANSPORTS:
+        with serve(close_after_each=True) as server:
+            transport = transport_class(timeout=2, dns_ttl=60.0)
+            url = server.url(host='localhost')
+            first = transport.probe(url)
+            second = transport.probe(url)
+            transport.resolver.invalidate()
+            third = transport.probe(url)
+            transport.close()
+        assert [r['dns_cached'] for r in (first, second, third)] == [False, True, False]
+
+
+@contextmanager
+def self_signed_tls():
+    """localhost용 자체 서명 인증서로 만든 (서버 컨텍스트, 클라이언트 컨텍스트)"""
+    openssl = shutil.which('openssl')
+    if openssl is None:
+        pytest.skip("openssl 없음")
+    with tempfile.TemporaryDirectory() as directory:
+        key = os.path.join(directory, 'key.pem')
+        cert = os.path.join(directory, 'cert.pem')
+        subprocess.run([openssl, 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-keyout', key,
+                        '-out', cert, '-subj', '/CN=localhost',
+                        '-addext', 'subjectAltName=DNS:localhost', '-days', '1'],
+                       check=True, capture_output=True)
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(cert, key)
+        yield server_context, ssl.create_default_context(cafile=cert)
+
+
+def test_tls_session_is_resumed_on_reconnect():
+    with self_signed_tls() as (server_context, client_context):
+        for transport_class in TRANSPORTS:
+            with serve(close_after_each=True, tls_context=server_context) as server:
+                transport = transport_class(timeout=2)
+                transport.ssl_context = client_context
+                url = server.url(host='localhost')
+                first = transport.probe(url)
+                second = transport.probe(url)
+                reconnect = transport.measure_reconnect(url)
+                transport.close()
+            assert first['status'] == 200 and first['phases_ns']['tls_done'] is not None
+            assert not first['tls_resumed'] and second['tls_resumed']
+            assert not reconnect['cold']['tls_resumed'] and not reconnect['cold']['dns_cached']
+            assert reconnect['warm']['tls_resumed'] and reconnect['warm']['dns_cached']
+
+
+def test_pinned_edge_is_used_and_stale_idle_connections_are_closed():
+    for transport_class in TRANSPORTS:
+        with serve() as server:
+            transport = transport_class(timeout=2)
+            url = server.url(host='localhost')
+            assert '127.0.0.1' in transport.resolve_all(url)
+            transport.warm_up(url, connections=2)
+            assert len(transport.idle_connection_ids(url)) == 2
+            # 고정하면 DNS 순서로 맺은 유휴 연결은 닫히고 고정 주소로 새로 연결
+            transport.pin_address(url, '127.0.0.1')
+            assert transport.pinned_address(url) == '127.0.0.1'
+            assert transport.idle_connection_ids(url) == []
+            pinned = transport.probe(url)
+            again = transport.probe(url)
+            # 같은 호스트라도 포트가 다르면 고정되지 않음
+            assert transport.pinned_address(f"http://localhost:{server.port + 1}/") is None
+            transport.pin_address(url, None)
+            assert transport.pinned_address(url) is None
+            assert transport.idle_connection_ids(url) == []
+            transport.close()
+        assert pinned['remote_address'] == '127.0.0.1' and not pinned['reused']
+        assert again['reused'] and again['connection_id'] == pinned['connection_id']
+        assert server.connections == 3
+
+
+def test_chunked_body_with_extensions_and_trailers():
+    def chunked(head):
+        return (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"5;name=value\r\nhello\r\n"
+                b"8\r\n world\r\n\r\n"   # 데이터 안의 CRLF도 청크 크기대로 읽음
+                b"0\r\nServer-Timing: total;dur=1\r\nX-Trailer: 1\r\n\r\n")
+
+    with serve(respond=chunked) as server:
+        transport = RawProbeTransport(timeout=2)
+        first = transport.probe(server.url(), method='GET')
+        second = transport.probe(server.url(), method='GET')
+        transport.close()
+    assert first['body'] == b"hello world\r\n" and second['body'] == first['body']
+    # 트레일러까지 읽어 다음 응답이 어긋나지 않고 연결도 재사용됨
+    assert second['reused'] and server.connections == 1
+
+
+def test_invalid_chunk_size_is_an_http_error():
+    def broken(head):
+        return b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n"
+
+    with serve(respond=broken) as server:
+        transport = RawProbeTransport(timeout=2)
+        with pytest.raises(http.client.HTTPException):
+            transport.probe(server.url(), method='GET')
+        transport.close()
+
+
+def test_interim_responses_are_skipped():
+    def early_hints(head):
+        return (b"HTTP/1.1 100 Continue\r\n\r\n"
+                b"HTTP/1.1 103 Early Hints\r\nLink: </style.css>; rel=preload\r\n\r\n"
+                + ok_response(head))
+
+    with serve(respond=early_hints) as server:
+        transport = RawProbeTransport(timeout=2)
+        first = transport.probe(server.url())
+        second = transport.probe(server.url())
+        transport.close()
+    assert first['status'] == 200 and first['date']
+    assert second['status'] == 200 and second['reused'] and server.connections == 1
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+rtt_envelope 단위 테스트 (RTT 하한 추적, 하한 거리 가중 결합)
+python -m pytest test_rtt_envelope.py
+"""
+
+from rtt_envelope import RttEnvelopeFilter
+
+
+def test_floor_tracks_sliding_minimum():
+    envelope = RttEnvelopeFilter(window=10.0, max_samples=3)
+    assert envelope.floor() is None
+    assert envelope.add(0.030, at=0.0) == 0.030
+    assert envelope.add(0.020, at=1.0) == 0.020
+    assert envelope.add(0.025, at=2.0) == 0.020
+    assert envelope.add(0.040, at=3.0) == 0.020
+    # 개수 윈도(3개)에서 0.020 측정이 빠지면 남은 측정 중 최소
+    assert envelope.add(0.050, at=4.0) == 0.025
+    # 시간 윈도(10초)가 지나면 오래된 하한은 만료
+    assert envelope.add(0.045, at=13.5) == 0.045
+
+
+def test_weight_falls_with_distance_from_floor():
+    envelope = RttEnvelopeFilter(precision=0.0005)
+    envelope.add(0.020, at=0.0)
+    near, far = envelope.weight(0.022), envelope.weight(0.060)
+    assert abs(near / far - ((0.040 + 0.0005) / (0.002 + 0.0005)) ** 2) < 1e-6
+    assert envelope.weight(0.020, resolution=0.001) < envelope.weight(0.020)
+
+
+def test_combine_prefers_floor_samples():
+    envelope = RttEnvelopeFilter()
+    samples = [(0.100, 0.020, 0.0), (0.100, 0.021, 0.0), (0.130, 0.080, 0.0), (0.070, 0.075, 0.0)]
+    for i, (_, rtt, _) in enumerate(samples):
+        envelope.add(rtt, at=float(i))
+    estimate = envelope.combine(samples)
+    assert abs(estimate.offset - 0.100) < 0.0005
+    assert estimate.floor == 0.020
+    assert estimate.samples == 4
+    # 하한 +1ms 측정은 하한 측정의 약 1/9 비중, 큐잉된 두 측정은 거의 무시
+    assert 1.0 < estimate.effective_samples < 1.5
+    assert envelope.combine([]) is None
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+source_combiner 단위 테스트 (Marzullo 교집합, authoritative 가중, 드리프트 확장, 호스트 구분, 동시 제출)
+python -m pytest test_source_combiner.py
+"""
+
+import threading
+
+from source_combiner import SourceCombiner, marzullo
+
+NOW = 1700000000.0
+
+
+def test_marzullo_finds_majority_overlap():
+    assert marzullo([(0.0, 2.0, 1), (1.0, 3.0, 1), (1.5, 4.0, 1), (10.0, 11.0, 1)]) == (1.5, 2.0, 3)
+    assert marzullo([(0.0, 1.0, 1), (1.0, 2.0, 1)]) == (1.0, 1.0, 2)  # 닫힌 구간: 끝점에서 겹침
+    assert marzullo([]) is None
+
+
+def test_falseticker_is_reported():
+    combiner = SourceCombiner()
+    combiner.submit('ntp:a', 'ntp', 0.010, 0.020, measured_at=NOW)
+    combiner.submit('ntp:b', 'ntp', 0.012, 0.022, measured_at=NOW)
+    combiner.submit('ntp:c', 'ntp', 0.300, 0.310, measured_at=NOW)
+    combined = combiner.combine(now=NOW)
+    assert (combined.lo, combined.hi) == (0.012, 0.020)
+    assert combined.falsetickers == ['ntp:c']
+
+
+def test_authoritative_source_outweighs_majority():
+    combiner = SourceCombiner()
+    for name in ('ntp:a', 'ntp:b', 'ntp:c'):
+        combiner.submit(name, 'ntp', 0.010, 0.020, measured_at=NOW)
+    combiner.submit_offset('http:burst', 'burst', 0.050, 0.002, authoritative=True, measured_at=NOW)
+    combined = combiner.combine(now=NOW)
+    assert abs(combined.offset - 0.050) < 1e-12 and abs(combined.uncertainty - 0.002) < 1e-12
+    assert sorted(combined.falsetickers) == ['ntp:a', 'ntp:b', 'ntp:c']
+
+
+def test_age_widens_and_expires_sources():
+    combiner = SourceCombiner(max_age=100.0)
+    combiner.submit('http:a', 'http', 0.010, 0.020, measured_at=NOW)
+    widened = combiner.sources(now=NOW + 100.0)[0]
+    assert abs((widened.hi - widened.lo) - (0.010 + 2 * 100.0 * SourceCombiner.DRIFT_ALLOWANCE)) < 1e-12
+    assert combiner.sources(now=NOW + 101.0) == []
+    shifted = combiner.sources(now=NOW, shifts={'http': 0.005})[0]
+    assert (shifted.lo, shifted.hi) == (0.015, 0.025)
+
+
+def test_sources_are_scoped_by_host():
+    combiner = SourceCombiner()
+    combiner.submit('ntp:a', 'ntp', 0.010, 0.020, measured_at=NOW)
+    # 두 호스트가 같은 이름으로 제출해도 서로 덮어쓰지 않음
+    combiner.submit_offset('http:burst', 'burst', 0.050, 0.002, authoritative=True, measured_at=NOW,
+                           host='a.example')
+    combiner.submit_offset('http:burst', 'burst', 0.300, 0.002, authoritative=True, measured_at=NOW,
+                           host='b.example:8443')
+    combined = combiner.combine(now=NOW, host='a.example')
+    assert abs(combined.offset - 0.050) < 1e-12 and combined.falsetickers == ['ntp:a']
+    assert abs(combiner.combine(now=NOW, host='b.example:8443').offset - 0.300) < 1e-12
+    # 측정이 없는 호스트는 호스트 무관 소스만 사용
+    assert combiner.combine(now=NOW, host='c.example').truechimers == ['ntp:a']
+    assert len(combiner.sources(now=NOW)) == 3
+
+    combiner.remove('http:burst')  # 호스트 없는 같은 이름은 별개 소스
+    assert len(combiner.sources(now=NOW)) == 3
+    combiner.clear_host('a.example')
+    assert [s.host for s in combiner.sources(now=NOW)] == [None, 'b.example:8443']
+
+
+def test_concurrent_submit_while_combining():
+    # 측정 스레드가 새 소스를 추가하는 동안 결합해도 반복 중 크기 변경 오류가 없어야 함
+    combiner = SourceCombiner()
+    for i in range(2000):
+        combiner.submit(f'seed:{i}', 'ntp', 0.0, 0.01, measured_at=NOW)
+    errors = []
+
+    def submitter(prefix):
+        for i in range(20000):
+            combiner.submit(f'{prefix}:{i}', 'http', 0.0, 0.01, measured_at=NOW)
+
+    threads = [threading.Thread(target=submitter, args=(p,)) for p in ('a', 'b')]
+    for t in threads:
+        t.start()
+    try:
+        while any(t.is_alive() for t in threads):
+            combiner.sources(now=NOW)
+    except RuntimeError as e:  # dictionary changed size during iteration
+        errors.append(e)
+    for t in threads:
+        t.join()
+    assert not errors
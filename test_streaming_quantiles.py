@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+streaming_quantiles 단위 테스트 (P² 분위수 추정, 사분위수/IQR 경계, 저장 복원)
+python -m pytest test_streaming_quantiles.py
+"""
+
+import math
+import random
+import statistics
+
+from streaming_quantiles import P2Quantile, Quartiles
+
+
+def test_first_five_values_are_exact():
+    estimator = P2Quantile(0.5)
+    assert math.isnan(estimator.value)
+    for value in (5.0, 1.0, 3.0):
+        estimator.add(value)
+    assert estimator.value == 3.0
+    estimator.add(2.0)
+    assert estimator.value == 2.5
+
+
+def test_invalid_quantile_is_rejected():
+    for p in (0.0, 1.0, -0.5):
+        try:
+            P2Quantile(p)
+        except ValueError:
+            continue
+        raise AssertionError(f"p={p} 허용됨")
+
+
+def test_estimates_track_exact_quartiles():
+    rng = random.Random(42)
+    values = [rng.gauss(0.100, 0.002) for _ in range(5000)]
+    quartiles = Quartiles()
+    for value in values:
+        quartiles.add(value)
+    q1, median, q3 = statistics.quantiles(values, n=4)
+    assert abs(quartiles.q1.value - q1) < 0.0002
+    assert abs(quartiles.median.value - median) < 0.0002
+    assert abs(quartiles.q3.value - q3) < 0.0002
+    assert quartiles.count == 5000
+
+
+def test_fences_and_round_trip():
+    quartiles = Quartiles()
+    for value in range(1, 101):
+        quartiles.add(float(value))
+    lower, upper = quartiles.fences(1.5)
+    assert lower == quartiles.q1.value - 1.5 * quartiles.iqr
+    assert upper == quartiles.q3.value + 1.5 * quartiles.iqr
+    restored = Quartiles.from_dict(quartiles.to_dict())
+    assert restored.to_dict() == quartiles.to_dict()
+    restored.add(50.0)
+    quartiles.add(50.0)
+    assert restored.median.value == quartiles.median.value
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sync_strategies 단위 테스트 (초 경계 구간 교집합, 이분 탐색, 버스트 포착)
+python -m pytest test_sync_strategies.py
+"""
+
+import asyncio
+import time
+from email.utils import formatdate
+
+from sync_strategies import BisectionStrategy, BurstEdgeStrategy
+
+
+class FakeEngine:
+    """서버 시계가 로컬보다 offset 빠르고 RTT가 대칭인 가상 서버 (예약 시각에 즉시 응답)"""
+
+    def __init__(self, offset, rtt=0.020):
+        self.offset = offset
+        self.rtt = rtt
+
+    async def probe_at(self, url, fire_at=None):
+        send = time.time() if fire_at is None else time.time() + (fire_at - time.perf_counter())
+        server_time = send + self.rtt / 2 + self.offset
+        return {'date': formatdate(int(server_time), usegmt=True), 'local_before': send,
+                'local_after': send + self.rtt, 'rtt': self.rtt}
+
+    def schedule(self, url, fire_times):
+        return [self.probe_at(url, fire_at) for fire_at in fire_times]
+
+
+def test_intersect_overlapping_bounds():
+    lo, hi, conflict = BisectionStrategy.intersect(0.100, 0.110, (0.105, 1.105))
+    assert (lo, hi, conflict) == (0.105, 0.110, False)
+
+
+def test_intersect_conflict_restarts_from_newest_bounds():
+    # 어긋난 두 경계 사이 틈 [0.110, 0.111]을 구간으로 쓰지 않음
+    lo, hi, conflict = BisectionStrategy.intersect(0.100, 0.110, (0.111, 1.111))
+    assert (lo, hi, conflict) == (0.111, 1.111, True)
+    lo, hi, conflict = BisectionStrategy.intersect(0.500, 0.600, (-0.600, 0.400))
+    assert (lo, hi, conflict) == (-0.600, 0.400, True)
+
+
+def test_uncertainty_grows_with_conflicts_up_to_one_way_delay():
+    width, latency = 0.002, 0.010
+    assert BisectionStrategy.uncertainty(width, 0, latency) == width / 2
+    one = BisectionStrategy.uncertainty(width, 1, latency)
+    two = BisectionStrategy.uncertainty(width, 2, latency)
+    assert width / 2 < one < two
+    assert BisectionStrategy.uncertainty(width, 10, latency) == width / 2 + latency
+
+
+def test_bisection_converges_on_true_offset():
+    offset = 0.3456
+    result = asyncio.run(BisectionStrategy(max_probes=12, lead=0.0).run(FakeEngine(offset), 'http://fake/'))
+    assert result['lo'] <= offset < result['hi']
+    assert result['width'] <= 0.002
+    assert result['conflicts'] == 0
+    assert result['uncertainty'] == result['width'] / 2
+
+
+def test_burst_from_prior_uses_known_one_way_delay():
+    offset, rtt = 0.3456, 0.080
+    prior = (0.3406, 0.3506)
+    strategy = BurstEdgeStrategy(fan=8, max_bursts=1, lead=0.0)
+    result = asyncio.run(strategy.run(FakeEngine(offset, rtt), 'http://fake/', prior=prior, one_way=rtt / 2))
+    assert result['lo'] <= offset < result['hi']
+    assert result['width'] < (prior[1] - prior[0]) / 4
+    # 단방향 지연 없이 예약하면 모든 측정이 40ms 늦게 도착해 초 경계를 놓치고 구간이 줄지 않음
+    result = asyncio.run(strategy.run(FakeEngine(offset, rtt), 'http://fake/', prior=prior))
+    assert result['width'] > (prior[1] - prior[0]) / 2
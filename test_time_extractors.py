@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+time_extractors 단위 테스트 (추출기별 파싱, 정밀도 순서, Date 대안, 측정 메서드 선택)
+python -m pytest test_time_extractors.py
+"""
+
+import json
+
+from time_extractors import (DateHeaderExtractor, JsonTimestampExtractor, ServerTimingExtractor,
+                             XTimerExtractor, extract_server_time, probe_method_for,
+                             registered_extractors)
+
+DATE = 'Sat, 17 Oct 2026 06:00:00 GMT'
+DATE_EPOCH = 1792216800.0
+
+
+def response(headers=None, body=None, date=DATE):
+    return {'headers': dict(headers or {}), 'body': body, 'date': date}
+
+
+def test_x_timer_start_time_and_resolution():
+    extracted = XTimerExtractor().extract(response({'X-Timer': 'S1792216800.123456,VS0,VE12'}))
+    assert extracted == (1792216800.123456, 1e-06)
+    assert XTimerExtractor().extract(response({'X-Timer': 'VS0,VE12'})) is None
+    assert XTimerExtractor().extract(response()) is None
+
+
+def test_json_timestamp_in_milliseconds_or_seconds():
+    extractor = JsonTimestampExtractor()
+    json_headers = {'Content-Type': 'application/json; charset=utf-8'}
+    millis = response(json_headers, json.dumps({'timestamp': 1792216800123}).encode())
+    seconds = response(json_headers, json.dumps({'timestamp': 1792216800.5}).encode())
+    assert extractor.extract(millis) == (1792216800.123, 0.001)
+    assert extractor.extract(seconds) == (1792216800.5, 0.001)
+    # JSON이 아니거나 필드가 숫자가 아니면 사용 안 함
+    assert extractor.extract(response({'Content-Type': 'text/html'}, b'{"timestamp": 1}')) is None
+    assert extractor.extract(response(json_headers, b'{"timestamp": "now"}')) is None
+    assert extractor.extract(response(json_headers, b'[1, 2]')) is None
+    assert extractor.extract(response(json_headers, b'not json')) is None
+
+
+def test_server_timing_epoch_entries():
+    extractor = ServerTimingExtractor()
+    header = 'cdn-cache;desc=HIT, edge;dur=3, ts;desc="1792216800.25"'
+    assert extractor.extract(response({'Server-Timing': header})) == (1792216800.25, 0.01)
+    millis = extractor.extract(response({'Server-Timing': 'epoch;dur=1792216800123'}))
+    assert millis == (1792216800.123, 0.001)
+    # 이름이 맞아도 epoch처럼 보이지 않는 값은 무시
+    assert extractor.extract(response({'Server-Timing': 'time;dur=12.5'})) is None
+
+
+def test_date_header_fallback():
+    assert DateHeaderExtractor().extract(response()) == (DATE_EPOCH, 1.0)
+    assert DateHeaderExtractor().extract(response(date='garbage')) is None
+    assert DateHeaderExtractor(lambda text: 42.0).extract(response()) == (42.0, 1.0)
+
+
+def test_most_precise_extractor_wins():
+    resolutions = [extractor.resolution for extractor in registered_extractors()]
+    assert resolutions == sorted(resolutions)
+    headers = {'X-Timer': 'S1792216800.123456,VS0,VE12', 'Server-Timing': 'ts;desc=1792216800.2'}
+    assert extract_server_time(response(headers)) == (1792216800.123456, 'x_timer', 1e-06)
+    assert extract_server_time(response({'Server-Timing': 'ts;desc=1792216800.2'}))[1] == 'server_timing'
+    assert extract_server_time(response()) == (DATE_EPOCH, 'date', 1.0)
+    assert extract_server_time(response(headers), extractors=[]) == (DATE_EPOCH, 'date', 1.0)
+    assert extract_server_time(response(date=None)) is None
+
+
+def test_get_only_when_a_body_extractor_applies():
+    assert probe_method_for(response({'Content-Type': 'application/json'})) == 'GET'
+    assert probe_method_for(response({'Content-Type': 'text/html'})) == 'HEAD'
+    assert probe_method_for(response({'Content-Type': 'application/json'}),
+                            extractors=[XTimerExtractor()]) == 'HEAD'
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+서버 시각 추출기 레지스트리
+Date 헤더(1초 단위)보다 정밀한 서버 시각을 응답에서 꺼내는 추출기 모음
+
+- json_timestamp: JSON 응답의 timestamp 필드 (test_server.py /api/time, ms 단위)
+- x_timer:        Fastly X-Timer 헤더 (S<epoch>.<소수>,VS0,VE<ms>)
+- server_timing:  Server-Timing 헤더에 실린 epoch 값 (ts/time/timestamp/epoch 항목)
+- date:           HTTP Date 헤더 (항상 마지막 대안)
+
+extract_server_time()은 등록된 추출기를 정밀도 순서대로 시도하고 처음 성공한 값을 사용
+"""
+
+import re
+import json
+
+from http_date import parse_http_date
+
+
+class TimestampExtractor:
+    """서버 시각 추출기 기본 클래스
+
+    resolution은 추출기의 공칭 해상도(초), method는 값을 얻기 위한 HTTP 메서드
+    (본문이 필요한 추출기만 GET)
+    """
+
+    name = None
+    resolution = 1.0
+    method = 'HEAD'
+
+    def extract(self, result):
+        """측정 결과에서 (epoch 초, 해상도) 추출, 해당 정보가 없으면 None"""
+        raise NotImplementedError
+
+    def needs_body(self, headers):
+        """HEAD 응답 헤더를 보고 이 추출기를 쓰려면 본문(GET)이 필요한지 판단"""
+        return False
+
+
+def _fraction_resolution(text):
+    """숫자 문자열의 소수 자릿수로 해상도 계산 ('1700000000.123' -> 0.001)"""
+    _, _, fraction = text.partition('.')
+    return 10.0 ** -len(fraction) if fraction else 1.0
+
+
+class JsonTimestampExtractor(TimestampExtractor):
+    """JSON 본문의 timestamp 필드 (1e11보다 크면 ms, 아니면 초로 해석)"""
+
+    name = 'json_timestamp'
+    resolution = 0.001
+    method = 'GET'
+
+    def needs_body(self, headers):
+        return 'json' in (headers.get('Content-Type') or '').lower()
+
+    def extract(self, result):
+        body = result.get('body')
+        if not body or not self.needs_body(result['headers']):
+            return None
+        try:
+            value = json.loads(body).get('timestamp')
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(value, (int, float)):
+            return None
+        if value > 1e11:
+            return value / 1000.0, self.resolution
+        return float(value), self.resolution
+
+
+class XTimerExtractor(TimestampExtractor):
+    """Fastly X-Timer 헤더: S 뒤의 값이 엣지가 요청을 받은 시각"""
+
+    name = 'x_timer'
+    resolution = 1e-6
+    _pattern = re.compile(r'S(\d{9,}(?:\.\d+)?)')
+
+    def extract(self, result):
+        value = result['headers'].get('X-Timer')
+        if not value:
+            return None
+        match = self._pattern.search(value)
+        if match is None:
+            return None
+        return float(match.group(1)), _fraction_resolution(match.group(1))
+
+
+class ServerTimingExtractor(TimestampExtractor):
+    """Server-Timing 헤더에서 epoch 시각 항목 추출
+
+    표준 필드가 없어 서버마다 형식이 다르므로 ts/time/timestamp/epoch 이름의 항목에서
+    desc 또는 dur 값이 epoch(초 또는 ms)로 보이는 경우만 사용
+    """
+
+    name = 'server_timing'
+    resolution = 0.001
+    _names = ('ts', 'time', 'timestamp', 'epoch')
+    _param = re.compile(r'(desc|dur)\s*=\s*"?(\d{9,}(?:\.\d+)?)"?')
+
+    def extract(self, result):
+        value = result['headers'].get('Server-Timing')
+        if not value:
+            return None
+        for entry in value.split(','):
+            metric, _, params = entry.strip().partition(';')
+            if metric.strip().lower() not in self._names:
+                continue
+            match = self._param.search(params)
+            if match is None:
+                continue
+            text = match.group(2)
+            timestamp = float(text)
+            resolution = _fraction_resolution(text)
+            if timestamp > 1e11:  # ms 단위
+                return timestamp / 1000.0, resolution / 1000.0
+            return timestamp, resolution
+        return None
+
+
+class DateHeaderExtractor(TimestampExtractor):
+    """HTTP Date 헤더 (1초 단위로 잘린 값)"""
+
+    name = 'date'
+    resolution = 1.0
+
+    def __init__(self, parse_date=parse_http_date):
+        self.parse_date = parse_date
+
+    def extract(self, result):
+        server_time_str = result.get('date')
+        if not server_time_str:
+            return None
+        timestamp = self.parse_date(server_time_str)
+        if timestamp is None:
+            return None
+        return timestamp, self.resolution
+
+
+_registry = []
+
+
+def register_extractor(extractor):
+    """추출기 등록 (정밀도 순서를 유지하도록 해상도 기준 정렬)"""
+    _registry.append(extractor)
+    _registry.sort(key=lambda e: e.resolution)
+    return extractor
+
+
+def registered_extractors():
+    """등록된 추출기 목록 (정밀도가 높은 순)"""
+    return list(_registry)
+
+
+for _extractor in (XTimerExtractor(), JsonTimestampExtractor(), ServerTimingExtractor()):
+    register_extractor(_extractor)
+
+
+def extract_server_time(result, parse_date=parse_http_date, extractors=None):
+    """정밀도 순서로 추출기를 시도하고 모두 실패하면 Date 헤더 사용
+
+    Returns:
+        tuple: (epoch 초, 추출기 이름, 해상도(초)) 또는 None
+    """
+    for extractor in (registered_extractors() if extractors is None else extractors):
+        extracted = extractor.extract(result)
+        if extracted is not None:
+            return extracted[0], extractor.name, extracted[1]
+
+    extracted = DateHeaderExtractor(parse_date).extract(result)
+    if extracted is None:
+        return None
+    return extracted[0], DateHeaderExtractor.name, extracted[1]
+
+
+def probe_method_for(result, extractors=None):
+    """HEAD 측정 결과를 보고 본문이 필요한 추출기를 쓸 수 있으면 'GET', 아니면 'HEAD'"""
+    for extractor in (registered_extractors() if extractors is None else extractors):
+        if extractor.method == 'GET' and extractor.needs_body(result['headers']):
+            return 'GET'
+    return 'HEAD'
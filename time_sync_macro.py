@@ -7,9 +7,8 @@
 """
 
 import time
-import requests
 import statistics
-from datetime import datetime, timezone
+from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -22,6 +21,9 @@ import json
 import re
 from urllib.parse import urljoin, urlparse
 
+from probe_transport import get_shared_transport
+from http_date import parse_http_date
+
 
 class TimeSyncMacro:
     def __init__(self):
@@ -32,6 +34,7 @@ class TimeSyncMacro:
         self.target_url = ""
         self.button_selector = ""
         self.target_time = None
+        self.probe_transport = get_shared_transport()  # keep-alive 측정 연결
         
     def setup_driver(self, headless=False):
         """Chrome 드라이버 설정"""
@@ -54,31 +57,27 @@ class TimeSyncMacro:
         offsets = []
         latencies = []
         
+        # 측정 연결을 미리 맺어 DNS/TCP/TLS 비용을 지연시간에서 제외
+        self.probe_transport.warm_up(url)
+        
         for i in range(num_samples):
             try:
-                # 요청 전 로컬 시간
-                local_before = time.time()
-                
-                # HEAD 요청으로 서버 헤더 정보 가져오기
-                response = requests.head(url, timeout=10)
-                
-                # 요청 후 로컬 시간
-                local_after = time.time()
+                # HEAD 요청으로 서버 헤더 정보 가져오기 (keep-alive 연결 재사용)
+                probe = self.probe_transport.probe(url)
+                local_before = probe['local_before']
                 
                 # 네트워크 지연시간 계산 (왕복시간의 절반)
-                latency = (local_after - local_before) / 2
+                latency = probe['rtt'] / 2
                 latencies.append(latency)
                 
                 # 서버 시간 추출
-                server_time_str = response.headers.get('Date')
+                server_time_str = probe['date']
                 if server_time_str:
-                    # RFC 2822 형식 파싱
-                    server_time = datetime.strptime(
-                        server_time_str, 
-                        '%a, %d %b %Y %H:%M:%S %Z'
-                    ).replace(tzinfo=timezone.utc)
+                    # RFC 7231 Date 헤더 파싱 (공용 고속 파서)
+                    server_timestamp = parse_http_date(server_time_str)
+                    if server_timestamp is None:
+                        raise ValueError(f"Date 헤더 형식 오류: {server_time_str}")
                     
-                    server_timestamp = server_time.timestamp()
                     local_timestamp = local_before + latency  # 네트워크 지연 보정
                     
                     offset = server_timestamp - local_timestamp
@@ -261,11 +260,9 @@ class TimeSyncMacro:
         
         while time.time() - start_time < duration:
             try:
-                before = time.time()
-                response = requests.head(url, timeout=5)
-                after = time.time()
+                probe = self.probe_transport.probe(url)
                 
-                latency = (after - before) * 1000  # ms 단위
+                latency = probe['rtt'] * 1000  # ms 단위
                 latencies.append(latency)
                 
                 print(f"지연시간: {latency:.1f}ms")